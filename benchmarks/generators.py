@@ -0,0 +1,113 @@
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List
+
+import numpy as np
+import pandas as pd
+
+from tableserializer.table import Table
+
+DTYPE_MIXES = {
+    "text": ["text"],
+    "numeric": ["int", "float"],
+    "mixed": ["text", "int", "float", "category", "bool"],
+}
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """
+    Specification of a synthetic table.
+
+    :param num_rows: Number of rows.
+    :param num_columns: Number of columns.
+    :param dtype_mix: Name of the mix of column dtypes (see DTYPE_MIXES). Columns cycle through the dtypes of the mix.
+    :param cardinality: Number of distinct values per column.
+    :param null_rate: Fraction of cells that are missing.
+    :param cell_length: Average number of characters of text cells.
+    :param seed: Seed of the random generator.
+    """
+    num_rows: int = 1000
+    num_columns: int = 8
+    dtype_mix: str = "mixed"
+    cardinality: int = 100
+    null_rate: float = 0.0
+    cell_length: int = 16
+    seed: int = 0
+
+    def get_name(self) -> str:
+        return ",".join(f"{key}={value}" for key, value in asdict(self).items() if key != "seed")
+
+
+def _generate_column(dtype: str, spec: TableSpec, random_generator: np.random.Generator) -> pd.Series:
+    codes = random_generator.integers(0, spec.cardinality, spec.num_rows)
+    if dtype == "int":
+        column = pd.Series(codes * 7 - spec.cardinality, dtype=np.int64)
+    elif dtype == "float":
+        column = pd.Series(random_generator.random(spec.cardinality)[codes] * 1000)
+    elif dtype == "bool":
+        column = pd.Series(codes % 2 == 0)
+    else:
+        # Text values of varying length around the configured cell length
+        lengths = random_generator.integers(max(1, spec.cell_length // 2), spec.cell_length * 3 // 2 + 2,
+                                            spec.cardinality)
+        alphabet = np.array(list("abcdefghijklmnopqrstuvwxyz     "))
+        values = np.array(["".join(random_generator.choice(alphabet, length)).strip() or "x" for length in lengths],
+                          dtype=object)
+        column = pd.Series(values[codes], dtype=object)
+        if dtype == "category":
+            column = column.astype("category")
+    if spec.null_rate > 0:
+        column = column.astype(object)
+        column[random_generator.random(spec.num_rows) < spec.null_rate] = None
+    return column
+
+
+def generate_table(spec: TableSpec) -> Table:
+    """
+    Generate a synthetic table according to the given specification.
+
+    :param spec: Specification of the table.
+    :return: Synthetic table.
+    """
+    random_generator = np.random.default_rng(spec.seed)
+    dtypes = DTYPE_MIXES[spec.dtype_mix]
+    columns = {f"column_{index}_{dtypes[index % len(dtypes)]}":
+               _generate_column(dtypes[index % len(dtypes)], spec, random_generator)
+               for index in range(spec.num_columns)}
+    return Table.from_dataframe(pd.DataFrame(columns))
+
+
+def generate_metadata(spec: TableSpec) -> Dict[str, Any]:
+    """
+    Generate metadata for a synthetic table.
+
+    :param spec: Specification of the table.
+    :return: Metadata of the table.
+    """
+    return {"table_name": f"synthetic_{spec.seed}", "table_page_title": "Synthetic table",
+            "table_section_title": spec.get_name()}
+
+
+def default_table_specs(quick: bool = False) -> List[TableSpec]:
+    """
+    Table specifications covering the dimensions of the synthetic tables (rows, columns, dtype mix, cardinality, null
+    rate and cell length).
+
+    :param quick: Set to true to only use small tables.
+    :return: List of table specifications.
+    """
+    specs = [
+        TableSpec(num_rows=100, num_columns=8),
+        TableSpec(num_rows=100, num_columns=64),
+        TableSpec(num_rows=100, num_columns=8, dtype_mix="numeric"),
+        TableSpec(num_rows=100, num_columns=8, null_rate=0.2),
+        TableSpec(num_rows=100, num_columns=8, cell_length=256),
+    ]
+    if not quick:
+        specs += [
+            TableSpec(num_rows=10000, num_columns=8),
+            TableSpec(num_rows=10000, num_columns=8, dtype_mix="text", cardinality=5000),
+            TableSpec(num_rows=10000, num_columns=8, dtype_mix="numeric"),
+            TableSpec(num_rows=10000, num_columns=8, null_rate=0.2),
+        ]
+    return specs
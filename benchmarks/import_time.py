@@ -0,0 +1,67 @@
+"""
+Import-time regression check. Imports a module in a fresh interpreter with `-X importtime` and fails if the import takes
+longer than the limit or if it imports modules that should only be imported on first use (e.g., scikit-learn):
+
+    python -m benchmarks.import_time --module tableserializer.kitchen --max-seconds 1.0
+"""
+import argparse
+import subprocess
+import sys
+from typing import Dict, List
+
+# Modules that are only needed by some components and must not be imported when importing the package
+DEFERRED_MODULES = ["sklearn", "scipy"]
+
+
+def measure_import_time(module: str) -> Dict[str, float]:
+    """
+    Import a module in a fresh interpreter and collect the cumulative import time of every imported module.
+
+    :param module: Name of the module to import.
+    :return: Dictionary mapping the names of all imported modules to their cumulative import time in seconds.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    import_times = {}
+    for line in result.stderr.splitlines():
+        # Lines have the format "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        import_times[name.strip()] = int(cumulative) / 1e6
+    return import_times
+
+
+def check_import_time(module: str, max_seconds: float, deferred_modules: List[str]) -> bool:
+    """
+    Check that importing a module stays within the time limit and does not import deferred modules.
+
+    :param module: Name of the module to import.
+    :param max_seconds: Maximum cumulative import time of the module in seconds.
+    :param deferred_modules: Top-level modules that must not be imported.
+    :return: True if the check passes.
+    """
+    import_times = measure_import_time(module)
+    passed = True
+    print(f"Importing {module} took {import_times[module]:.3f}s (limit {max_seconds:.3f}s).")
+    if import_times[module] > max_seconds:
+        passed = False
+    for imported_module in import_times:
+        if imported_module.split(".")[0] in deferred_modules:
+            print(f"Importing {module} imports {imported_module}, which should only be imported on first use.")
+            passed = False
+            break
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time regression check.")
+    parser.add_argument("--module", default="tableserializer.kitchen", help="Module to import.")
+    parser.add_argument("--max-seconds", type=float, default=1.0, help="Maximum import time in seconds.")
+    args = parser.parse_args()
+    if not check_import_time(args.module, args.max_seconds, DEFERRED_MODULES):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Throughput of the JSON raw table serializer on large tables. Serializes synthetic 100k-row tables of each dtype mix
+(backed by pandas and, if pyarrow is installed, by Arrow) and reports the rows rendered per second. As a reference, the
+same rows are rendered with one json.dumps call per row:
+
+    python -m benchmarks.json_throughput --num-rows 100000 --repeats 3
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, Dict, Any, List
+
+from benchmarks.generators import TableSpec, DTYPE_MIXES, generate_table
+from tableserializer.serializer.table import JSONRawTableSerializer
+from tableserializer.table import Table
+
+
+def _render_with_json_dumps(table: Table) -> str:
+    # Reference implementation that encodes every row with the json module
+    return "\n".join(json.dumps({str(index): row}, default=str) for index, row in enumerate(table.as_list_of_dicts()))
+
+
+def _measure_rows_per_second(run: Callable[[], Any], num_rows: int, repeats: int) -> float:
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+    return num_rows / statistics.median(durations)
+
+
+def run_json_benchmarks(num_rows: int, num_columns: int, repeats: int) -> List[Dict[str, Any]]:
+    """
+    Measure the JSON rendering throughput on synthetic tables of every dtype mix.
+
+    :param num_rows: Number of rows of the tables.
+    :param num_columns: Number of columns of the tables.
+    :param repeats: Repetitions per measurement, the median duration is reported.
+    :return: List of results with the throughput in rows per second per table backend.
+    """
+    serializer = JSONRawTableSerializer()
+    results = []
+    for dtype_mix in DTYPE_MIXES:
+        table_df = generate_table(TableSpec(num_rows=num_rows, num_columns=num_columns, dtype_mix=dtype_mix,
+                                            null_rate=0.05)).as_dataframe()
+        # Every repetition gets a fresh table, so that views cached on the table do not carry over between repetitions
+        result = {
+            "dtype_mix": dtype_mix,
+            "json_dumps_rows_per_second": _measure_rows_per_second(
+                lambda: _render_with_json_dumps(Table.from_dataframe(table_df)), num_rows, repeats),
+            "pandas_rows_per_second": _measure_rows_per_second(
+                lambda: serializer.serialize_raw_table(Table.from_dataframe(table_df)), num_rows, repeats),
+        }
+        try:
+            from tableserializer.table.arrow import ArrowTable
+            arrow_table = ArrowTable.from_dataframe(table_df).as_arrow()
+            result["arrow_rows_per_second"] = _measure_rows_per_second(
+                lambda: serializer.serialize_raw_table(ArrowTable(arrow_table)), num_rows, repeats)
+        except ImportError:
+            pass
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Throughput of the JSON raw table serializer.")
+    parser.add_argument("--num-rows", type=int, default=100000, help="Number of rows of the tables.")
+    parser.add_argument("--num-columns", type=int, default=8, help="Number of columns of the tables.")
+    parser.add_argument("--repeats", type=int, default=3, help="Repetitions per measurement.")
+    args = parser.parse_args()
+    for result in run_json_benchmarks(args.num_rows, args.num_columns, args.repeats):
+        throughputs = ", ".join(f"{key[:-len('_rows_per_second')]}: {value:,.0f} rows/s"
+                                for key, value in result.items() if key.endswith("_rows_per_second"))
+        print(f"{result['dtype_mix']:>8} | {throughputs}")
+
+
+if __name__ == "__main__":
+    main()
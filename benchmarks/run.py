@@ -0,0 +1,178 @@
+"""
+Benchmarks for the components registered in the ExperimentalSerializerKitchen and for end-to-end serialization.
+
+Run the benchmarks and write the results as JSON:
+
+    python -m benchmarks.run run --output results.json
+
+Compare the results against a baseline, exiting with a non-zero status if a benchmark regressed:
+
+    python -m benchmarks.run compare baseline.json results.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Any, List, Optional
+
+import pandas as pd
+import sklearn
+
+from benchmarks.generators import TableSpec, generate_table, generate_metadata, default_table_specs
+from tableserializer import SerializationRecipe
+from tableserializer.kitchen import ExperimentalSerializerKitchen
+from tableserializer.serializer import Serializer
+from tableserializer.table import Table
+
+# Constructor arguments for registered components that have required constructor parameters
+COMPONENT_ARGS: Dict[str, Dict[str, Any]] = {
+    "ColumnDroppingPreprocessor": {"columns_to_drop": ["column_0_text", "column_1_int"]},
+    "StringTruncationPreprocessor": {"max_len": 8},
+}
+
+
+def _measure(run: Callable[[Table], Any], spec: TableSpec, repeats: int) -> Dict[str, float]:
+    # Every repetition gets a fresh table, so that views cached on the table do not carry over between repetitions
+    table_df = generate_table(spec).as_dataframe()
+    durations = []
+    for _ in range(repeats):
+        table = Table.from_dataframe(table_df)
+        start = time.perf_counter()
+        run(table)
+        durations.append(time.perf_counter() - start)
+    return {"min_seconds": min(durations), "median_seconds": statistics.median(durations),
+            "mean_seconds": statistics.mean(durations), "repeats": repeats}
+
+
+def _create_components(kitchen: ExperimentalSerializerKitchen) -> Dict[str, Dict[str, Any]]:
+    components = {}
+    for kind, classes in kitchen.get_registered_classes().items():
+        components[kind] = {}
+        for class_name, component_class in classes.items():
+            try:
+                components[kind][class_name] = component_class(**COMPONENT_ARGS.get(class_name, {}))
+            except TypeError as e:
+                print(f"Skipping {class_name}, it cannot be instantiated with the benchmark arguments: {e}",
+                      file=sys.stderr)
+    return components
+
+
+def _create_benchmarks(kitchen: ExperimentalSerializerKitchen) -> Dict[str, Callable[[Table, Dict[str, Any]], Any]]:
+    benchmarks = {}
+    components = _create_components(kitchen)
+    for name, row_sampler in components["row_sampler"].items():
+        benchmarks[f"row_sampler/{name}"] = lambda table, metadata, c=row_sampler: c.sample(table)
+    for name, table_preprocessor in components["table_preprocessor"].items():
+        benchmarks[f"table_preprocessor/{name}"] = lambda table, metadata, c=table_preprocessor: c.process(table)
+    for name, table_serializer in components["table_serializer"].items():
+        benchmarks[f"table_serializer/{name}"] = \
+            lambda table, metadata, c=table_serializer: c.serialize_raw_table(table)
+    for name, schema_serializer in components["schema_serializer"].items():
+        benchmarks[f"schema_serializer/{name}"] = \
+            lambda table, metadata, c=schema_serializer: c.serialize_schema(table, metadata)
+    for name, metadata_serializer in components["metadata_serializer"].items():
+        benchmarks[f"metadata_serializer/{name}"] = \
+            lambda table, metadata, c=metadata_serializer: c.serialize_metadata(metadata)
+
+    # End-to-end serialization with every raw table serializer, once on the full table and once on sampled rows
+    recipe = SerializationRecipe("Metadata:\n{META}\n\nSchema:\n{SCHEMA}\n\nTable:\n{TABLE}")
+    for name, table_serializer in components["table_serializer"].items():
+        for sampler_name in [None, "FirstRowSampler", "KMeansRowSampler"]:
+            row_sampler = None if sampler_name is None else kitchen.create_row_sampler(sampler_name, 10)
+            serializer = Serializer(recipe, kitchen.create_metadata_serializer("PairwiseMetadataSerializer"),
+                                    kitchen.create_schema_serializer("ColumnNameSchemaSerializer"),
+                                    table_serializer, row_sampler)
+            benchmarks[f"serializer/{name}/{sampler_name}"] = \
+                lambda table, metadata, s=serializer: s.serialize(table, metadata)
+    return benchmarks
+
+
+def run_benchmarks(specs: List[TableSpec], repeats: int, name_filter: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run all benchmarks on tables generated from the given specifications.
+
+    :param specs: Specifications of the benchmark tables.
+    :param repeats: Number of repetitions per benchmark and table.
+    :param name_filter: Only run benchmarks whose name contains this string.
+    :return: Benchmark results.
+    """
+    kitchen = ExperimentalSerializerKitchen()
+    benchmarks = _create_benchmarks(kitchen)
+    results = []
+    for spec in specs:
+        metadata = generate_metadata(spec)
+        for benchmark_name, benchmark in benchmarks.items():
+            if name_filter is not None and name_filter not in benchmark_name:
+                continue
+            measurement = _measure(lambda table: benchmark(table, metadata), spec, repeats)
+            results.append({"benchmark": benchmark_name, "table": spec.get_name(), **measurement})
+            print(f"{benchmark_name:<60} {spec.get_name():<90} {measurement['median_seconds'] * 1000:>10.2f} ms",
+                  file=sys.stderr)
+    return {
+        "environment": {"python": platform.python_version(), "pandas": pd.__version__,
+                        "scikit-learn": sklearn.__version__, "platform": platform.platform(),
+                        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> bool:
+    """
+    Compare benchmark results against a baseline and print the relative change of the median durations.
+
+    :param baseline: Baseline benchmark results.
+    :param current: Current benchmark results.
+    :param threshold: Relative slowdown above which a benchmark counts as regressed (e.g., 0.2 for 20%).
+    :return: True if no benchmark regressed.
+    """
+    baseline_results = {(result["benchmark"], result["table"]): result for result in baseline["results"]}
+    regressions = 0
+    for result in current["results"]:
+        key = (result["benchmark"], result["table"])
+        if key not in baseline_results:
+            print(f"{result['benchmark']:<60} {result['table']:<90} {'new':>10}")
+            continue
+        ratio = result["median_seconds"] / max(baseline_results[key]["median_seconds"], 1e-9)
+        status = ""
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        print(f"{result['benchmark']:<60} {result['table']:<90} {ratio:>9.2f}x {status}")
+    print(f"{regressions} regression(s) above a threshold of {threshold:.0%}.")
+    return regressions == 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks for table serialization kitchen components.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and write the results as JSON.")
+    run_parser.add_argument("--output", default="benchmark_results.json", help="Path of the JSON results file.")
+    run_parser.add_argument("--repeats", type=int, default=5, help="Repetitions per benchmark and table.")
+    run_parser.add_argument("--quick", action="store_true", help="Only benchmark on small tables.")
+    run_parser.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this string.")
+    compare_parser = subparsers.add_parser("compare", help="Compare benchmark results against a baseline.")
+    compare_parser.add_argument("baseline", help="Path of the baseline JSON results file.")
+    compare_parser.add_argument("current", help="Path of the current JSON results file.")
+    compare_parser.add_argument("--threshold", type=float, default=0.2,
+                                help="Relative slowdown above which a benchmark counts as regressed.")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_benchmarks(default_table_specs(quick=args.quick), args.repeats, args.filter)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        with open(args.current, "r") as f:
+            current = json.load(f)
+        if not compare_results(baseline, current, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
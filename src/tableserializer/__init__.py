@@ -1 +1,11 @@
-from tableserializer.recipe import SerializationRecipe
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+from tableserializer.utils.lazy import create_lazy_attribute_hooks
+
+if TYPE_CHECKING:
+    from tableserializer.recipe import SerializationRecipe
+
+# The public symbols are imported on first access, so that importing a submodule does not import the others
+__getattr__, __dir__ = create_lazy_attribute_hooks(__name__, {"SerializationRecipe": "tableserializer.recipe"})
+
+__all__ = ["SerializationRecipe"]
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+def fingerprint_metadata(metadata: Optional[Dict[str, Any]]) -> str:
+    """
+    Compute a content fingerprint of table metadata.
+
+    :param metadata: Metadata to fingerprint.
+    :type metadata: Optional[Dict[str, Any]]
+    :return: Hex digest identifying the metadata contents.
+    :rtype: str
+    """
+    metadata_json = json.dumps(metadata, sort_keys=True, default=str)
+    return hashlib.blake2b(metadata_json.encode(), digest_size=16).hexdigest()
+
+
+class ComponentCache:
+    """
+    Persistent, size-bounded cache for the outputs of serialization components. Entries are stored compressed in a
+    SQLite database and keyed by the signature of the component that produced them and a fingerprint of the input. The
+    total size of the entries is kept up to date by triggers of the database, so that it is shared by all processes
+    using the cache. When the total size exceeds the size limit, the least recently used entries are evicted until the
+    cache is reduced to the low-water mark, so that a full cache is not evicted again on every insertion.
+
+    :param path: Path to the SQLite database file. The file is created if it does not exist.
+    :type path: str
+    :param max_size_bytes: Maximum total size of the (compressed) cache entries in bytes.
+    :type max_size_bytes: int
+    :param low_water_mark: Fraction of the maximum size that the cache is reduced to when it exceeds the maximum size.
+    :type low_water_mark: float
+    """
+
+    # Number of entries that are evicted at once
+    _eviction_batch_size = 64
+
+    def __init__(self, path: str, max_size_bytes: int = 2 ** 30, low_water_mark: float = 0.9):
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.low_water_mark = low_water_mark
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            db_parent_dir = Path(self.path).parent
+            if not os.path.exists(db_parent_dir):
+                os.makedirs(db_parent_dir)
+            # The connection may be used from other threads, e.g., by serializers that run in a prefetching thread
+            self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            # The schema is created in a single transaction, so that no entries are added before the triggers exist
+            self._connection.executescript("""
+                BEGIN IMMEDIATE;
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB,
+                    size INTEGER,
+                    last_access REAL
+                );
+                CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+                CREATE TABLE IF NOT EXISTS total_size (id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER);
+                -- Caches created by earlier versions have entries but no total size yet
+                INSERT OR IGNORE INTO total_size (id, size) SELECT 0, COALESCE(SUM(size), 0) FROM entries;
+                CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+                    UPDATE total_size SET size = size + NEW.size WHERE id = 0;
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries BEGIN
+                    UPDATE total_size SET size = size - OLD.size + NEW.size WHERE id = 0;
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+                    UPDATE total_size SET size = size - OLD.size WHERE id = 0;
+                END;
+                COMMIT;
+            """)
+        return self._connection
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Database connections cannot be pickled, worker processes open their own connection
+        return {"path": self.path, "max_size_bytes": self.max_size_bytes, "low_water_mark": self.low_water_mark}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    @staticmethod
+    def make_key(namespace: str, signature: str, fingerprint: str) -> str:
+        """
+        Create a cache key for the output of a component.
+
+        :param namespace: Namespace of the cached output (e.g., "row_sampler").
+        :type namespace: str
+        :param signature: Signature of the component producing the output.
+        :type signature: str
+        :param fingerprint: Fingerprint of the input of the component.
+        :type fingerprint: str
+        :return: Cache key.
+        :rtype: str
+        """
+        return hashlib.blake2b(f"{namespace}\x00{signature}\x00{fingerprint}".encode(), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> Any:
+        """
+        Get a cached value. Raises a KeyError if there is no entry for the key.
+
+        :param key: Key of the entry.
+        :type key: str
+        :return: Cached value.
+        :rtype: Any
+        """
+        connection = self._connect()
+        result = connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        if result is None:
+            raise KeyError(f"Key '{key}' not found in the cache.")
+        connection.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(zlib.decompress(result[0]))
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a value in the cache, evicting the least recently used entries if the cache exceeds its size limit.
+
+        :param key: Key of the entry.
+        :type key: str
+        :param value: Value to store.
+        :type value: Any
+        :rtype: None
+        """
+        connection = self._connect()
+        blob = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        connection.execute("""
+            INSERT INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size,
+            last_access = excluded.last_access
+        """, (key, blob, len(blob), time.time()))
+        size = self.get_size()
+        if size > self.max_size_bytes:
+            self._evict(size)
+
+    def _evict(self, size: int) -> None:
+        connection = self._connection
+        target_size = self.max_size_bytes * self.low_water_mark
+        while size > target_size:
+            # Evict the least recently used entries in batches until the cache is reduced to the low-water mark. Of a
+            # batch, only the entries needed to reach the low-water mark are evicted.
+            evicted = connection.execute("""
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM (
+                        SELECT key, SUM(size) OVER (ORDER BY last_access, key) - size AS preceding_size
+                        FROM (SELECT key, size, last_access FROM entries ORDER BY last_access LIMIT ?)
+                    ) WHERE preceding_size < ?
+                )
+                RETURNING size
+            """, (self._eviction_batch_size, size - target_size)).fetchall()
+            if len(evicted) == 0:
+                break
+            size -= sum(entry_size for entry_size, in evicted)
+
+    def get_or_compute(self, namespace: str, signature: str, fingerprint: str, compute: Callable[[], T]) -> T:
+        """
+        Get the cached output of a component, or compute and cache it if there is no entry yet.
+
+        :param namespace: Namespace of the cached output (e.g., "row_sampler").
+        :type namespace: str
+        :param signature: Signature of the component producing the output.
+        :type signature: str
+        :param fingerprint: Fingerprint of the input of the component.
+        :type fingerprint: str
+        :param compute: Function that computes the output on a cache miss.
+        :type compute: Callable[[], T]
+        :return: Cached or computed output.
+        :rtype: T
+        """
+        key = self.make_key(namespace, signature, fingerprint)
+        try:
+            return self.get(key)
+        except KeyError:
+            value = compute()
+            self.put(key, value)
+            return value
+
+    def get_size(self) -> int:
+        """
+        Get the total size of all cache entries in bytes.
+
+        :return: Total size of the cache entries.
+        :rtype: int
+        """
+        return self._connect().execute("SELECT size FROM total_size WHERE id = 0").fetchone()[0]
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache.
+
+        :rtype: None
+        """
+        self._connect().execute("DELETE FROM entries")
@@ -1,4 +1,7 @@
 import os.path
+import queue
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 try:
@@ -7,24 +10,224 @@ try:
     from hashlib import sha1
     import numpy as np
     from openai import OpenAI
-    from typing import Dict, Optional, List
+    from typing import Dict, Optional, List, Callable, Iterator, TypeVar, Collection
 
     from pytei import TEIClient
-    from pytei.store import DuckDBEmbeddingStore
+    from pytei.store import DuckDBEmbeddingStore, EmbeddingStore
     from target_benchmark.retrievers import AbsStandardEmbeddingRetriever
 except ImportError:
     raise Exception("Cannot use TARGET integration. Please install table serialization kitchen with the TARGET integration through 'pip install tableserializer[target]'")
 
 
+T = TypeVar('T')
+
+
+class LRUEmbeddingStore(EmbeddingStore):
+    """
+    Size-bounded in-memory LRU tier in front of another embedding store. Lookups are served from memory if possible and
+    only the remaining keys are looked up in the backing store. Writes go to both tiers.
+
+    :param store: Backing embedding store.
+    :type store: EmbeddingStore
+    :param max_size_bytes: Maximum total size of the embeddings held in memory in bytes.
+    :type max_size_bytes: int
+    """
+
+    def __init__(self, store: EmbeddingStore, max_size_bytes: int = 2 ** 29):
+        self.store = store
+        self.max_size_bytes = max_size_bytes
+        self._embeddings: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, value: np.ndarray) -> None:
+        with self._lock:
+            if key in self._embeddings:
+                self._size_bytes -= self._embeddings.pop(key).nbytes
+            self._embeddings[key] = value
+            self._size_bytes += value.nbytes
+            while self._size_bytes > self.max_size_bytes and len(self._embeddings) > 0:
+                _, evicted = self._embeddings.popitem(last=False)
+                self._size_bytes -= evicted.nbytes
+
+    def _recall(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            value = self._embeddings.get(key)
+            if value is not None:
+                self._embeddings.move_to_end(key)
+            return value
+
+    def get(self, key: str) -> np.ndarray:
+        value = self._recall(key)
+        if value is None:
+            value = self.store.get(key)
+            self._remember(key, value)
+        return value
+
+    def get_all(self, keys: Collection[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        missing_keys = []
+        for key in dict.fromkeys(keys):
+            value = self._recall(key)
+            if value is None:
+                missing_keys.append(key)
+            else:
+                found[key] = value
+        if len(missing_keys) > 0:
+            for key, value in self.store.get_all(missing_keys).items():
+                self._remember(key, value)
+                found[key] = value
+        return found
+
+    def put(self, key: str, value: np.ndarray) -> None:
+        self.store.put(key, value)
+        self._remember(key, value)
+
+    def put_all(self, keys: List[str], values: List[np.ndarray]) -> None:
+        self.store.put_all(keys, values)
+        for key, value in zip(keys, values):
+            self._remember(key, value)
+
+    def remove(self, key: str) -> None:
+        self.store.remove(key)
+        with self._lock:
+            if key in self._embeddings:
+                self._size_bytes -= self._embeddings.pop(key).nbytes
+
+
+# Embedding stores shared by all clients and retrievers of a process, keyed by the absolute path of the database
+_shared_embedding_stores: Dict[str, LRUEmbeddingStore] = {}
+_shared_embedding_stores_lock = threading.Lock()
+
+
+def get_shared_embedding_store(db_path: str, memory_cache_bytes: int = 2 ** 29) -> LRUEmbeddingStore:
+    """
+    Get the embedding store for a DuckDB database file that is shared within the current process. The store keeps the
+    most recently used embeddings in memory, so that experiments that embed the same texts (e.g., the same queries or
+    equal serializations of small tables) do not look them up in the database again.
+
+    :param db_path: Path to the DuckDB database file. The file is created if it does not exist.
+    :type db_path: str
+    :param memory_cache_bytes: Maximum size of the in-memory tier in bytes. Only applies when the store is created.
+    :type memory_cache_bytes: int
+    :return: Shared embedding store.
+    :rtype: LRUEmbeddingStore
+    """
+    absolute_db_path = os.path.abspath(db_path)
+    with _shared_embedding_stores_lock:
+        if absolute_db_path not in _shared_embedding_stores:
+            db_parent_dir = Path(absolute_db_path).parent
+            if not os.path.exists(db_parent_dir):
+                os.makedirs(db_parent_dir)
+            _shared_embedding_stores[absolute_db_path] = LRUEmbeddingStore(DuckDBEmbeddingStore(absolute_db_path),
+                                                                           max_size_bytes=memory_cache_bytes)
+        return _shared_embedding_stores[absolute_db_path]
+
+
+def _embed_deduplicated(embed: Callable[[List[str]], List[np.ndarray]], texts: List[str]) -> List[np.ndarray]:
+    # Embed each distinct text once and map the embeddings back to all positions of the text
+    distinct_texts = list(dict.fromkeys(texts))
+    if len(distinct_texts) == len(texts):
+        return embed(texts)
+    embeddings = dict(zip(distinct_texts, embed(distinct_texts)))
+    return [embeddings[text] for text in texts]
+
+# Marks the end of the items produced by a prefetching thread
+_END_OF_ITEMS = object()
+
+
+def _iter_prefetched(items: Iterator[T], prefetch_depth: int) -> Iterator[T]:
+    # Produce the items in a background thread that runs up to prefetch_depth items ahead of the consumer
+    if prefetch_depth <= 0:
+        yield from items
+        return
+    buffer = queue.Queue(maxsize=prefetch_depth)
+    stop = threading.Event()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((_END_OF_ITEMS, None))
+        except BaseException as e:
+            put((_END_OF_ITEMS, e))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _END_OF_ITEMS:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # Stop the producer if the consumer stops early (e.g., because embedding a chunk failed)
+        stop.set()
+        producer.join()
+
+
+def _serialize_in_chunks(serializer: Serializer, corpus_entries: List[Dict], chunk_size: int) -> Iterator[List[str]]:
+    for start in range(0, len(corpus_entries), chunk_size):
+        yield [serializer.serialize(corpus_entry["table"], metadata=corpus_entry["context"])
+               for corpus_entry in corpus_entries[start:start + chunk_size]]
+
+
+def estimate_num_tokens(text: str) -> int:
+    # Conservative estimate of the number of tokens of a text, English text averages about four characters per token
+    return len(text) // 3 + 1
+
+
 class CachingOpenAIClient:
+    """
+    OpenAI embedding client that caches embeddings in a DuckDB embedding store. Batches of texts are looked up in the
+    cache with bulk queries and the embeddings of cache misses are requested in chunks that respect the request size
+    and token limits of the embedding endpoint.
 
-    def __init__(self, api_key: str, cache_db_path: str, model_name: str = "text-embedding-3-small"):
-        self._client = OpenAI(api_key=api_key)
-        db_parent_dir = Path(cache_db_path).parent
-        if not os.path.exists(db_parent_dir):
-            os.makedirs(db_parent_dir)
-        self._store = DuckDBEmbeddingStore(cache_db_path)
+    :param api_key: OpenAI API key.
+    :type api_key: str
+    :param cache_db_path: Path to the DuckDB file that caches the embeddings.
+    :type cache_db_path: str
+    :param model_name: Name of the embedding model.
+    :type model_name: str
+    :param max_batch_size: Maximum number of texts per embedding request.
+    :type max_batch_size: int
+    :param max_batch_tokens: Maximum number of (estimated) tokens per embedding request.
+    :type max_batch_tokens: int
+    :param token_counter: Function that counts (or estimates) the tokens of a text. Defaults to a conservative estimate based on the number of characters.
+    :type token_counter: Optional[Callable[[str], int]]
+    :param max_lookup_batch_size: Maximum number of keys per bulk cache lookup.
+    :type max_lookup_batch_size: int
+    :param base_url: Optional base URL of an OpenAI-compatible embedding endpoint (e.g., a local stand-in).
+    :type base_url: Optional[str]
+    :param memory_cache_bytes: Maximum size of the in-memory tier of the embedding cache, which is shared by all clients of the process that use the same cache file.
+    :type memory_cache_bytes: int
+    """
+
+    def __init__(self, api_key: str, cache_db_path: str, model_name: str = "text-embedding-3-small",
+                 max_batch_size: int = 2048, max_batch_tokens: int = 250000,
+                 token_counter: Optional[Callable[[str], int]] = None, max_lookup_batch_size: int = 10000,
+                 base_url: Optional[str] = None, memory_cache_bytes: int = 2 ** 29):
+        self._client = OpenAI(api_key=api_key, base_url=base_url)
+        self._store = get_shared_embedding_store(cache_db_path, memory_cache_bytes)
         self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        if token_counter is None:
+            token_counter = estimate_num_tokens
+        self.token_counter = token_counter
+        self.max_lookup_batch_size = max_lookup_batch_size
 
     def embed(self, text: str) -> np.ndarray:
         text_hash = sha1(text.encode()).hexdigest()
@@ -40,68 +243,146 @@ class CachingOpenAIClient:
             self._store.put(text_hash, embedding)
             return embedding
 
+    def _get_cached(self, text_hashes: List[str]) -> Dict[str, np.ndarray]:
+        # Look up the embeddings of distinct keys with one bulk query per lookup batch
+        distinct_hashes = list(dict.fromkeys(text_hashes))
+        cached_embeddings = {}
+        for start in range(0, len(distinct_hashes), self.max_lookup_batch_size):
+            cached_embeddings.update(self._store.get_all(distinct_hashes[start:start + self.max_lookup_batch_size]))
+        return cached_embeddings
+
+    def _split_into_requests(self, texts: List[str]) -> Iterator[List[int]]:
+        # Greedily group texts into requests that respect the maximum number of texts and tokens per request
+        request_indices = []
+        request_tokens = 0
+        for index, text in enumerate(texts):
+            num_tokens = self.token_counter(text)
+            if len(request_indices) > 0 and (len(request_indices) >= self.max_batch_size or
+                                             request_tokens + num_tokens > self.max_batch_tokens):
+                yield request_indices
+                request_indices = []
+                request_tokens = 0
+            request_indices.append(index)
+            request_tokens += num_tokens
+        if len(request_indices) > 0:
+            yield request_indices
+
     def batch_embed(self, texts: List[str]) -> List[np.ndarray]:
-        embedding_results = np.zeros(shape=(len(texts),), dtype=np.ndarray)
-        call_indices = []
-        call_texts = []
         text_hashes = [sha1(input_str.encode()).hexdigest() for input_str in texts]
-        for index, input_str in enumerate(texts):
-            try:
-                embedding_results[index] = self._store.get(text_hashes[index])
-            except KeyError:
-                call_indices.append(index)
-                call_texts.append(input_str)
-        if len(call_indices) > 0:
-            # Only call the embedding endpoint for inputs with cache misses
-            embeddings = self._client.embeddings.create(input=call_texts, model=self.model_name)
-            embeddings = [np.array(emb.embedding, dtype=np.float32) for emb in embeddings.data]
-            for index, embedding in enumerate(embeddings):
-                self._store.put(text_hashes[call_indices[index]], embedding)
-            embedding_results[call_indices] = embeddings
-        return embedding_results.tolist()
+        embeddings = self._get_cached(text_hashes)
+        # Only call the embedding endpoint for distinct inputs with cache misses
+        missing = {}
+        for text_hash, input_str in zip(text_hashes, texts):
+            if text_hash not in embeddings and text_hash not in missing:
+                missing[text_hash] = input_str
+        missing_hashes = list(missing.keys())
+        missing_texts = list(missing.values())
+        for request_indices in self._split_into_requests(missing_texts):
+            response = self._client.embeddings.create(input=[missing_texts[index] for index in request_indices],
+                                                      model=self.model_name)
+            request_hashes = [missing_hashes[index] for index in request_indices]
+            request_embeddings = [np.array(emb.embedding, dtype=np.float32) for emb in response.data]
+            # Embeddings are stored after every request, so that completed requests are cached if a later one fails
+            self._store.put_all(request_hashes, request_embeddings)
+            embeddings.update(zip(request_hashes, request_embeddings))
+        return [embeddings[text_hash] for text_hash in text_hashes]
 
 
 class ConfigurableRetriever(AbsStandardEmbeddingRetriever):
+    """
+    Retriever that embeds tables serialized by a serializer with a Text Embeddings Inference (TEI) endpoint. Batches of
+    tables are serialized in chunks in a background thread while the previous chunks are embedded.
+
+    :param serializer: Serializer for the tables.
+    :type serializer: Serializer
+    :param tei_endpoint: URL of the TEI endpoint.
+    :type tei_endpoint: str
+    :param db_path: Path to the DuckDB file that caches the table embeddings.
+    :type db_path: str
+    :param query_embedding_db_path: Optional path to a separate DuckDB file that caches the query embeddings.
+    :type query_embedding_db_path: Optional[str]
+    :param embedding_batch_size: Batch size of the retriever.
+    :type embedding_batch_size: Optional[int]
+    :param pipeline_chunk_size: Number of tables that are serialized and embedded together.
+    :type pipeline_chunk_size: int
+    :param prefetch_depth: Number of chunks that are serialized ahead of the chunk that is being embedded. Set to 0 to serialize and embed sequentially.
+    :type prefetch_depth: int
+    :param memory_cache_bytes: Maximum size of the in-memory tier of the embedding caches, which are shared by all retrievers of the process that use the same cache files.
+    :type memory_cache_bytes: int
+    """
 
     def __init__(self, serializer: Serializer, tei_endpoint: str = "http://127.0.0.1:8001",
-                 db_path: str = "cache/embedding_cache.duckdb", query_embedding_db_path: Optional[str] = None, embedding_batch_size: Optional[int] = None):
+                 db_path: str = "cache/embedding_cache.duckdb", query_embedding_db_path: Optional[str] = None, embedding_batch_size: Optional[int] = None,
+                 pipeline_chunk_size: int = 16, prefetch_depth: int = 2, memory_cache_bytes: int = 2 ** 29):
         super().__init__(expected_corpus_format="dataframe", embedding_batch_size=embedding_batch_size)
         self.serializer = serializer
-        db_parent_dir = Path(db_path).parent
-        if not os.path.exists(db_parent_dir):
-            os.makedirs(db_parent_dir)
-        self.corpus_tei_client = TEIClient(url=tei_endpoint, embedding_store=DuckDBEmbeddingStore(db_path=db_path))
+        self.pipeline_chunk_size = pipeline_chunk_size
+        self.prefetch_depth = prefetch_depth
+        self.corpus_tei_client = TEIClient(url=tei_endpoint,
+                                           embedding_store=get_shared_embedding_store(db_path, memory_cache_bytes))
         self.query_tei_client = self.corpus_tei_client
         if query_embedding_db_path is not None:
             self.query_tei_client = TEIClient(url=tei_endpoint,
-                                              embedding_store=DuckDBEmbeddingStore(db_path=query_embedding_db_path))
+                                              embedding_store=get_shared_embedding_store(query_embedding_db_path,
+                                                                                         memory_cache_bytes))
 
     def embed_query(self, query: str, dataset_name: str, **kwargs) -> np.ndarray:
         return self.query_tei_client.embed(query)
 
     def batch_embed_queries(self, queries: List[str], dataset_name: str) -> List[np.ndarray]:
-        return self.query_tei_client.embed(queries)
+        return _embed_deduplicated(self.query_tei_client.embed, queries)
 
     def embed_corpus(self, dataset_name: str, corpus_entry: Dict) -> np.ndarray:
         serialized_table = self.serializer.serialize(corpus_entry["table"], metadata=corpus_entry["context"])
         return self.corpus_tei_client.embed(serialized_table)
 
     def batch_embed_corpora(self, dataset_name: str, corpus_entries: List[Dict]) -> List[np.ndarray]:
-        serialized_corpora = [self.serializer.serialize(corpus_entry["table"], metadata=corpus_entry["context"]) for corpus_entry in corpus_entries]
-        return self.corpus_tei_client.embed(serialized_corpora)
+        embeddings = []
+        for serialized_chunk in _iter_prefetched(_serialize_in_chunks(self.serializer, corpus_entries,
+                                                                      self.pipeline_chunk_size), self.prefetch_depth):
+            embeddings.extend(_embed_deduplicated(self.corpus_tei_client.embed, serialized_chunk))
+        return embeddings
 
 
 class ConfigurableOpenAIRetriever(AbsStandardEmbeddingRetriever):
+    """
+    Retriever that embeds tables serialized by a serializer with an OpenAI embedding model. Batches of tables are
+    serialized in chunks in a background thread while the previous chunks are embedded.
+
+    :param serializer: Serializer for the tables.
+    :type serializer: Serializer
+    :param api_key: OpenAI API key.
+    :type api_key: str
+    :param db_path: Path to the DuckDB file that caches the table embeddings.
+    :type db_path: str
+    :param query_embedding_db_path: Optional path to a separate DuckDB file that caches the query embeddings.
+    :type query_embedding_db_path: Optional[str]
+    :param embedding_model_name: Name of the embedding model.
+    :type embedding_model_name: str
+    :param embedding_batch_size: Batch size of the retriever.
+    :type embedding_batch_size: Optional[int]
+    :param base_url: Optional base URL of an OpenAI-compatible embedding endpoint.
+    :type base_url: Optional[str]
+    :param pipeline_chunk_size: Number of tables that are serialized and embedded together.
+    :type pipeline_chunk_size: int
+    :param prefetch_depth: Number of chunks that are serialized ahead of the chunk that is being embedded. Set to 0 to serialize and embed sequentially.
+    :type prefetch_depth: int
+    :param memory_cache_bytes: Maximum size of the in-memory tier of the embedding caches, which are shared by all retrievers of the process that use the same cache files.
+    :type memory_cache_bytes: int
+    """
 
     def __init__(self, serializer: Serializer, api_key: str, db_path: str = "cache/embedding_cache.duckdb",
                  query_embedding_db_path: Optional[str] = None, embedding_model_name: str = "text-embedding-3-small",
-                 embedding_batch_size: Optional[int] = None):
+                 embedding_batch_size: Optional[int] = None, base_url: Optional[str] = None,
+                 pipeline_chunk_size: int = 16, prefetch_depth: int = 2, memory_cache_bytes: int = 2 ** 29):
         super().__init__(expected_corpus_format="dictionary", embedding_batch_size=embedding_batch_size)
         self.serializer = serializer
-        self.corpus_openai_client = CachingOpenAIClient(api_key=api_key, cache_db_path=db_path, model_name=embedding_model_name)
+        self.pipeline_chunk_size = pipeline_chunk_size
+        self.prefetch_depth = prefetch_depth
+        self.corpus_openai_client = CachingOpenAIClient(api_key=api_key, cache_db_path=db_path, model_name=embedding_model_name, base_url=base_url, memory_cache_bytes=memory_cache_bytes)
         self.query_openai_client = self.corpus_openai_client
         if query_embedding_db_path is not None:
-            self.query_openai_client = CachingOpenAIClient(api_key=api_key, cache_db_path=query_embedding_db_path, model_name=embedding_model_name)
+            self.query_openai_client = CachingOpenAIClient(api_key=api_key, cache_db_path=query_embedding_db_path, model_name=embedding_model_name, base_url=base_url, memory_cache_bytes=memory_cache_bytes)
 
 
     def embed_query(self, query: str, dataset_name: str) -> np.ndarray:
@@ -115,11 +396,16 @@ class ConfigurableOpenAIRetriever(AbsStandardEmbeddingRetriever):
         return self.corpus_openai_client.embed(serialized_table)
 
     def batch_embed_corpora(self, dataset_name: str, corpus_entries: List[Dict]) -> List[np.ndarray]:
-        serialized_corpora = [self.serializer.serialize(corpus_entry["table"], metadata=corpus_entry["context"]) for corpus_entry in corpus_entries]
-        return self.corpus_openai_client.batch_embed(serialized_corpora)
+        embeddings = []
+        for serialized_chunk in _iter_prefetched(_serialize_in_chunks(self.serializer, corpus_entries,
+                                                                      self.pipeline_chunk_size), self.prefetch_depth):
+            embeddings.extend(self.corpus_openai_client.batch_embed(serialized_chunk))
+        return embeddings
 
 
 class TARGETOpenAIExperimentExecutor:
+    # The embedding caches of the experiments are DuckDB files, which only a single process can open for writing
+    supports_parallel_experiments = False
 
     def __init__(self, api_key: str, dataset_name: str, split: str = "test",
                  embedding_model_name: str = "text-embedding-3-small", top_k: int = 20,
@@ -146,6 +432,8 @@ class TARGETOpenAIExperimentExecutor:
                              retrieval_results_dir=experiment_results_folder)
 
 class TARGETTEIExperimentExecutor:
+    # The embedding caches of the experiments are DuckDB files, which only a single process can open for writing
+    supports_parallel_experiments = False
 
     def __init__(self, embedding_model_name: str, dataset_name: str, split: str = "test",
                  tei_endpoint: str = "http://127.0.0.1:8001", top_k: int = 20, embedding_cache_dir: str = None,
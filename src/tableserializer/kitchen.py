@@ -1,36 +1,32 @@
 import abc
+import functools
 import inspect
 import json
 import logging
 import os
-from typing import List, Dict, Any, Type, TypeVar, Callable, Tuple
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Type, TypeVar, Callable, Tuple, Iterable, Optional, Iterator
 
 from tableserializer.utils.functions import get_serializer_experiment_dir_structure
+from tableserializer.manifest import ExperimentManifest, discover_serializer_configs, SERIALIZER_CONFIG_FILE
 from tableserializer.recipe import SCHEMA_KEY, METADATA_KEY, TABLE_KEY
 from tableserializer import SerializationRecipe
+from tableserializer.cache import ComponentCache
 from tableserializer.serializer import Serializer
+from tableserializer.serializer.budget import TokenBudget
+from tableserializer.serializer.grid import SerializerGrid
+from tableserializer.serializer.instrumentation import SerializationProfiler
 from tableserializer.serializer.metadata import MetadataSerializer, PairwiseMetadataSerializer, JSONMetadataSerializer
 from tableserializer.table.preprocessor import TablePreprocessor, ColumnDroppingPreprocessor, \
     StringTruncationPreprocessor
-from tableserializer.table.row_sampler import RowSampler, RandomRowSampler, FirstRowSampler, KMeansRowSampler
+from tableserializer.table.row_sampler import RowSampler, RandomRowSampler, FirstRowSampler, KMeansRowSampler, \
+    ScalableKMeansRowSampler
 from tableserializer.serializer.table import RawTableSerializer, JSONRawTableSerializer, MarkdownRawTableSerializer
 from tableserializer.serializer.schema import SchemaSerializer, ColumnNameSchemaSerializer, SQLSchemaSerializer
-from tableserializer.utils.exceptions import ClassDefinitionError
-
-
-def _extract_instance_save_state(instance: Any) -> Dict[str, Any]:
-    constructor_args = inspect.signature(instance.__init__).parameters
-    args_data = {}
-    for param in constructor_args:
-        if param in ['args', 'kwargs']:
-            continue
-        try:
-            args_data[param] = getattr(instance, param)
-        except AttributeError:
-            raise AttributeError(f"Instance of type {type(instance).__name__} has the constructor parameter {param} but"
-                                 f" it does not have the {param} attribute. Make sure that constructor parameters and "
-                                 f"class attributes match.")
-    return {"name": type(instance).__name__, "args": args_data}
+from tableserializer.utils.exceptions import ClassDefinitionError, ExperimentError
 
 
 def _verify_constructor_args(cls: Type) -> None:
@@ -73,6 +69,109 @@ def _verify_constructor_args(cls: Type) -> None:
 
 T = TypeVar('T')
 
+# Serializer instance of a worker process, rebuilt once per worker by _init_serialization_worker
+_worker_serializer: Optional[Serializer] = None
+
+
+def _init_serialization_worker(kitchen: "ExperimentalSerializerKitchen", serializer_json: str,
+                               cache: Optional[ComponentCache], token_budget: Optional[TokenBudget]) -> None:
+    global _worker_serializer
+    _worker_serializer = kitchen.unjar_from_json(serializer_json)
+    # The cache and the token budget are not part of the JSON representation of the serializer
+    _worker_serializer.cache = cache
+    _worker_serializer.token_budget = token_budget
+
+
+def _serialize_in_worker(entry: Tuple[Any, Dict[str, Any]]) -> str:
+    table, metadata = entry
+    return _worker_serializer.serialize(table, metadata)
+
+
+EXPERIMENT_STATUS_FILE = "experiment_status.json"
+
+# Experiment result: (experiment folder, traceback of the error or None if the experiment succeeded, duration)
+ExperimentResult = Tuple[str, Optional[str], float]
+
+# Kitchen and experiment settings of a worker process, set once per worker by _init_experiment_worker
+_worker_kitchen: Optional["ExperimentalSerializerKitchen"] = None
+_worker_experiment_settings: Optional[Tuple[Callable, bool, bool]] = None
+
+
+def _supports_parallel_experiments(experiment_callback: Callable) -> bool:
+    # Look up the supports_parallel_experiments attribute on the callback and on the objects it wraps
+    callback = experiment_callback
+    visited = set()
+    while callback is not None and id(callback) not in visited:
+        visited.add(id(callback))
+        supports_parallel_experiments = getattr(callback, "supports_parallel_experiments", None)
+        if supports_parallel_experiments is not None:
+            return bool(supports_parallel_experiments)
+        if isinstance(callback, functools.partial):
+            callback = callback.func
+        elif hasattr(callback, "__wrapped__"):
+            callback = callback.__wrapped__
+        elif inspect.ismethod(callback):
+            callback = callback.__self__
+        else:
+            callback = None
+    return True
+
+
+def _run_experiment(kitchen: "ExperimentalSerializerKitchen", experiment_dir: str, experiment_callback: Callable,
+                    profile: bool, profile_memory: bool) -> ExperimentResult:
+    start = time.perf_counter()
+    try:
+        serializer = kitchen.load_serializer_from_experiment_dir(experiment_dir)
+        if profile:
+            profiler = SerializationProfiler(trace_memory=profile_memory)
+            serializer.observers.append(profiler)
+            try:
+                experiment_callback(experiment_dir, serializer)
+            finally:
+                serializer.observers.remove(profiler)
+                profiler.save_report(os.path.join(experiment_dir, "serialization_profile.json"))
+        else:
+            experiment_callback(experiment_dir, serializer)
+    except Exception:
+        return experiment_dir, traceback.format_exc(), time.perf_counter() - start
+    return experiment_dir, None, time.perf_counter() - start
+
+
+def _init_experiment_worker(kitchen: "ExperimentalSerializerKitchen", experiment_callback: Callable, profile: bool,
+                            profile_memory: bool) -> None:
+    global _worker_kitchen, _worker_experiment_settings
+    _worker_kitchen = kitchen
+    _worker_experiment_settings = (experiment_callback, profile, profile_memory)
+
+
+def _run_experiment_in_worker(experiment_dir: str) -> ExperimentResult:
+    return _run_experiment(_worker_kitchen, experiment_dir, *_worker_experiment_settings)
+
+
+def read_experiment_status(experiment_dir: str) -> Dict[str, Any]:
+    """
+    Read the status record of an experiment. The record contains the status ("completed" or "failed"), the number of
+    attempts, the duration of the last attempt and the error of the last failed attempt.
+
+    :param experiment_dir: Experiment folder.
+    :type experiment_dir: str
+    :return: Status record of the experiment, an empty dictionary if the experiment has not been run yet.
+    :rtype: Dict[str, Any]
+    """
+    status_file = os.path.join(experiment_dir, EXPERIMENT_STATUS_FILE)
+    if not os.path.exists(status_file):
+        return {}
+    with open(status_file, "r") as f:
+        return json.load(f)
+
+
+def _write_experiment_status(experiment_dir: str, status: Dict[str, Any]) -> None:
+    # Write to a temporary file first, so that an interrupted run never leaves a partially written status record
+    status_file = os.path.join(experiment_dir, EXPERIMENT_STATUS_FILE)
+    with open(status_file + ".tmp", "w+") as f:
+        json.dump(status, f, indent=2)
+    os.replace(status_file + ".tmp", status_file)
+
 
 class ExperimentalSerializerKitchen:
     """
@@ -101,10 +200,21 @@ class ExperimentalSerializerKitchen:
         self.register_row_sampler_class(RandomRowSampler)
         self.register_row_sampler_class(FirstRowSampler)
         self.register_row_sampler_class(KMeansRowSampler)
+        self.register_row_sampler_class(ScalableKMeansRowSampler)
 
         self.register_table_preprocessor_class(ColumnDroppingPreprocessor)
         self.register_table_preprocessor_class(StringTruncationPreprocessor)
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # Loggers cannot be pickled, the logger is recreated when the kitchen is restored (e.g., in a worker process)
+        state = self.__dict__.copy()
+        del state["_logger"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._logger = logging.Logger(self.__class__.__name__, level=logging.INFO)
+
     def _create_instance(self, instance_name: str, registry: Dict[str, Type[T]], **kwargs) -> T:
         if instance_name not in registry.keys():
             raise KeyError(instance_name + " not found in registry")
@@ -167,6 +277,22 @@ class ExperimentalSerializerKitchen:
         """
         self._register_class(table_preprocessor_class, self._table_preprocessor_pantry, TablePreprocessor)
 
+    def get_registered_classes(self) -> Dict[str, Dict[str, Type]]:
+        """
+        Get all registered component classes, grouped by the kind of component ("schema_serializer",
+        "table_serializer", "metadata_serializer", "row_sampler", and "table_preprocessor").
+
+        :return: Dictionary mapping the kind of component to a dictionary of registered class names and classes.
+        :rtype: Dict[str, Dict[str, Type]]
+        """
+        return {
+            "schema_serializer": dict(self._schema_serializer_pantry),
+            "table_serializer": dict(self._table_serializer_pantry),
+            "metadata_serializer": dict(self._metadata_serializer_pantry),
+            "row_sampler": dict(self._row_sampler_pantry),
+            "table_preprocessor": dict(self._table_preprocessor_pantry),
+        }
+
     def create_schema_serializer(self, schema_serializer_name: str, **kwargs: Any) -> SchemaSerializer:
         """
         Create a SchemaSerializer for the given schema serializer name. This assumes that a SchemaSerializer with the
@@ -251,28 +377,7 @@ class ExperimentalSerializerKitchen:
         :return: JSON representation of the given serializer.
         :rtype: str
         """
-        serializer_config = {
-            "schema_serializer": None,
-            "table_serializer": None,
-            "metadata_serializer": None,
-            "row_sampler": None,
-            "table_preprocessors": [],
-            "recipe": serializer.recipe.get_raw_recipe()
-        }
-
-        if serializer.schema_serializer is not None:
-            serializer_config["schema_serializer"] = _extract_instance_save_state(serializer.schema_serializer)
-        if serializer.table_serializer is not None:
-            serializer_config["table_serializer"] = _extract_instance_save_state(serializer.table_serializer)
-        if serializer.metadata_serializer is not None:
-            serializer_config["metadata_serializer"] = _extract_instance_save_state(serializer.metadata_serializer)
-        if serializer.row_sampler is not None:
-            serializer_config["row_sampler"] = _extract_instance_save_state(serializer.row_sampler)
-        if len(serializer.table_preprocessors) > 0:
-            for table_preprocessor in serializer.table_preprocessors:
-                serializer_config["table_preprocessors"].append(_extract_instance_save_state(table_preprocessor))
-
-        return json.dumps(serializer_config)
+        return json.dumps(serializer.get_config())
 
     def unjar_from_json(self, serializer_json: str) -> Serializer:
         """
@@ -311,6 +416,34 @@ class ExperimentalSerializerKitchen:
         return Serializer(recipe, metadata_serializer, schema_serializer, table_serializer, row_sampler,
                           table_preprocessors)
 
+    def serialize_many(self, serializer: Serializer, entries: Iterable[Tuple[Any, Dict[str, Any]]],
+                       workers: Optional[int] = None, chunksize: int = 32) -> List[str]:
+        """
+        Serialize many tables with the given serializer across a pool of worker processes. Each worker rebuilds the
+        serializer once from its JSON representation, so all components of the serializer must be registered in this
+        kitchen. The cache and the token budget of the serializer are passed to the workers as well.
+
+        :param serializer: Serializer used to serialize the tables.
+        :type serializer: Serializer
+        :param entries: Iterable of (table, metadata) pairs to serialize.
+        :type entries: Iterable[Tuple[Any, Dict[str, Any]]]
+        :param workers: Number of worker processes. Defaults to the number of processors on the machine. With a single worker, the tables are serialized in the current process.
+        :type workers: Optional[int]
+        :param chunksize: Number of entries that are sent to a worker process at once.
+        :type chunksize: int
+        :return: List of serializations in the order of the input entries.
+        :rtype: List[str]
+        """
+        if workers == 1:
+            return [serializer.serialize(table, metadata) for table, metadata in entries]
+        serializer_json = self.jar_up_as_json(serializer)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_serialization_worker,
+                                 initargs=(self, serializer_json, serializer.cache,
+                                           serializer.token_budget)) as executor:
+            serializations = list(executor.map(_serialize_in_worker, entries, chunksize=chunksize))
+        self._logger.info(f"Serialized {len(serializations)} table(s).")
+        return serializations
+
     def create_serializers(self, recipes: List[SerializationRecipe],
                            metadata_serializers: List[MetadataSerializer],
                            schema_serializers: List[SchemaSerializer],
@@ -335,41 +468,49 @@ class ExperimentalSerializerKitchen:
         :return: A list of serializers for all possible combinations of components.
         :rtype: List[Serializer]
         """
-        serializers = []
-        for recipe in recipes:
-            recipe_fields = recipe.get_fields()
-
-            r_metadata_serializers = [None]
-            r_schema_serializers = [None]
-            r_table_serializers = [None]
-            r_row_samplers = [None]
-
-            if METADATA_KEY in recipe_fields:
-                r_metadata_serializers = metadata_serializers
-            if SCHEMA_KEY in recipe_fields:
-                r_schema_serializers = schema_serializers
-            if TABLE_KEY in recipe_fields:
-                r_table_serializers = table_serializers
-                r_row_samplers = row_samplers
-
-            for metadata_serializer in r_metadata_serializers:
-                for schema_serializer in r_schema_serializers:
-                    for table_serializer in r_table_serializers:
-                        for row_sampler in r_row_samplers:
-                            for table_preprocessors in table_preprocessor_constellations:
-                                serializers.append(Serializer(recipe, metadata_serializer, schema_serializer,
-                                                              table_serializer,  row_sampler, table_preprocessors))
+        serializers = list(self.create_serializer_grid(recipes, metadata_serializers, schema_serializers,
+                                                       table_serializers, row_samplers,
+                                                       table_preprocessor_constellations))
         self._logger.info(f"Created {len(serializers)} serializer(s).")
         return serializers
 
+    def create_serializer_grid(self, recipes: List[SerializationRecipe],
+                               metadata_serializers: List[MetadataSerializer],
+                               schema_serializers: List[SchemaSerializer],
+                               table_serializers: List[RawTableSerializer],
+                               row_samplers: List[RowSampler],
+                               table_preprocessor_constellations: List[List[TablePreprocessor]]) -> SerializerGrid:
+        """
+        Create a lazy grid of serializers with different parameter configurations. The grid holds the same serializers
+        in the same order as create_serializers, but creates them only on access and can be split into shards (see
+        SerializerGrid.shard), e.g., to distribute experiments over several nodes.
 
-    def save_serializer_experiment_configurations(self, serializers: List[Serializer], base_folder: str) -> None:
+        :param recipes: List of recipes for which to create serializer instances.
+        :type recipes: List[SerializationRecipe]
+        :param metadata_serializers: List of metadata serializers for which to create serializer instances.
+        :type metadata_serializers: List[MetadataSerializer]
+        :param schema_serializers: List of schema serializers for which to create serializer instances.
+        :type schema_serializers: List[SchemaSerializer]
+        :param table_serializers: List of raw table serializers for which to create serializer instances.
+        :type table_serializers: List[RawTableSerializer]
+        :param row_samplers: List of row samplers for which to create serializer instances.
+        :type row_samplers: List[RowSampler]
+        :param table_preprocessor_constellations: List of table preprocessor constellations for which to create serializer instances.
+        :type table_preprocessor_constellations: List[List[TablePreprocessor]]
+        :return: A lazy grid of serializers for all possible combinations of components.
+        :rtype: SerializerGrid
+        """
+        return SerializerGrid(recipes, metadata_serializers, schema_serializers, table_serializers, row_samplers,
+                              table_preprocessor_constellations)
+
+
+    def save_serializer_experiment_configurations(self, serializers: Iterable[Serializer], base_folder: str) -> None:
         """
         Create a folder structure within a base folder and save configurations of the provided serializers into this
-        structure.
+        structure. The serializers are also recorded in the manifest of the base folder (see ExperimentManifest).
 
-        :param serializers: Serializers that are saved.
-        :type serializers: List[Serializer]
+        :param serializers: Serializers that are saved, e.g., a list of serializers or a (sharded) SerializerGrid.
+        :type serializers: Iterable[Serializer]
         :param base_folder: Base folder that configuration files will be saved into.
         :type base_folder: str
         :return: None
@@ -378,45 +519,206 @@ class ExperimentalSerializerKitchen:
         if not os.path.exists(base_folder):
             os.makedirs(base_folder)
 
+        manifest_entries = []
         for serializer in serializers:
-            experiment_path = os.path.join(base_folder, get_serializer_experiment_dir_structure(serializer))
+            experiment_dir_structure = get_serializer_experiment_dir_structure(serializer)
+            experiment_path = os.path.join(base_folder, experiment_dir_structure)
             os.makedirs(experiment_path, exist_ok=True)
-            serializer_json = self.jar_up_as_json(serializer)
-            with open(os.path.join(experiment_path, "serializer.json"), "w+") as f:
-                f.write(serializer_json)
-        self._logger.info(f"Saved {len(serializers)} serializer(s) to base folder {base_folder}.")
+            serializer_config = serializer.get_config()
+            with open(os.path.join(experiment_path, SERIALIZER_CONFIG_FILE), "w+") as f:
+                f.write(json.dumps(serializer_config))
+            manifest_entries.append({"fingerprint": serializer.get_fingerprint(), "path": experiment_dir_structure,
+                                     "config": serializer_config})
+        ExperimentManifest(base_folder).update(manifest_entries)
+        self._logger.info(f"Saved {len(manifest_entries)} serializer(s) to base folder {base_folder}.")
 
     def get_serializers_from_dir(self, base_folder: str) -> List[Tuple[str, Serializer]]:
         """
         Get a list of serializers that have been saved in a base folder.
 
-        :param base_folder: Base folder where
-        :return: A tuple (experiment_folder, )
+        :param base_folder: Base folder where the serializers have been saved.
+        :type base_folder: str
+        :return: A list of tuples (experiment_folder, serializer).
+        :rtype: List[Tuple[str, Serializer]]
+        """
+        return list(self.iter_serializers_from_dir(base_folder))
+
+    def _iter_experiment_configs(self, base_folder: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        manifest = ExperimentManifest(base_folder)
+        if manifest.exists():
+            for entry in manifest:
+                yield manifest.get_experiment_dir(entry), entry["config"]
+            return
+        # Base folders without manifest (e.g., saved with an older version) are discovered by walking the folder
+        yield from discover_serializer_configs(base_folder)
+
+    def iter_serializers_from_dir(self, base_folder: str, schema_serializer: Optional[str] = None,
+                                  table_serializer: Optional[str] = None, metadata_serializer: Optional[str] = None,
+                                  row_sampler: Optional[str] = None, table_preprocessor: Optional[str] = None,
+                                  recipe: Optional[str] = None) -> Iterator[Tuple[str, Serializer]]:
+        """
+        Lazily iterate over the serializers that have been saved in a base folder, optionally filtered by the class
+        names of their components. The serializers are read from the manifest of the base folder if it exists.
+
+        :param base_folder: Base folder where the serializers have been saved.
+        :type base_folder: str
+        :param schema_serializer: Only yield serializers with a schema serializer of this class.
+        :type schema_serializer: Optional[str]
+        :param table_serializer: Only yield serializers with a raw table serializer of this class.
+        :type table_serializer: Optional[str]
+        :param metadata_serializer: Only yield serializers with a metadata serializer of this class.
+        :type metadata_serializer: Optional[str]
+        :param row_sampler: Only yield serializers with a row sampler of this class.
+        :type row_sampler: Optional[str]
+        :param table_preprocessor: Only yield serializers with a table preprocessor of this class.
+        :type table_preprocessor: Optional[str]
+        :param recipe: Only yield serializers with this raw recipe.
+        :type recipe: Optional[str]
+        :return: Iterator over tuples (experiment_folder, serializer).
+        :rtype: Iterator[Tuple[str, Serializer]]
+        """
+        for experiment_dir, config in self._iter_experiment_configs(base_folder):
+            if ExperimentManifest.matches_components(config, schema_serializer, table_serializer, metadata_serializer,
+                                                     row_sampler, table_preprocessor, recipe):
+                yield experiment_dir, self.unjar_from_json(json.dumps(config))
+
+    def get_serializer_from_dir(self, base_folder: str, fingerprint: str) -> Tuple[str, Serializer]:
+        """
+        Get the serializer with the given fingerprint (see Serializer.get_fingerprint) from the manifest of a base
+        folder. Raises a KeyError if the manifest holds no serializer with this fingerprint.
+
+        :param base_folder: Base folder where the serializers have been saved.
+        :type base_folder: str
+        :param fingerprint: Fingerprint of the serializer.
+        :type fingerprint: str
+        :return: A tuple (experiment_folder, serializer).
+        :rtype: Tuple[str, Serializer]
         """
-        experiments = []
-        for dirpath, dirnames, filenames in os.walk(base_folder):
-            if "serializer.json" in filenames:
-                serializer_file = os.path.join(dirpath, filenames[0])
-                with open(serializer_file, "r") as f:
-                    serializer_json = f.read()
-                serializer = self.unjar_from_json(serializer_json)
-                experiments.append((dirpath, serializer))
-        return experiments
+        manifest = ExperimentManifest(base_folder)
+        entry = manifest.get(fingerprint)
+        return manifest.get_experiment_dir(entry), self.unjar_from_json(json.dumps(entry["config"]))
 
-    def run_experiments_with_serializers(self, base_folder: str, experiment_callback: Callable) -> None:
+    def load_serializer_from_experiment_dir(self, experiment_dir: str) -> Serializer:
         """
-        Provide a callback function and run experiments over all serializers saved in the base folder.
+        Load the serializer that is saved in an experiment folder.
+
+        :param experiment_dir: Experiment folder containing a serializer.json file.
+        :type experiment_dir: str
+        :return: Serializer of the experiment.
+        :rtype: Serializer
+        """
+        with open(os.path.join(experiment_dir, SERIALIZER_CONFIG_FILE), "r") as f:
+            serializer_json = f.read()
+        return self.unjar_from_json(serializer_json)
+
+    def _execute_experiments(self, experiment_dirs: List[str], experiment_callback: Callable, profile: bool,
+                             profile_memory: bool, workers: Optional[int],
+                             parallel_safe: Optional[bool]) -> Iterator[ExperimentResult]:
+        if parallel_safe is None:
+            parallel_safe = _supports_parallel_experiments(experiment_callback)
+        if workers != 1 and not parallel_safe:
+            self._logger.warning(f"The experiment callback does not support parallel experiments, running the "
+                                 f"experiments in the current process instead of {workers} worker processes.")
+            workers = 1
+        if workers == 1:
+            for index, experiment_dir in enumerate(experiment_dirs):
+                self._logger.info(f"Running experiment {index+1}/{len(experiment_dirs)}.")
+                yield _run_experiment(self, experiment_dir, experiment_callback, profile, profile_memory)
+            return
+        num_finished = 0
+        unfinished_dirs = experiment_dirs
+        while len(unfinished_dirs) > 0:
+            # Workers are started once and keep their kitchen (and the caches of its components) across experiments
+            broken_pool_error = None
+            finished_dirs = set()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_experiment_worker,
+                                     initargs=(self, experiment_callback, profile, profile_memory)) as executor:
+                futures = {executor.submit(_run_experiment_in_worker, experiment_dir): experiment_dir
+                           for experiment_dir in unfinished_dirs}
+                for future in as_completed(futures):
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        # A worker process died (e.g., it ran out of memory), which fails all unfinished experiments
+                        broken_pool_error = traceback.format_exc()
+                        continue
+                    except Exception:
+                        result = futures[future], traceback.format_exc(), 0.0
+                    finished_dirs.add(futures[future])
+                    num_finished += 1
+                    self._logger.info(f"Finished experiment {num_finished}/{len(experiment_dirs)}.")
+                    yield result
+            if broken_pool_error is None:
+                return
+            unfinished_dirs = [experiment_dir for experiment_dir in unfinished_dirs
+                               if experiment_dir not in finished_dirs]
+            if len(finished_dirs) == 0:
+                # No experiment finished since the pool was started, the unfinished experiments fail instead of
+                # breaking the next pool as well
+                for experiment_dir in unfinished_dirs:
+                    yield experiment_dir, broken_pool_error, 0.0
+                return
+            self._logger.warning(f"A worker process died, restarting the workers for the {len(unfinished_dirs)} "
+                                 f"unfinished experiment(s).")
+
+    def run_experiments_with_serializers(self, base_folder: str, experiment_callback: Callable, profile: bool = False,
+                                         profile_memory: bool = False, workers: Optional[int] = 1,
+                                         resume: bool = False, max_attempts: int = 1,
+                                         parallel_safe: Optional[bool] = None) -> None:
+        """
+        Provide a callback function and run experiments over all serializers saved in the base folder. The outcome of
+        each experiment is recorded in an experiment_status.json file in the experiment folder. Failing experiments do
+        not stop the remaining experiments, they are retried up to max_attempts times and an ExperimentError is raised
+        at the end if any experiment still failed.
 
         :param base_folder: Base folder that serializer configuration files reside in.
         :type base_folder: str
         :param experiment_callback: Callback function that is invoked with a tuple (experiment_folder, serializer) (`Tuple[str, Serializer]`) for each experiment. The callback function is provided the experiment folder as string value and the associated `Serializer`.
         :type experiment_callback: Callable
+        :param profile: Set to true to profile the stages of all serializations of each experiment. The per-stage report is saved as serialization_profile.json in the experiment folder.
+        :type profile: bool
+        :param profile_memory: Set to true to additionally trace the peak memory of each stage when profiling. Tracing memory slows down serialization considerably.
+        :type profile_memory: bool
+        :param workers: Number of worker processes that run the experiments. With a single worker, the experiments run in the current process. With more workers (or None for the number of processors on the machine), the experiment callback has to be picklable (e.g., a module-level function) and all components of the serializers must be registered in this kitchen. If a worker process dies, the workers are restarted for the unfinished experiments. Experiment callbacks that are not parallel-safe (see parallel_safe) always run in the current process.
+        :type workers: Optional[int]
+        :param resume: Set to true to skip experiments that have been completed in a previous run.
+        :type resume: bool
+        :param max_attempts: Maximum number of attempts per experiment.
+        :type max_attempts: int
+        :param parallel_safe: Set to false if the experiment callback must not run in several processes at once (e.g., because the experiments share a cache file that only a single process can write). Defaults to the supports_parallel_experiments attribute of the callback, which is looked up on the callback itself and on the objects it wraps: the function of a functools.partial, the function wrapped with functools.wraps and the instance of a bound method (e.g., the TARGET executors declare it as a class attribute). Callbacks without the attribute, such as lambdas that call an executor, are considered parallel-safe.
+        :type parallel_safe: Optional[bool]
         :return: None
         :rtype: None
         """
-        experiments = self.get_serializers_from_dir(base_folder)
-        self._logger.info(f"Loaded {len(experiments)} serializer(s). Running experiments.")
-        for index, experiment in enumerate(experiments):
-            self._logger.info(f"Running experiment {index+1}/{len(experiments)}.")
-            experiment_dir, serializer = experiment
-            experiment_callback(experiment_dir, serializer)
+        experiment_dirs = [experiment_dir for experiment_dir, _ in self._iter_experiment_configs(base_folder)]
+        statuses = {experiment_dir: read_experiment_status(experiment_dir) for experiment_dir in experiment_dirs}
+        pending_dirs = experiment_dirs
+        if resume:
+            pending_dirs = [experiment_dir for experiment_dir in experiment_dirs
+                            if statuses[experiment_dir].get("status") != "completed"]
+            self._logger.info(f"Skipping {len(experiment_dirs) - len(pending_dirs)} completed experiment(s).")
+        self._logger.info(f"Found {len(experiment_dirs)} experiment(s). Running {len(pending_dirs)} experiment(s).")
+
+        for attempt in range(max_attempts):
+            if len(pending_dirs) == 0:
+                break
+            if attempt > 0:
+                self._logger.info(f"Retrying {len(pending_dirs)} failed experiment(s), attempt {attempt+1}/"
+                                  f"{max_attempts}.")
+            failed_dirs = []
+            for experiment_dir, error, duration in self._execute_experiments(pending_dirs, experiment_callback,
+                                                                             profile, profile_memory, workers,
+                                                                             parallel_safe):
+                status = {"status": "completed" if error is None else "failed",
+                          "attempts": statuses[experiment_dir].get("attempts", 0) + 1,
+                          "duration_seconds": duration, "error": error}
+                statuses[experiment_dir] = status
+                _write_experiment_status(experiment_dir, status)
+                if error is not None:
+                    self._logger.warning(f"Experiment {experiment_dir} failed:\n{error}")
+                    failed_dirs.append(experiment_dir)
+            pending_dirs = failed_dirs
+
+        if len(pending_dirs) > 0:
+            raise ExperimentError(f"{len(pending_dirs)} experiment(s) failed after {max_attempts} attempt(s): "
+                                  f"{pending_dirs}")
@@ -0,0 +1,247 @@
+import json
+import os
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+
+from tableserializer.serializer.common import compute_config_fingerprint
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, where updates of the manifest are not locked
+    fcntl = None
+
+MANIFEST_FILE = "manifest.jsonl"
+
+SERIALIZER_CONFIG_FILE = "serializer.json"
+
+# Keys of the components in serializer configurations
+_COMPONENT_KEYS = ["schema_serializer", "table_serializer", "metadata_serializer", "row_sampler"]
+
+
+class ExperimentManifest:
+    """
+    Index of the serializer configurations saved in an experiment base folder. The manifest is a JSONL file in the base
+    folder with one entry per serializer, holding its fingerprint, the experiment folder relative to the base folder, and
+    its configuration. Entries are only ever appended, later entries replace earlier entries with the same fingerprint.
+    Entries are read lazily; lookups by fingerprint use an index of the file offsets of the entries.
+
+    :param base_folder: Base folder of the experiments.
+    :type base_folder: str
+    """
+
+    def __init__(self, base_folder: str):
+        self.base_folder = base_folder
+        self._offsets: Optional[Dict[str, int]] = None
+
+    def get_path(self) -> str:
+        """
+        Get the path of the manifest file.
+
+        :return: Path of the manifest file.
+        :rtype: str
+        """
+        return os.path.join(self.base_folder, MANIFEST_FILE)
+
+    def exists(self) -> bool:
+        """
+        Check if the manifest file exists.
+
+        :return: True if the manifest file exists.
+        :rtype: bool
+        """
+        return os.path.exists(self.get_path())
+
+    def update(self, entries: List[Dict[str, Any]]) -> None:
+        """
+        Add entries to the manifest. Existing entries with the same fingerprint are replaced. The entries are appended
+        to the manifest while holding a lock, so that processes can update the manifest of the same base folder
+        concurrently (e.g., when saving the shards of a SerializerGrid). If there is no manifest yet, it is first seeded
+        with the serializers already saved in the base folder, so that these remain discoverable.
+
+        :param entries: Entries with the keys "fingerprint", "path" (relative to the base folder) and "config".
+        :type entries: List[Dict[str, Any]]
+        :rtype: None
+        """
+        with _locked(self.get_path() + ".lock"):
+            if not self.exists():
+                fingerprints = {entry["fingerprint"] for entry in entries}
+                discovered_entries = [{"fingerprint": compute_config_fingerprint(config),
+                                       "path": os.path.relpath(experiment_dir, self.base_folder), "config": config}
+                                      for experiment_dir, config in discover_serializer_configs(self.base_folder)]
+                entries = [entry for entry in discovered_entries if entry["fingerprint"] not in fingerprints] + \
+                    list(entries)
+            # A single write of all lines, an interrupted write leaves at most an incomplete last line that is skipped
+            with open(self.get_path(), "ab") as f:
+                if f.tell() > 0 and not _ends_with_newline(self.get_path()):
+                    # Terminate the incomplete line of an interrupted update, so that it does not swallow an entry
+                    f.write(b"\n")
+                f.write("".join(json.dumps(entry) + "\n" for entry in entries).encode())
+        self._offsets = None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Only the latest entry per fingerprint is yielded
+        latest_offsets = set(self._get_offsets().values())
+        with open(self.get_path(), "rb") as f:
+            offset = f.tell()
+            for line in iter(f.readline, b""):
+                if offset in latest_offsets:
+                    yield json.loads(line)
+                offset = f.tell()
+
+    def __len__(self) -> int:
+        return len(self._get_offsets())
+
+    def __contains__(self, fingerprint: str) -> bool:
+        return fingerprint in self._get_offsets()
+
+    def _get_offsets(self) -> Dict[str, int]:
+        if self._offsets is None:
+            offsets = {}
+            with open(self.get_path(), "rb") as f:
+                offset = f.tell()
+                for line in iter(f.readline, b""):
+                    entry = _parse_entry(line)
+                    if entry is not None:
+                        offsets[entry["fingerprint"]] = offset
+                    offset = f.tell()
+            self._offsets = offsets
+        return self._offsets
+
+    def get(self, fingerprint: str) -> Dict[str, Any]:
+        """
+        Get the entry of the serializer with the given fingerprint. Raises a KeyError if there is no such entry.
+
+        :param fingerprint: Fingerprint of the serializer.
+        :type fingerprint: str
+        :return: Manifest entry of the serializer.
+        :rtype: Dict[str, Any]
+        """
+        offset = self._get_offsets()[fingerprint]
+        with open(self.get_path(), "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def get_experiment_dir(self, entry: Dict[str, Any]) -> str:
+        """
+        Get the experiment folder of a manifest entry.
+
+        :param entry: Manifest entry.
+        :type entry: Dict[str, Any]
+        :return: Path of the experiment folder.
+        :rtype: str
+        """
+        return os.path.join(self.base_folder, entry["path"])
+
+    def iter_entries(self, schema_serializer: Optional[str] = None, table_serializer: Optional[str] = None,
+                     metadata_serializer: Optional[str] = None, row_sampler: Optional[str] = None,
+                     table_preprocessor: Optional[str] = None, recipe: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily iterate over the manifest entries, optionally filtered by the class names of their components.
+
+        :param schema_serializer: Only yield serializers with a schema serializer of this class.
+        :type schema_serializer: Optional[str]
+        :param table_serializer: Only yield serializers with a raw table serializer of this class.
+        :type table_serializer: Optional[str]
+        :param metadata_serializer: Only yield serializers with a metadata serializer of this class.
+        :type metadata_serializer: Optional[str]
+        :param row_sampler: Only yield serializers with a row sampler of this class.
+        :type row_sampler: Optional[str]
+        :param table_preprocessor: Only yield serializers with a table preprocessor of this class.
+        :type table_preprocessor: Optional[str]
+        :param recipe: Only yield serializers with this raw recipe.
+        :type recipe: Optional[str]
+        :return: Iterator over the matching manifest entries.
+        :rtype: Iterator[Dict[str, Any]]
+        """
+        for entry in self:
+            if self.matches_components(entry["config"], schema_serializer, table_serializer, metadata_serializer,
+                                       row_sampler, table_preprocessor, recipe):
+                yield entry
+
+    @staticmethod
+    def matches_components(config: Dict[str, Any], schema_serializer: Optional[str] = None,
+                           table_serializer: Optional[str] = None, metadata_serializer: Optional[str] = None,
+                           row_sampler: Optional[str] = None, table_preprocessor: Optional[str] = None,
+                           recipe: Optional[str] = None) -> bool:
+        """
+        Check if a serializer configuration has components of the given classes. Components that are None are not
+        checked.
+
+        :param config: Serializer configuration (see Serializer.get_config).
+        :type config: Dict[str, Any]
+        :param schema_serializer: Class name of the schema serializer.
+        :type schema_serializer: Optional[str]
+        :param table_serializer: Class name of the raw table serializer.
+        :type table_serializer: Optional[str]
+        :param metadata_serializer: Class name of the metadata serializer.
+        :type metadata_serializer: Optional[str]
+        :param row_sampler: Class name of the row sampler.
+        :type row_sampler: Optional[str]
+        :param table_preprocessor: Class name of one of the table preprocessors.
+        :type table_preprocessor: Optional[str]
+        :param recipe: Raw recipe.
+        :type recipe: Optional[str]
+        :return: True if the configuration matches all given components.
+        :rtype: bool
+        """
+        component_names = dict(zip(_COMPONENT_KEYS, [schema_serializer, table_serializer, metadata_serializer,
+                                                     row_sampler]))
+        if recipe is not None and config["recipe"] != recipe:
+            return False
+        if any(name is not None and (config[key] is None or config[key]["name"] != name)
+               for key, name in component_names.items()):
+            return False
+        if table_preprocessor is not None and \
+                all(preprocessor["name"] != table_preprocessor for preprocessor in config["table_preprocessors"]):
+            return False
+        return True
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _parse_entry(line: bytes) -> Optional[Dict[str, Any]]:
+    # Blank lines and the incomplete last line of an interrupted update are skipped
+    if not line.strip():
+        return None
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+@contextmanager
+def _locked(lock_path: str) -> Iterator[None]:
+    with open(lock_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def discover_serializer_configs(base_folder: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Discover the serializer configurations saved in a base folder by walking the folder, e.g., for base folders without
+    manifest.
+
+    :param base_folder: Base folder of the experiments.
+    :type base_folder: str
+    :return: Iterator over (experiment_folder, serializer configuration) pairs.
+    :rtype: Iterator[Tuple[str, Dict[str, Any]]]
+    """
+    for dirpath, dirnames, filenames in os.walk(base_folder):
+        if SERIALIZER_CONFIG_FILE in filenames:
+            with open(os.path.join(dirpath, SERIALIZER_CONFIG_FILE), "r") as f:
+                try:
+                    config = json.load(f)
+                except json.JSONDecodeError:
+                    # Configuration that is being written concurrently, its saver records it in the manifest
+                    continue
+            yield dirpath, config
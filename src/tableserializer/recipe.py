@@ -1,5 +1,6 @@
+import hashlib
 import string
-from typing import List
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 SCHEMA_KEY = "SCHEMA"
 METADATA_KEY = "META"
@@ -8,11 +9,12 @@ TABLE_KEY = "TABLE"
 
 class SerializationRecipe:
     """
-    A SerializationRecipe details the structure of the table serialization.
+    A SerializationRecipe details the structure of the table serialization. The recipe is parsed into literal text and
+    placeholder segments once on construction, so cooking the recipe only concatenates the segments and the contents.
 
     :param recipe: String representation of the overall structure of the serialization with placeholders that are dynamically filled in on a per-table basis.
     :type recipe: str
-    :param identifier: Optional identifier for the table.
+    :param identifier: Optional identifier for the recipe. Defaults to a six-digit number derived from a hash of the recipe, which is equal across processes.
     :type identifier: Optional[str]
     """
 
@@ -20,16 +22,40 @@ class SerializationRecipe:
         self._recipe = recipe
         self._validate_recipe()
         if identifier is None:
-            identifier = str(hash(self._recipe) % 1000000)
+            identifier = str(int.from_bytes(self._compute_digest(), "big") % 1000000)
         self._identifier = identifier
 
     def _validate_recipe(self) -> None:
-        fields = [field_name for _, field_name, _, _ in string.Formatter().parse(self._recipe) if field_name is not None]
+        parsed_recipe = list(string.Formatter().parse(self._recipe))
+        fields = [field_name for _, field_name, _, _ in parsed_recipe if field_name is not None]
         for field in fields:
             if field not in [SCHEMA_KEY, METADATA_KEY, TABLE_KEY]:
                 raise ValueError(f"The recipe includes the field name '{field}' which is not defined. "
                                  f"The defined fields names are '{SCHEMA_KEY}' and '{METADATA_KEY}' and '{TABLE_KEY}'.'")
         self._fields = fields
+        # Segments of literal text and field names. Recipes with conversions or format specs (e.g., {TABLE!r}) are
+        # cooked with str.format instead.
+        self._segments: Optional[List[Tuple[str, Optional[str]]]] = None
+        if all(not format_spec and conversion is None for _, _, format_spec, conversion in parsed_recipe):
+            self._segments = [(literal_text, field_name) for literal_text, field_name, _, _ in parsed_recipe]
+
+    def _get_field_contents(self, schema_contents: Union[str, Iterable[str]],
+                            metadata_contents: Union[str, Iterable[str]],
+                            table_contents: Union[str, Iterable[str]]) -> Dict[str, Union[str, Iterable[str]]]:
+        kwargs = {}
+        if schema_contents is not None:
+            if SCHEMA_KEY not in self._fields:
+                raise AttributeError("Schema is not part of the recipe.")
+            kwargs[SCHEMA_KEY] = schema_contents
+        if metadata_contents is not None:
+            if METADATA_KEY not in self._fields:
+                raise AttributeError("Metadata is not part of the recipe.")
+            kwargs[METADATA_KEY] = metadata_contents
+        if table_contents is not None:
+            if TABLE_KEY not in self._fields:
+                raise AttributeError("Table is not part of the recipe.")
+            kwargs[TABLE_KEY] = table_contents
+        return kwargs
 
     def cook_recipe(self, schema_contents: str = None, metadata_contents: str = None,
                     table_contents: str = None) -> str:
@@ -45,20 +71,61 @@ class SerializationRecipe:
         :return: Table serialization according to the schema.
         :rtype: str
         """
-        kwargs = {}
-        if schema_contents is not None:
-            if SCHEMA_KEY not in self._fields:
-                raise AttributeError("Schema is not part of the recipe.")
-            kwargs[SCHEMA_KEY] = schema_contents
-        if metadata_contents is not None:
-            if METADATA_KEY not in self._fields:
-                raise AttributeError("Metadata is not part of the recipe.")
-            kwargs[METADATA_KEY] = metadata_contents
-        if table_contents is not None:
-            if TABLE_KEY not in self._fields:
-                raise AttributeError("Table is not part of the recipe.")
-            kwargs[TABLE_KEY] = table_contents
-        return self._recipe.format(**kwargs)
+        kwargs = self._get_field_contents(schema_contents, metadata_contents, table_contents)
+        if self._segments is None:
+            return self._recipe.format(**kwargs)
+        parts = []
+        for literal_text, field_name in self._segments:
+            parts.append(literal_text)
+            if field_name is not None:
+                parts.append(kwargs[field_name])
+        return "".join(parts)
+
+    def cook_recipe_chunks(self, schema_contents: Union[str, Iterable[str]] = None,
+                           metadata_contents: Union[str, Iterable[str]] = None,
+                           table_contents: Union[str, Iterable[str]] = None) -> Iterator[str]:
+        """
+        Fill-in the values for the placeholder values and yield the serialization in chunks. Contents can be given as
+        strings or as iterables of string chunks, which are consumed lazily while the serialization is being yielded.
+
+        :param schema_contents: Schema contents to fill in.
+        :type schema_contents: Union[str, Iterable[str]]
+        :param metadata_contents: Metadata contents to fill in.
+        :type metadata_contents: Union[str, Iterable[str]]
+        :param table_contents: Table contents to fill in.
+        :type table_contents: Union[str, Iterable[str]]
+        :return: Iterator over the chunks of the table serialization.
+        :rtype: Iterator[str]
+        """
+        kwargs = self._get_field_contents(schema_contents, metadata_contents, table_contents)
+        for field_name, contents in kwargs.items():
+            if not isinstance(contents, str) and (self._segments is None or self._fields.count(field_name) > 1):
+                # Chunks can only be consumed once, contents that are filled in more than once are joined first
+                kwargs[field_name] = "".join(contents)
+        if self._segments is None:
+            yield self._recipe.format(**kwargs)
+            return
+        for literal_text, field_name in self._segments:
+            if literal_text:
+                yield literal_text
+            if field_name is not None:
+                contents = kwargs[field_name]
+                if isinstance(contents, str):
+                    yield contents
+                else:
+                    yield from contents
+
+    def _compute_digest(self) -> bytes:
+        return hashlib.blake2b(self._recipe.encode(), digest_size=16).digest()
+
+    def get_fingerprint(self) -> str:
+        """
+        Get a deterministic fingerprint of the recipe.
+
+        :return: Hex digest identifying the recipe.
+        :rtype: str
+        """
+        return self._compute_digest().hex()
 
     def get_raw_recipe(self) -> str:
         """
@@ -1 +1,12 @@
-from tableserializer.serializer.serializer import Serializer
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+from tableserializer.utils.lazy import create_lazy_attribute_hooks
+
+if TYPE_CHECKING:
+    from tableserializer.serializer.serializer import Serializer
+
+# The serializer is imported on first access. It depends on the table modules (e.g., the row samplers), which import the
+# components of this package, so that importing it eagerly would be a circular import.
+__getattr__, __dir__ = create_lazy_attribute_hooks(__name__, {"Serializer": "tableserializer.serializer.serializer"})
+
+__all__ = ["Serializer"]
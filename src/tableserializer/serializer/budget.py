@@ -0,0 +1,162 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from tableserializer.serializer.common import SignatureProvidingInstance, sanitize_string
+from tableserializer.table import Table
+from tableserializer.table.preprocessor import StringTruncationPreprocessor
+
+
+class TokenCounter(ABC, SignatureProvidingInstance):
+    """
+    Counts the tokens of texts. The token counts of individual table cells are memoized, as the same cell values are
+    counted repeatedly while searching for the number of rows that fits into a token budget.
+
+    :param max_cached_cells: Maximum number of cell token counts that are memoized.
+    :type max_cached_cells: int
+    """
+
+    def __init__(self, max_cached_cells: int = 1000000):
+        self.max_cached_cells = max_cached_cells
+        self._cell_token_counts: Dict[str, int] = {}
+
+    @abstractmethod
+    def count_tokens(self, text: str) -> int:
+        """
+        Count the tokens of a text.
+
+        :param text: Text to count the tokens of.
+        :type text: str
+        :return: Number of tokens.
+        :rtype: int
+        """
+        raise NotImplementedError
+
+    def count_cell_tokens(self, cell: str) -> int:
+        """
+        Count the tokens of a table cell. Token counts of cells are memoized.
+
+        :param cell: String representation of the cell value.
+        :type cell: str
+        :return: Number of tokens.
+        :rtype: int
+        """
+        try:
+            return self._cell_token_counts[cell]
+        except KeyError:
+            if len(self._cell_token_counts) >= self.max_cached_cells:
+                self._cell_token_counts.clear()
+            token_count = self.count_tokens(cell)
+            self._cell_token_counts[cell] = token_count
+            return token_count
+
+
+class CharacterCounter(TokenCounter):
+    """
+    Token counter that counts characters, i.e., that imposes a character budget.
+
+    :param max_cached_cells: Maximum number of cell token counts that are memoized.
+    :type max_cached_cells: int
+    """
+
+    def count_tokens(self, text: str) -> int:
+        return len(text)
+
+
+class CallableTokenCounter(TokenCounter):
+    """
+    Token counter that counts tokens with a user-provided function, e.g., the tokenizer of an embedding model:
+    CallableTokenCounter(lambda text: len(tokenizer.encode(text)), name="bge-small-en"). The signature of the counter,
+    which is part of the cache keys of serializers with a token budget, contains the name instead of the function, so
+    that it is equal across processes. Counters with different functions must therefore have different names.
+
+    :param count_function: Function that returns the number of tokens of a text.
+    :type count_function: Callable[[str], int]
+    :param name: Name identifying the count function, e.g., the name of the tokenizer.
+    :type name: str
+    :param max_cached_cells: Maximum number of cell token counts that are memoized.
+    :type max_cached_cells: int
+    """
+
+    def __init__(self, count_function: Callable[[str], int], name: str, max_cached_cells: int = 1000000):
+        super().__init__(max_cached_cells)
+        self.count_function = count_function
+        self.name = name
+
+    def count_tokens(self, text: str) -> int:
+        return self.count_function(text)
+
+    def _compute_signature(self) -> str:
+        # The representation of the function holds its memory address, which differs between processes
+        return sanitize_string(f"{type(self).__name__}_name_{self.name}_max_cached_cells_{self.max_cached_cells}")
+
+
+class TokenBudget(SignatureProvidingInstance):
+    """
+    Token budget for serializations. A serializer with a token budget samples the rows of a table once with its row
+    sampler and serializes the longest prefix of the sampled rows for which the serialization fits into the budget.
+
+    The length of a serialization is estimated incrementally from the memoized token counts of its cells and the token
+    overhead of the rows, which is measured once on a serialization of the sampled rows with empty cells. Cells are
+    measured as the raw table serializer renders them (see RawTableSerializer.get_cell_strings). For the
+    CharacterCounter the estimate is exact. For other token counters it is an approximation, the serialization with the
+    estimated number of rows is therefore counted as a whole and fewer rows are serialized if it exceeds the budget.
+
+    :param max_tokens: Maximum number of tokens of a serialization.
+    :type max_tokens: int
+    :param token_counter: Token counter measuring the length of serializations. Defaults to counting characters.
+    :type token_counter: Optional[TokenCounter]
+    :param max_cell_length: Optional maximum number of characters of string cell values. Longer values are truncated.
+    :type max_cell_length: Optional[int]
+    """
+
+    def __init__(self, max_tokens: int, token_counter: Optional[TokenCounter] = None,
+                 max_cell_length: Optional[int] = None):
+        self.max_tokens = max_tokens
+        if token_counter is None:
+            token_counter = CharacterCounter()
+        self.token_counter = token_counter
+        self.max_cell_length = max_cell_length
+
+    def truncate_cells(self, table: Table) -> Table:
+        """
+        Truncate the string cell values of a table to the maximum cell length of the budget.
+
+        :param table: Table to truncate.
+        :type table: Table
+        :return: Table with truncated string values.
+        :rtype: Table
+        """
+        if self.max_cell_length is None:
+            return table
+        # Strings of object columns, of columns with a string extension dtype and of Arrow string columns are truncated
+        return StringTruncationPreprocessor(self.max_cell_length).process(table)
+
+    def fits(self, rows: List[List[str]], base_tokens: int) -> bool:
+        """
+        Check if a serialization fits into the budget. The length is accumulated row by row and the check stops as soon
+        as the budget is exceeded.
+
+        :param rows: Strings of the cells of the serialized rows as they appear in the serialization.
+        :type rows: List[List[str]]
+        :param base_tokens: Number of tokens of the serialization apart from the cell contents.
+        :type base_tokens: int
+        :return: True if the serialization fits into the budget.
+        :rtype: bool
+        """
+        remaining_tokens = self.max_tokens - base_tokens
+        if remaining_tokens < 0:
+            return False
+        for row in rows:
+            for cell in row:
+                remaining_tokens -= self.token_counter.count_cell_tokens(cell)
+            if remaining_tokens < 0:
+                return False
+        return True
+
+
+def create_empty_cell_table(table: Table, num_rows: int) -> Table:
+    # Table with the columns of the given table and the given number of rows of empty cells
+    return Table.from_dataframe(pd.DataFrame([[""] * len(table.get_column_names())] * num_rows,
+                                             columns=table.as_dataframe().columns))
@@ -1,36 +1,118 @@
-import inspect, re
+import hashlib
+import inspect
+import json
+import re
+from typing import Any, Dict, Callable, TypeVar
 
+T = TypeVar('T')
+
+# Mapping of symbols to their text representations
+_SYMBOL_MAPPING = {
+    '.': 'DOT',
+    ',': 'COMMA',
+    ':': 'COLON',
+    '/': 'SLASH',
+    '\\': 'BACKSLASH',
+    '|': 'PIPE',
+    '?': 'QUESTIONMARK',
+    '*': 'ASTERISK',
+    '<': 'LESS',
+    '>': 'GREATER',
+    '"': 'QUOTE',
+    '\x00-\x1F': 'CTRLCHAR'  # Control characters
+}
+
+# Regex pattern to match any of the symbols, compiled once on import
+_SYMBOL_PATTERN = re.compile('|'.join(re.escape(key) for key in _SYMBOL_MAPPING.keys()))
 
-def sanitize_string(input_str: str) -> str:
-    # Define a mapping of symbols to their text representations
-    symbol_mapping = {
-        '.': 'DOT',
-        ',': 'COMMA',
-        ':': 'COLON',
-        '/': 'SLASH',
-        '\\': 'BACKSLASH',
-        '|': 'PIPE',
-        '?': 'QUESTIONMARK',
-        '*': 'ASTERISK',
-        '<': 'LESS',
-        '>': 'GREATER',
-        '"': 'QUOTE',
-        '\x00-\x1F': 'CTRLCHAR'  # Control characters
-    }
-
-    # Create a regex pattern to match any of the symbols
-    pattern = re.compile('|'.join(re.escape(key) for key in symbol_mapping.keys()))
 
+def sanitize_string(input_str: str) -> str:
     # Replace symbols with their text representations
-    sanitized_str = pattern.sub(lambda x: symbol_mapping[x.group()], input_str)
+    return _SYMBOL_PATTERN.sub(lambda x: _SYMBOL_MAPPING[x.group()], input_str)
+
 
-    return sanitized_str
+def extract_instance_save_state(instance: Any) -> Dict[str, Any]:
+    """
+    Extract the configuration of an instance, i.e., the name of its class and the values of its constructor arguments.
 
+    :param instance: Instance to extract the configuration of.
+    :type instance: Any
+    :return: Dictionary with the class name ("name") and the constructor arguments ("args") of the instance.
+    :rtype: Dict[str, Any]
+    """
+    constructor_args = inspect.signature(instance.__init__).parameters
+    args_data = {}
+    for param in constructor_args:
+        if param in ['args', 'kwargs']:
+            continue
+        try:
+            args_data[param] = getattr(instance, param)
+        except AttributeError:
+            raise AttributeError(f"Instance of type {type(instance).__name__} has the constructor parameter {param} but"
+                                 f" it does not have the {param} attribute. Make sure that constructor parameters and "
+                                 f"class attributes match.")
+    return {"name": type(instance).__name__, "args": args_data}
+
+
+def compute_config_fingerprint(config: Any) -> str:
+    """
+    Compute a deterministic fingerprint of a configuration. The fingerprint is a hash of the canonical JSON
+    representation of the configuration and thus does not depend on the process it is computed in.
+
+    :param config: JSON-serializable configuration.
+    :type config: Any
+    :return: Hex digest identifying the configuration.
+    :rtype: str
+    """
+    config_json = json.dumps(config, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(config_json.encode(), digest_size=16).hexdigest()
 
 
 class SignatureProvidingInstance:
+    """
+    Base class of components that are identified by their class and constructor arguments. The signature (__str__) and
+    the fingerprint of an instance are computed once and recomputed only after an attribute of the instance is set.
+    """
+
+    # Attributes of memoized values, which are removed whenever an attribute of the instance is set
+    _memoized_attributes = ("_cached_signature", "_cached_fingerprint")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # Setting an attribute may change the constructor arguments, invalidate the memoized values
+        for memoized_attribute in self._memoized_attributes:
+            self.__dict__.pop(memoized_attribute, None)
+
+    def _memoize(self, memoized_attribute: str, compute: Callable[[], T]) -> T:
+        try:
+            return self.__dict__[memoized_attribute]
+        except KeyError:
+            value = compute()
+            self.__dict__[memoized_attribute] = value
+            return value
+
+    def get_config(self) -> Dict[str, Any]:
+        """
+        Get the configuration of the instance, i.e., the name of its class and the values of its constructor arguments.
+
+        :return: Dictionary with the class name ("name") and the constructor arguments ("args") of the instance.
+        :rtype: Dict[str, Any]
+        """
+        return extract_instance_save_state(self)
+
+    def get_fingerprint(self) -> str:
+        """
+        Get a deterministic fingerprint of the configuration of the instance.
+
+        :return: Hex digest identifying the configuration of the instance.
+        :rtype: str
+        """
+        return self._memoize("_cached_fingerprint", lambda: compute_config_fingerprint(self.get_config()))
 
     def __str__(self):
+        return self._memoize("_cached_signature", self._compute_signature)
+
+    def _compute_signature(self) -> str:
         instance_str = type(self).__name__
 
         constructor_args = inspect.signature(self.__init__).parameters
@@ -41,4 +123,3 @@ class SignatureProvidingInstance:
             instance_str += f"_{constructor_arg}_{getattr(self, constructor_arg)}"
 
         return sanitize_string(instance_str)
-
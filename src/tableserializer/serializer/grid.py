@@ -0,0 +1,246 @@
+import copy
+from typing import List, Dict, Any, Tuple, Optional, Callable, Iterator, Sequence
+
+import pandas as pd
+
+from tableserializer.recipe import SerializationRecipe, METADATA_KEY, SCHEMA_KEY, TABLE_KEY
+from tableserializer.serializer.metadata import MetadataSerializer
+from tableserializer.serializer.schema import SchemaSerializer
+from tableserializer.serializer.serializer import Serializer
+from tableserializer.serializer.table import RawTableSerializer
+from tableserializer.table import Table
+from tableserializer.table.preprocessor import TablePreprocessor
+from tableserializer.table.row_sampler import RowSampler
+
+StageKey = Tuple[str, ...]
+
+_TABLE_ROOT_KEY: StageKey = ("table",)
+
+
+class _Stage:
+    # A stage transforms the output of its parent stage (or the input table for the root) into its output
+
+    def __init__(self, key: StageKey, parent_key: Optional[StageKey], operation: Callable[[Any], Any]):
+        self.key = key
+        self.parent_key = parent_key
+        self.operation = operation
+
+
+class SerializerGrid:
+    """
+    Lazy grid of serializers for all combinations of components. Serializers are only created when they are accessed, in
+    a stable order: recipes vary slowest, followed by metadata serializers, schema serializers, raw table serializers,
+    row samplers and table preprocessor constellations. Components that are not used by a recipe are set to None and do
+    not multiply the number of serializers of that recipe. The size of the grid and the serializer at any position are
+    computed arithmetically, so that a grid can be split into disjoint shards (see shard) without enumerating it.
+
+    :param recipes: List of recipes for which to create serializer instances.
+    :type recipes: List[SerializationRecipe]
+    :param metadata_serializers: List of metadata serializers for which to create serializer instances.
+    :type metadata_serializers: List[MetadataSerializer]
+    :param schema_serializers: List of schema serializers for which to create serializer instances.
+    :type schema_serializers: List[SchemaSerializer]
+    :param table_serializers: List of raw table serializers for which to create serializer instances.
+    :type table_serializers: List[RawTableSerializer]
+    :param row_samplers: List of row samplers for which to create serializer instances.
+    :type row_samplers: List[RowSampler]
+    :param table_preprocessor_constellations: List of table preprocessor constellations for which to create serializer
+        instances.
+    :type table_preprocessor_constellations: List[List[TablePreprocessor]]
+    """
+
+    def __init__(self, recipes: List[SerializationRecipe], metadata_serializers: List[MetadataSerializer],
+                 schema_serializers: List[SchemaSerializer], table_serializers: List[RawTableSerializer],
+                 row_samplers: List[RowSampler], table_preprocessor_constellations: List[List[TablePreprocessor]]):
+        self.recipes = recipes
+        self.metadata_serializers = metadata_serializers
+        self.schema_serializers = schema_serializers
+        self.table_serializers = table_serializers
+        self.row_samplers = row_samplers
+        self.table_preprocessor_constellations = table_preprocessor_constellations
+        # Per recipe, the component choices in the order of the grid axes and the number of serializers of the recipe
+        self._axes: List[List[Sequence[Any]]] = [self._get_recipe_axes(recipe) for recipe in recipes]
+        self._recipe_sizes = [self._get_size(axes) for axes in self._axes]
+        self._start = 0
+        self._stop = sum(self._recipe_sizes)
+
+    def _get_recipe_axes(self, recipe: SerializationRecipe) -> List[Sequence[Any]]:
+        recipe_fields = recipe.get_fields()
+        uses_table = TABLE_KEY in recipe_fields
+        return [self.metadata_serializers if METADATA_KEY in recipe_fields else [None],
+                self.schema_serializers if SCHEMA_KEY in recipe_fields else [None],
+                self.table_serializers if uses_table else [None],
+                self.row_samplers if uses_table else [None],
+                self.table_preprocessor_constellations]
+
+    @staticmethod
+    def _get_size(axes: List[Sequence[Any]]) -> int:
+        size = 1
+        for axis in axes:
+            size *= len(axis)
+        return size
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, index: int) -> Serializer:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Serializer grid index {index} is out of range for a grid of size {len(self)}.")
+        return self._create_serializer(self._start + index)
+
+    def __iter__(self) -> Iterator[Serializer]:
+        for index in range(self._start, self._stop):
+            yield self._create_serializer(index)
+
+    def _create_serializer(self, grid_index: int) -> Serializer:
+        recipe_index = 0
+        while grid_index >= self._recipe_sizes[recipe_index]:
+            grid_index -= self._recipe_sizes[recipe_index]
+            recipe_index += 1
+        # Decode the mixed-radix position within the recipe block, the last axis varies fastest
+        components = []
+        for axis in reversed(self._axes[recipe_index]):
+            grid_index, component_index = divmod(grid_index, len(axis))
+            components.append(axis[component_index])
+        table_preprocessors, row_sampler, table_serializer, schema_serializer, metadata_serializer = components
+        return Serializer(self.recipes[recipe_index], metadata_serializer, schema_serializer, table_serializer,
+                          row_sampler, table_preprocessors)
+
+    def shard(self, index: int, count: int) -> "SerializerGrid":
+        """
+        Get one of count disjoint, contiguous shards of the grid. The shards of a grid together hold every serializer
+        of the grid exactly once and differ in size by at most one serializer. Since the order of the grid is
+        deterministic, independent processes that create the same grid select the same shards.
+
+        :param index: Index of the shard, from 0 to count - 1.
+        :type index: int
+        :param count: Number of shards.
+        :type count: int
+        :return: Grid holding the serializers of the shard.
+        :rtype: SerializerGrid
+        """
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard {index} of {count} shards.")
+        size = len(self)
+        grid_shard = copy.copy(self)
+        grid_shard._start = self._start + index * size // count
+        grid_shard._stop = self._start + (index + 1) * size // count
+        return grid_shard
+
+
+class SerializerGridExecutor:
+    """
+    Executes a grid of serializers on tables while computing every distinct stage only once. The serializers are
+    decomposed into stages (metadata serialization, schema serialization, and the chain of table preprocessors, row
+    sampler and raw table serializer). Stages are identified by the fingerprints of the configurations of their
+    components, so stages with equally configured components and an equal chain of preceding stages are shared across
+    serializers. A grid of serializers that combines many recipes and raw table serializers with few row samplers thus
+    only samples the rows of each table once per distinct row sampler configuration. Equally configured row samplers
+    share a single draw, even if they are not deterministic. Serializers with a token budget or a cache are not
+    decomposed into stages, as the number of rows that fits into a budget depends on all stages and cached
+    serializations skip all stages. Their serializations are those of Serializer.serialize.
+
+    Since the stages are shared across serializers, the executor does not notify the observers of the serializers
+    (see SerializationObserver) about the stages it executes. Only serializers with a token budget or a cache, which
+    are serialized with Serializer.serialize, notify their observers.
+
+    :param serializers: Serializers of the grid.
+    :type serializers: List[Serializer]
+    """
+
+    def __init__(self, serializers: List[Serializer]):
+        self.serializers = serializers
+        self._stages: Dict[StageKey, _Stage] = {}
+        # Keys of the (metadata, schema, table) stages that provide the recipe contents of each serializer, None for
+        # serializers that serialize tables on their own
+        self._content_keys: List[Optional[Tuple[Optional[StageKey], Optional[StageKey], Optional[StageKey]]]] = []
+        for serializer in serializers:
+            if serializer.token_budget is not None or serializer.cache is not None:
+                self._content_keys.append(None)
+            else:
+                self._content_keys.append(self._plan_serializer(serializer))
+
+    def _add_stage(self, key: StageKey, parent_key: Optional[StageKey], operation: Callable[[Any], Any]) -> StageKey:
+        if key not in self._stages:
+            self._stages[key] = _Stage(key, parent_key, operation)
+        return key
+
+    def _plan_serializer(self, serializer: Serializer) -> Tuple[Optional[StageKey], Optional[StageKey],
+                                                                 Optional[StageKey]]:
+        metadata_key = None
+        if serializer.metadata_serializer is not None:
+            metadata_key = self._add_stage(("metadata", serializer.metadata_serializer.get_fingerprint()), None,
+                                           serializer.metadata_serializer.serialize_metadata)
+        schema_key = None
+        if serializer.schema_serializer is not None:
+            schema_key = self._add_stage(("schema", serializer.schema_serializer.get_fingerprint()), None,
+                                         serializer.schema_serializer.serialize_schema)
+        table_key = None
+        if serializer.table_serializer is not None:
+            # Stages of the table form a chain, each stage key extends the key of its parent stage
+            key = _TABLE_ROOT_KEY
+            for table_preprocessor in serializer.table_preprocessors:
+                if table_preprocessor.apply_before_row_sampling:
+                    key = self._add_stage(key + ("preprocess", table_preprocessor.get_fingerprint()), key,
+                                          table_preprocessor.process)
+            if serializer.row_sampler is not None:
+                key = self._add_stage(key + ("sample", serializer.row_sampler.get_fingerprint()), key,
+                                      serializer.row_sampler.sample)
+            for table_preprocessor in serializer.table_preprocessors:
+                if not table_preprocessor.apply_before_row_sampling:
+                    key = self._add_stage(key + ("preprocess", table_preprocessor.get_fingerprint()), key,
+                                          table_preprocessor.process)
+            table_key = self._add_stage(key + ("render", serializer.table_serializer.get_fingerprint()), key,
+                                        serializer.table_serializer.serialize_raw_table)
+        return metadata_key, schema_key, table_key
+
+    def get_num_stages(self) -> int:
+        """
+        Get the number of distinct stages that are executed per table.
+
+        :return: Number of distinct stages.
+        :rtype: int
+        """
+        return len(self._stages)
+
+    def serialize(self, table: Table | List[Dict[str, str]] | pd.DataFrame | List[List[str]],
+                  metadata: Dict[str, Any]) -> List[str]:
+        """
+        Serialize a table with all serializers of the grid.
+
+        :param table: Table to serialize.
+        :type table: Table
+        :param metadata: Metadata of the table to serialize.
+        :type metadata: Dict[str, Any]
+        :return: Serializations of the table in the order of the serializers of the grid.
+        :rtype: List[str]
+        """
+        if not isinstance(table, Table):
+            table = Table(table)
+        outputs: Dict[StageKey, Any] = {_TABLE_ROOT_KEY: table}
+        # Stages are inserted after their parent stages, so iterating in insertion order respects all dependencies
+        for key, stage in self._stages.items():
+            if key[0] == "metadata":
+                outputs[key] = stage.operation(metadata)
+            elif key[0] == "schema":
+                outputs[key] = stage.operation(table, metadata)
+            else:
+                outputs[key] = stage.operation(outputs[stage.parent_key])
+
+        serializations = []
+        for serializer, content_keys in zip(self.serializers, self._content_keys):
+            if content_keys is None:
+                serializations.append(serializer.serialize(table, metadata))
+                continue
+            metadata_key, schema_key, table_key = content_keys
+            kwargs = {}
+            if metadata_key is not None:
+                kwargs["metadata_contents"] = outputs[metadata_key]
+            if schema_key is not None:
+                kwargs["schema_contents"] = outputs[schema_key]
+            if table_key is not None:
+                kwargs["table_contents"] = outputs[table_key]
+            serializations.append(serializer.recipe.cook_recipe(**kwargs))
+        return serializations
@@ -0,0 +1,160 @@
+import json
+import os
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional, Iterator, List
+
+INPUT_CONVERSION_STAGE = "input_conversion"
+METADATA_STAGE = "metadata"
+SCHEMA_STAGE = "schema"
+ROW_SAMPLING_STAGE = "row_sampling"
+RAW_TABLE_STAGE = "raw_table"
+RECIPE_STAGE = "recipe"
+
+
+def get_preprocessor_stage_name(table_preprocessor: Any) -> str:
+    """
+    Get the stage name of a table preprocessor.
+
+    :param table_preprocessor: Table preprocessor.
+    :type table_preprocessor: TablePreprocessor
+    :return: Stage name of the table preprocessor.
+    :rtype: str
+    """
+    if table_preprocessor.apply_before_row_sampling:
+        return "preprocessor_before_sampling:" + str(table_preprocessor)
+    return "preprocessor_after_sampling:" + str(table_preprocessor)
+
+
+class SerializationObserver(ABC):
+    """
+    Observer that is notified about the stages of serializations (input conversion, table preprocessors, row sampling,
+    metadata, schema and raw table serialization, and recipe cooking). Set trace_memory to true to receive the peak
+    memory allocated during each stage, which is measured with tracemalloc and slows down serialization considerably.
+    """
+
+    trace_memory: bool = False
+
+    @abstractmethod
+    def on_stage_end(self, serializer_signature: str, stage: str, duration_seconds: float,
+                     peak_memory_bytes: Optional[int]) -> None:
+        """
+        Called when a stage of a serialization is finished.
+
+        :param serializer_signature: Signature of the serializer that executed the stage.
+        :type serializer_signature: str
+        :param stage: Name of the stage.
+        :type stage: str
+        :param duration_seconds: Wall time of the stage in seconds.
+        :type duration_seconds: float
+        :param peak_memory_bytes: Peak memory allocated during the stage in bytes, None if memory is not traced.
+        :type peak_memory_bytes: Optional[int]
+        :rtype: None
+        """
+        raise NotImplementedError
+
+
+class SerializationProfiler(SerializationObserver):
+    """
+    Observer that aggregates the durations (and optionally the peak memory) of the stages of serializations per
+    serializer.
+
+    :param trace_memory: Set to true to trace the peak memory allocated during each stage.
+    :type trace_memory: bool
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self._stage_stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def on_stage_end(self, serializer_signature: str, stage: str, duration_seconds: float,
+                     peak_memory_bytes: Optional[int]) -> None:
+        serializer_stats = self._stage_stats.setdefault(serializer_signature, {})
+        if stage not in serializer_stats:
+            serializer_stats[stage] = {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0,
+                                       "peak_memory_bytes": None}
+        stats = serializer_stats[stage]
+        stats["count"] += 1
+        stats["total_seconds"] += duration_seconds
+        stats["max_seconds"] = max(stats["max_seconds"], duration_seconds)
+        if peak_memory_bytes is not None:
+            stats["peak_memory_bytes"] = max(stats["peak_memory_bytes"] or 0, peak_memory_bytes)
+
+    def get_report(self, serializer_signature: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the aggregated stage statistics (count, total, mean and maximum duration, and peak memory) per serializer.
+
+        :param serializer_signature: Optional signature of a serializer to only get the report of this serializer.
+        :type serializer_signature: Optional[str]
+        :return: Dictionary mapping serializer signatures to dictionaries of stage statistics.
+        :rtype: Dict[str, Any]
+        """
+        signatures = self._stage_stats.keys() if serializer_signature is None else [serializer_signature]
+        report = {}
+        for signature in signatures:
+            report[signature] = {}
+            for stage, stats in self._stage_stats.get(signature, {}).items():
+                report[signature][stage] = {**stats, "mean_seconds": stats["total_seconds"] / stats["count"]}
+        return report
+
+    def save_report(self, path: str, serializer_signature: Optional[str] = None) -> None:
+        """
+        Save the aggregated stage statistics as JSON file.
+
+        :param path: Path of the JSON file.
+        :type path: str
+        :param serializer_signature: Optional signature of a serializer to only save the report of this serializer.
+        :type serializer_signature: Optional[str]
+        :rtype: None
+        """
+        report_dir = Path(path).parent
+        if not os.path.exists(report_dir):
+            os.makedirs(report_dir)
+        with open(path, "w+") as f:
+            json.dump(self.get_report(serializer_signature), f, indent=2)
+
+    def reset(self) -> None:
+        """
+        Discard all recorded stage statistics.
+
+        :rtype: None
+        """
+        self._stage_stats = {}
+
+
+@contextmanager
+def observe_stage(observers: List[SerializationObserver], serializer_signature: str, stage: str) -> Iterator[None]:
+    """
+    Context manager that measures the wall time (and the peak memory, if an observer traces memory) of a stage and
+    notifies the observers when the stage is finished.
+
+    :param observers: Observers to notify.
+    :type observers: List[SerializationObserver]
+    :param serializer_signature: Signature of the serializer executing the stage.
+    :type serializer_signature: str
+    :param stage: Name of the stage.
+    :type stage: str
+    """
+    trace_memory = any(observer.trace_memory for observer in observers)
+    started_tracing = False
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        memory_at_start = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        peak_memory = None
+        if trace_memory:
+            peak_memory = max(0, tracemalloc.get_traced_memory()[1] - memory_at_start)
+            if started_tracing:
+                tracemalloc.stop()
+        for observer in observers:
+            observer.on_stage_end(serializer_signature, stage, duration, peak_memory)
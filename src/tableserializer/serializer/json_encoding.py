@@ -0,0 +1,166 @@
+import math
+from json.encoder import encode_basestring
+from typing import Any, List, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from tableserializer.table import Table
+from tableserializer.table.arrow import ArrowTable
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+JSON_NULL = "null"
+
+
+def encode_json_value(value: Any) -> str:
+    """
+    Encode a single cell value as JSON. Strings, numbers and booleans are encoded as the corresponding JSON values,
+    missing values (None, NaN, NA, NaT) and infinite numbers as null, and all other values as the JSON string of their
+    string representation.
+
+    :param value: Cell value.
+    :type value: Any
+    :return: JSON encoding of the value.
+    :rtype: str
+    """
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None or value is pd.NA or value is pd.NaT:
+        return JSON_NULL
+    if isinstance(value, (bool, np.bool_)):
+        return "true" if value else "false"
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        if not math.isfinite(value):
+            return JSON_NULL
+        return repr(float(value))
+    return encode_basestring(str(value))
+
+
+def encode_json_strings(values: List[str]) -> List[str]:
+    """
+    Encode a list of strings as JSON strings.
+
+    :param values: Strings to encode.
+    :type values: List[str]
+    :return: JSON encodings of the strings.
+    :rtype: List[str]
+    """
+    return list(map(encode_basestring, values))
+
+
+def _encode_numeric_values(values: np.ndarray) -> List[str]:
+    if values.dtype.kind == "b":
+        return np.where(values, "true", "false").tolist()
+    if values.dtype.kind in "iu":
+        return list(map(str, values.tolist()))
+    # Floats of any precision are rendered as double precision floats, converting the values to python floats and
+    # rendering them with repr is faster than numpy's string conversion and yields the same strings
+    encoded = list(map(float.__repr__, values.astype(np.float64, copy=False).tolist()))
+    for position in np.flatnonzero(~np.isfinite(values)):
+        encoded[position] = JSON_NULL
+    return encoded
+
+
+def _encode_float(value: float) -> str:
+    if not math.isfinite(value):
+        return JSON_NULL
+    return repr(float(value))
+
+
+# Encoders of the non-missing values of object columns that hold values of a single kind, by inferred dtype
+_OBJECT_VALUE_ENCODERS = {
+    "string": encode_basestring,
+    "integer": lambda value: str(int(value)),
+    "floating": _encode_float,
+    "mixed-integer-float": _encode_float,
+    "boolean": lambda value: "true" if value else "false",
+}
+
+
+# Numeric dtypes that object columns of numbers (and missing values) are converted to for vectorized encoding
+_OBJECT_NUMERIC_DTYPES = {
+    "integer": np.int64,
+    "floating": np.float64,
+    "mixed-integer-float": np.float64,
+}
+
+
+def _encode_object_numeric_column(column: pd.Series, dtype: type) -> List[str]:
+    missing = column.isna().to_numpy()
+    values = column.to_numpy()
+    if not missing.any():
+        return _encode_numeric_values(values.astype(dtype))
+    encoded = np.full(len(values), JSON_NULL, dtype=object)
+    encoded[~missing] = _encode_numeric_values(values[~missing].astype(dtype))
+    return encoded.tolist()
+
+
+def encode_json_column(column: pd.Series) -> List[str]:
+    """
+    Encode the values of a column as JSON (see encode_json_value). Numeric columns, categorical columns and object
+    columns that hold values of a single kind (e.g., only strings and missing values) are encoded without inspecting
+    the type of every value.
+
+    :param column: Column to encode.
+    :type column: pd.Series
+    :return: JSON encodings of the values of the column.
+    :rtype: List[str]
+    """
+    if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biuf":
+        return _encode_numeric_values(column.to_numpy())
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Encode every category once and look up the encodings of the values by their codes
+        encoded_categories = np.array(encode_json_column(pd.Series(column.cat.categories)) + [JSON_NULL], dtype=object)
+        return encoded_categories[column.cat.codes.to_numpy()].tolist()
+    if column.dtype == object:
+        inferred_dtype = pd.api.types.infer_dtype(column, skipna=True)
+        if inferred_dtype in _OBJECT_NUMERIC_DTYPES:
+            try:
+                return _encode_object_numeric_column(column, _OBJECT_NUMERIC_DTYPES[inferred_dtype])
+            except (OverflowError, TypeError, ValueError):
+                # E.g., integers that exceed 64 bits, which are encoded value by value instead
+                pass
+        encoder = _OBJECT_VALUE_ENCODERS.get(inferred_dtype)
+        if encoder is not None:
+            values = column.tolist()
+            if not column.hasnans:
+                return list(map(encoder, values))
+            return [JSON_NULL if missing else encoder(value)
+                    for value, missing in zip(values, column.isna().tolist())]
+    return list(map(encode_json_value, column.astype(object).tolist()))
+
+
+def _encode_arrow_column(column: "pa.ChunkedArray", dtype: Any) -> List[str]:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        if column.null_count == 0:
+            return encode_json_strings(column.to_pylist())
+        return [JSON_NULL if value is None else encode_basestring(value) for value in column.to_pylist()]
+    if isinstance(dtype, np.dtype):
+        if pa.types.is_integer(column.type) and dtype.kind in "iu":
+            return pc.cast(column, pa.string()).to_pylist()
+        if (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)) and dtype.kind == "f":
+            return _encode_numeric_values(column.to_numpy().astype(dtype, copy=False))
+    return encode_json_column(column.to_pandas().astype(dtype, copy=False))
+
+
+def encode_json_cells(table: Table) -> List[List[str]]:
+    """
+    Encode the cell values of a table as JSON (see encode_json_value), column by column. Columns of ArrowTables are
+    encoded without converting the table to a dataframe.
+
+    :param table: Table to encode.
+    :type table: Table
+    :return: Columns of the table as lists of JSON encoded values.
+    :rtype: List[List[str]]
+    """
+    if isinstance(table, ArrowTable):
+        return [_encode_arrow_column(column, dtype)
+                for column, dtype in zip(table.as_arrow().columns, table.get_dtypes())]
+    return [encode_json_column(column) for _, column in table.as_dataframe().items()]
@@ -1,10 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple, Hashable
 
+import numpy as np
 import pandas as pd
 
 from tableserializer.serializer.common import SignatureProvidingInstance
 from tableserializer.table import Table
+from tableserializer.table.arrow import ArrowTable
+
+# SQL types of the kinds of values inferred by pandas, as used by pandas for SQLite schemas
+_SQL_TYPES = {
+    "string": "TEXT",
+    "floating": "REAL",
+    "integer": "INTEGER",
+    "datetime": "TIMESTAMP",
+    "date": "DATE",
+    "time": "TIME",
+    "boolean": "INTEGER",
+}
+
+# Kinds of the values of columns whose numpy dtype determines the kind of their values
+_NUMPY_DTYPE_KINDS = {
+    "i": "integer",
+    "u": "integer",
+    "f": "floating",
+    "b": "boolean",
+    "M": "datetime",
+    "m": "integer",
+    "c": "complex",
+}
 
 
 class SchemaSerializer(ABC, SignatureProvidingInstance):
@@ -40,7 +65,7 @@ class ColumnNameSchemaSerializer(SchemaSerializer):
         self.column_name_separator = column_name_separator
 
     def serialize_schema(self, table: Table, metadata: Optional[Dict[str, Any]] = None) -> str:
-        columns = table.as_dataframe().columns
+        columns = table.get_column_names()
         return f" {self.column_name_separator} ".join(columns)
 
 
@@ -62,4 +87,89 @@ class SQLSchemaSerializer(SchemaSerializer):
         table_name = self.default_table_name
         if self.metadata_table_name_field is not None:
             table_name = metadata[self.metadata_table_name_field]
-        return pd.io.sql.get_schema(table.as_dataframe().reset_index(), table_name)
+        signature = self._get_schema_signature(table)
+        if signature is None:
+            return pd.io.sql.get_schema(table.as_dataframe().reset_index(), table_name)
+        return _create_table_statement(str(table_name), *signature)
+
+    @staticmethod
+    def _get_schema_signature(table: Table) -> Optional[Tuple[Tuple[str, ...], Tuple[Hashable, ...]]]:
+        # Names and types of the columns of the table with its index reset, where the type of a column is its dtype if
+        # the dtype determines the SQL type and otherwise the kind of its values. Tables with indices that are not
+        # reset to a single column are not supported and yield None.
+        column_names = table.get_column_names()
+        if isinstance(table, ArrowTable):
+            # The dataframe of an Arrow table has a range index, the values of the columns are inspected in Arrow
+            index_name, index_type = None, np.dtype(np.int64)
+            column_types = [_get_arrow_column_type(column, dtype)
+                            for column, dtype in zip(table.as_arrow().columns, table.get_dtypes())]
+        else:
+            table_df = table.as_dataframe()
+            if isinstance(table_df.index, pd.MultiIndex):
+                return None
+            index_name = table_df.index.name
+            index_type = table_df.index.dtype
+            if not _is_sql_typed_dtype(index_type):
+                index_type = _get_value_kind(table_df.index)
+            column_types = [column.dtype if _is_sql_typed_dtype(column.dtype) else _get_value_kind(column)
+                            for _, column in table_df.items()]
+        if index_name is None:
+            index_name = "index" if "index" not in column_names else "level_0"
+        if index_name in column_names:
+            return None
+        return (tuple(str(name) for name in [index_name] + column_names),
+                tuple([index_type] + column_types))
+
+
+def _get_value_kind(values: Any) -> str:
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    return {"datetime64": "datetime", "timedelta64": "integer", "empty": "string"}.get(kind, kind)
+
+
+def _is_sql_typed_dtype(dtype: Any) -> bool:
+    # Numpy dtypes other than object determine the SQL type, the values of columns of other dtypes are inspected
+    return isinstance(dtype, np.dtype) and dtype.kind in _NUMPY_DTYPE_KINDS
+
+
+def _get_arrow_column_type(column: Any, dtype: Any) -> Hashable:
+    import pyarrow as pa
+
+    if _is_sql_typed_dtype(dtype):
+        return dtype
+    if column.null_count == len(column):
+        return "string"
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return "string"
+    if pa.types.is_boolean(column.type):
+        return "boolean"
+    return _get_value_kind(column.to_pandas().astype(dtype, copy=False))
+
+
+def _escape_sql_name(name: str) -> str:
+    try:
+        name.encode("utf-8", "strict")
+    except UnicodeError as e:
+        raise ValueError(f"Cannot convert identifier to UTF-8: '{name}'") from e
+    if len(name) == 0:
+        raise ValueError("Empty table or column name specified")
+    if "\x00" in name:
+        raise ValueError("SQLite identifier cannot contain NULs")
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _get_sql_type(column_type: Hashable) -> str:
+    if isinstance(column_type, np.dtype):
+        column_type = _NUMPY_DTYPE_KINDS[column_type.kind]
+    if column_type == "complex":
+        raise ValueError("Complex datatypes not supported")
+    return _SQL_TYPES.get(column_type, "TEXT")
+
+
+@lru_cache(maxsize=4096)
+def _create_table_statement(table_name: str, column_names: Tuple[str, ...], column_types: Tuple[Hashable, ...]) -> str:
+    # CREATE TABLE statement equal to the one pandas creates for a SQLite table. Many tables of a corpus share their
+    # name and columns, so the statements are cached by the schema signature.
+    column_definitions: List[str] = [f"{_escape_sql_name(column_name)} {_get_sql_type(column_type)}"
+                                     for column_name, column_type in zip(column_names, column_types)]
+    return f"CREATE TABLE {_escape_sql_name(table_name)} (\n" + ",\n  ".join(column_definitions) + "\n)"
+
@@ -1,20 +1,36 @@
-from typing import List, Dict, Optional, Any
+from contextlib import nullcontext
+from typing import List, Dict, Optional, Any, Iterable, Tuple, Callable, TypeVar, TYPE_CHECKING, ContextManager, \
+    TextIO, Iterator, Set
 
 import pandas as pd
-from tableserializer.serializer.common import sanitize_string
+from tableserializer.cache import ComponentCache, fingerprint_metadata
+from tableserializer.serializer.budget import TokenBudget, create_empty_cell_table
+from tableserializer.serializer.common import sanitize_string, extract_instance_save_state, \
+    compute_config_fingerprint, SignatureProvidingInstance
+from tableserializer.serializer.instrumentation import SerializationObserver, observe_stage, \
+    get_preprocessor_stage_name, INPUT_CONVERSION_STAGE, METADATA_STAGE, SCHEMA_STAGE, ROW_SAMPLING_STAGE, \
+    RAW_TABLE_STAGE, RECIPE_STAGE
 
 from tableserializer.table import Table
 from tableserializer import SerializationRecipe
 from tableserializer.serializer.metadata import MetadataSerializer
-from tableserializer.table.preprocessor import TablePreprocessor
+from tableserializer.table.preprocessor import TablePreprocessor, PreprocessorChain, ColumnDroppingPreprocessor, \
+    COLUMN_LOCALITY, ROW_LOCALITY
 from tableserializer.table.row_sampler import RowSampler
 from tableserializer.serializer.table import RawTableSerializer
 from tableserializer.serializer.schema import SchemaSerializer
 
+if TYPE_CHECKING:
+    from tableserializer.kitchen import ExperimentalSerializerKitchen
 
-class Serializer:
+T = TypeVar('T')
+
+
+class Serializer(SignatureProvidingInstance):
     """
-    Serializer that serializes a given table according to a user-specified format.
+    Serializer that serializes a given table according to a user-specified format. Like the signatures of its
+    components, the signature, the fingerprint and the cache signature of the serializer are memoized until an attribute
+    of the serializer is set. Components must therefore be replaced instead of modified in place.
 
     :param recipe: The recipe detailing the serialization.
     :type recipe: SerializationRecipe
@@ -28,12 +44,22 @@ class Serializer:
     :type row_sampler: RowSampler
     :param table_preprocessors: Optional list of table preprocessors that transform the table before serialization.
     :type table_preprocessors: List[TablePreprocessor]
+    :param cache: Optional persistent cache for the outputs of the row sampler, the metadata and schema serializers, and the full serializations. Row samplers that are not deterministic are not cached.
+    :type cache: Optional[ComponentCache]
+    :param token_budget: Optional token budget. If set, the serializer serializes the longest prefix of the rows sampled by the row sampler for which the serialization fits into the budget.
+    :type token_budget: Optional[TokenBudget]
+    :param observers: Optional observers that are notified about the duration (and optionally the peak memory) of each stage of the serialization. Observers are not transferred to the worker processes of serialize_many.
+    :type observers: Optional[List[SerializationObserver]]
     """
 
+    _memoized_attributes = SignatureProvidingInstance._memoized_attributes + ("_cached_cache_signature",)
+
     def __init__(self, recipe: SerializationRecipe, metadata_serializer: Optional[MetadataSerializer] = None,
                  schema_serializer: Optional[SchemaSerializer] = None,
                  table_serializer: Optional[RawTableSerializer] = None, row_sampler: Optional[RowSampler] = None,
-                 table_preprocessors: Optional[List[TablePreprocessor]] = None):
+                 table_preprocessors: Optional[List[TablePreprocessor]] = None,
+                 cache: Optional[ComponentCache] = None, token_budget: Optional[TokenBudget] = None,
+                 observers: Optional[List[SerializationObserver]] = None):
         self.recipe = recipe
         self.metadata_serializer = metadata_serializer
         self.schema_serializer = schema_serializer
@@ -42,38 +68,343 @@ class Serializer:
         if table_preprocessors is None:
             table_preprocessors = []
         self.table_preprocessors = table_preprocessors
+        self.cache = cache
+        self.token_budget = token_budget
+        if observers is None:
+            observers = []
+        self.observers = observers
 
-    def serialize(self, table: List[Dict[str, str]] | pd.DataFrame | List[List[str]], metadata: Dict[str, Any]) -> str:
+    def serialize(self, table: Table | List[Dict[str, str]] | pd.DataFrame | List[List[str]],
+                  metadata: Dict[str, Any]) -> str:
         """
         Serialize a given table.
 
-        :param table: Table to serialize.
+        :param table: Table to serialize. Tables that are not yet wrapped as Table are converted first.
         :type table: Table
         :param metadata: Metadata of the table to serialize.
         :type metadata: Dict[str, Any]
         :return: String serialization of the table.
         :rtype: str
         """
-        table = Table(table)
+        if not isinstance(table, Table):
+            with self._stage(INPUT_CONVERSION_STAGE):
+                table = Table(table)
+        if self.cache is not None:
+            return self.cache.get_or_compute("serializer", self._get_cache_signature(),
+                                             table.get_fingerprint() + fingerprint_metadata(metadata),
+                                             lambda: self._serialize(table, metadata))
+        return self._serialize(table, metadata)
+
+    def _stage(self, stage: str) -> ContextManager:
+        if len(self.observers) == 0:
+            return nullcontext()
+        return observe_stage(self.observers, str(self), stage)
+
+    def _cached(self, namespace: str, signature: str, fingerprint: Callable[[], str], compute: Callable[[], T]) -> T:
+        if self.cache is None:
+            return compute()
+        return self.cache.get_or_compute(namespace, signature, fingerprint(), compute)
+
+    def _get_cache_signature(self) -> str:
+        return self._memoize("_cached_cache_signature",
+                             lambda: self.get_fingerprint() + "\x00" + str(self.token_budget))
+
+    def get_config(self) -> Dict[str, Any]:
+        """
+        Get the configuration of the serializer, i.e., the raw recipe and the configurations of all components. The
+        configuration is the one saved by ExperimentalSerializerKitchen.jar_up_as_json.
+
+        :return: Configuration of the serializer.
+        :rtype: Dict[str, Any]
+        """
+        serializer_config = {
+            "schema_serializer": None,
+            "table_serializer": None,
+            "metadata_serializer": None,
+            "row_sampler": None,
+            "table_preprocessors": [],
+            "recipe": self.recipe.get_raw_recipe()
+        }
+
+        if self.schema_serializer is not None:
+            serializer_config["schema_serializer"] = extract_instance_save_state(self.schema_serializer)
+        if self.table_serializer is not None:
+            serializer_config["table_serializer"] = extract_instance_save_state(self.table_serializer)
+        if self.metadata_serializer is not None:
+            serializer_config["metadata_serializer"] = extract_instance_save_state(self.metadata_serializer)
+        if self.row_sampler is not None:
+            serializer_config["row_sampler"] = extract_instance_save_state(self.row_sampler)
+        for table_preprocessor in self.table_preprocessors:
+            serializer_config["table_preprocessors"].append(extract_instance_save_state(table_preprocessor))
+        return serializer_config
+
+    def get_fingerprint(self) -> str:
+        """
+        Get a deterministic fingerprint of the configuration of the serializer. Serializers with equal configurations
+        have equal fingerprints, in every process.
+
+        :return: Hex digest identifying the configuration of the serializer.
+        :rtype: str
+        """
+        return self._memoize("_cached_fingerprint", lambda: compute_config_fingerprint(self.get_config()))
+
+    def serialize_into(self, writer: TextIO, table: Table | List[Dict[str, str]] | pd.DataFrame | List[List[str]],
+                       metadata: Dict[str, Any], max_chars: Optional[int] = None) -> int:
+        """
+        Serialize a given table and write the serialization into a text stream. Raw table serializers that support
+        chunked output (e.g., Markdown and JSON) render the table row by row while it is being written. With a character
+        cap, writing stops as soon as the cap is reached, so the remaining rows are never rendered. The written text is
+        equal to the first max_chars characters of the output of serialize.
+
+        :param writer: Text stream to write the serialization into (e.g., an open file or io.StringIO).
+        :type writer: TextIO
+        :param table: Table to serialize. Tables that are not yet wrapped as Table are converted first.
+        :type table: Table
+        :param metadata: Metadata of the table to serialize.
+        :type metadata: Dict[str, Any]
+        :param max_chars: Optional maximum number of characters to write.
+        :type max_chars: Optional[int]
+        :return: Number of characters written.
+        :rtype: int
+        """
+        if not isinstance(table, Table):
+            with self._stage(INPUT_CONVERSION_STAGE):
+                table = Table(table)
+        kwargs = self._serialize_components(table, metadata, chunked=True)
+        num_chars = 0
+        with self._stage(RECIPE_STAGE):
+            chunks = self.recipe.cook_recipe_chunks(**kwargs)
+            for chunk in chunks:
+                if max_chars is not None and num_chars + len(chunk) >= max_chars:
+                    chunk = chunk[:max_chars - num_chars]
+                    writer.write(chunk)
+                    num_chars += len(chunk)
+                    chunks.close()
+                    break
+                writer.write(chunk)
+                num_chars += len(chunk)
+        return num_chars
+
+    def _serialize(self, table: Table, metadata: Dict[str, Any]) -> str:
+        kwargs = self._serialize_components(table, metadata)
+        with self._stage(RECIPE_STAGE):
+            return self.recipe.cook_recipe(**kwargs)
+
+    def _serialize_components(self, table: Table, metadata: Dict[str, Any],
+                              chunked: bool = False) -> Dict[str, str | Iterator[str]]:
+        # Contents of the recipe fields. With chunked set to true, the raw table contents are an iterator over chunks.
         kwargs = {}
         if self.metadata_serializer is not None:
-            kwargs["metadata_contents"] = self.metadata_serializer.serialize_metadata(metadata)
+            with self._stage(METADATA_STAGE):
+                kwargs["metadata_contents"] = self._cached(
+                    "metadata", str(self.metadata_serializer), lambda: fingerprint_metadata(metadata),
+                    lambda: self.metadata_serializer.serialize_metadata(metadata))
         if self.schema_serializer is not None:
-            kwargs["schema_contents"] = self.schema_serializer.serialize_schema(table, metadata)
+            with self._stage(SCHEMA_STAGE):
+                kwargs["schema_contents"] = self._cached(
+                    "schema", str(self.schema_serializer),
+                    lambda: table.get_fingerprint() + fingerprint_metadata(metadata),
+                    lambda: self.schema_serializer.serialize_schema(table, metadata))
         if self.table_serializer is not None:
-            sub_table = table
-            for table_preprocessor in [processor for processor in self.table_preprocessors
-                                       if processor.apply_before_row_sampling]:
-                sub_table = table_preprocessor.process(sub_table)
-            if self.row_sampler is not None:
-                sub_table = self.row_sampler.sample(sub_table)
-            for table_preprocessor in [processor for processor in self.table_preprocessors
-                                       if not processor.apply_before_row_sampling]:
-                sub_table = table_preprocessor.process(sub_table)
-            kwargs["table_contents"] = self.table_serializer.serialize_raw_table(sub_table)
-        return self.recipe.cook_recipe(**kwargs)
+            dropped_columns = self.get_dropped_columns()
+            if len(dropped_columns) > 0:
+                # Columns that are dropped anyway are removed before all other stages of the table
+                table = table.without_columns(dropped_columns)
+            sub_table = self._apply_preprocessors(table, [processor for processor in self.table_preprocessors
+                                                          if processor.apply_before_row_sampling])
+            if self.token_budget is not None:
+                kwargs["table_contents"] = self._serialize_raw_table_within_budget(sub_table, kwargs)
+            else:
+                if self.row_sampler is not None:
+                    sub_table = self._sample_rows(sub_table, self.row_sampler)
+                sub_table = self._apply_post_sampling_preprocessors(sub_table)
+                if chunked:
+                    kwargs["table_contents"] = self.table_serializer.iter_serialized_chunks(sub_table)
+                else:
+                    with self._stage(RAW_TABLE_STAGE):
+                        kwargs["table_contents"] = self.table_serializer.serialize_raw_table(sub_table)
+        return kwargs
+
+    def get_dropped_columns(self) -> Set[Any]:
+        """
+        Get the columns that never influence the serialization, because they are dropped (by ColumnDroppingPreprocessors)
+        before any stage that could depend on them. These columns do not need to be loaded at all (see
+        TableSource.exclude_columns). The stages of the table are the table preprocessors applied before row sampling,
+        the row sampler and the table preprocessors applied after row sampling. Column-local preprocessors and row
+        samplers that do not depend on the columns of the table are transparent to dropped columns. Since the schema
+        serializer receives the complete table, no columns are dropped if the serializer has a schema serializer.
+
+        :return: Names of the columns that do not influence the serialization.
+        :rtype: Set[Any]
+        """
+        if self.table_serializer is None or self.schema_serializer is not None:
+            return set()
+        stages = [processor for processor in self.table_preprocessors if processor.apply_before_row_sampling]
+        if self.row_sampler is not None:
+            stages.append(self.row_sampler)
+        stages.extend(processor for processor in self.table_preprocessors if not processor.apply_before_row_sampling)
+        dropped_columns = set()
+        for stage in stages:
+            if isinstance(stage, ColumnDroppingPreprocessor):
+                dropped_columns.update(stage.columns_to_drop)
+            elif isinstance(stage, RowSampler):
+                if stage.depends_on_columns:
+                    break
+            elif stage.locality != COLUMN_LOCALITY:
+                break
+        return dropped_columns
+
+    def _sample_rows(self, table: Table, row_sampler: RowSampler) -> Table:
+        with self._stage(ROW_SAMPLING_STAGE):
+            if getattr(row_sampler, "deterministic", True):
+                return self._cached("row_sampler", str(row_sampler), table.get_fingerprint,
+                                    lambda: row_sampler.sample(table))
+            return row_sampler.sample(table)
+
+    def _apply_post_sampling_preprocessors(self, table: Table) -> Table:
+        return self._apply_preprocessors(table, [processor for processor in self.table_preprocessors
+                                                 if not processor.apply_before_row_sampling])
+
+    def _apply_preprocessors(self, table: Table, table_preprocessors: List[TablePreprocessor]) -> Table:
+        if len(self.observers) > 0:
+            # Observed preprocessors are applied one by one, so that each of them is reported as a separate stage
+            for table_preprocessor in table_preprocessors:
+                with self._stage(get_preprocessor_stage_name(table_preprocessor)):
+                    table = table_preprocessor.process(table)
+            return table
+        return PreprocessorChain(table_preprocessors).process(table)
+
+    def _serialize_raw_table_within_budget(self, table: Table, contents: Dict[str, str]) -> str:
+        budget = self.token_budget
+        token_counter = budget.token_counter
+        # The rows are sampled once, the candidate tables are prefixes of the sampled rows
+        if self.row_sampler is not None:
+            table = self._sample_rows(table, self.row_sampler)
+        max_rows = table.get_num_rows()
+        post_sampling_preprocessors = [processor for processor in self.table_preprocessors
+                                       if not processor.apply_before_row_sampling]
+
+        if all(processor.locality in (COLUMN_LOCALITY, ROW_LOCALITY) for processor in post_sampling_preprocessors):
+            # Prefixes of the preprocessed rows are equal to the preprocessed prefixes, so that the rows and their cell
+            # strings are computed once
+            table = budget.truncate_cells(self._apply_preprocessors(table, post_sampling_preprocessors))
+            cell_strings = self.table_serializer.get_cell_strings(table)
+
+            def get_candidate_table(num_rows: int) -> Table:
+                return table.head(num_rows)
+
+            def get_candidate_cell_strings(num_rows: int) -> List[List[str]]:
+                return cell_strings[:num_rows]
+        else:
+            def get_candidate_table(num_rows: int) -> Table:
+                # Table with the given number of rows as it is passed to the raw table serializer
+                return budget.truncate_cells(self._apply_preprocessors(table.head(num_rows),
+                                                                       post_sampling_preprocessors))
+
+            def get_candidate_cell_strings(num_rows: int) -> List[List[str]]:
+                return self.table_serializer.get_cell_strings(get_candidate_table(num_rows))
+
+        # Measure the serialization without rows, the overhead of rows is measured on rows with empty cells
+        header_table = get_candidate_table(0)
+        header_serialization = self.table_serializer.serialize_raw_table(header_table)
+        header_tokens = token_counter.count_tokens(header_serialization)
+        base_tokens = token_counter.count_tokens(self.recipe.cook_recipe(table_contents=header_serialization,
+                                                                         **contents))
+        row_overheads = self._measure_row_overheads(header_table, max_rows, header_tokens)
+
+        def fits(num_rows: int) -> bool:
+            rows = get_candidate_cell_strings(num_rows)
+            return budget.fits(rows, base_tokens + row_overheads[min(len(rows), max_rows)])
+
+        def serialize_candidate(num_rows: int) -> str:
+            with self._stage(RAW_TABLE_STAGE):
+                return self.table_serializer.serialize_raw_table(get_candidate_table(num_rows))
+
+        def fits_exactly(num_rows: int) -> bool:
+            return token_counter.count_tokens(self.recipe.cook_recipe(table_contents=serialize_candidate(num_rows),
+                                                                      **contents)) <= budget.max_tokens
+
+        # Binary search for the largest number of rows that fits into the budget according to the estimate
+        lower = self._search_largest_fitting(0, max_rows, fits)
+        if lower == 0 or fits_exactly(lower):
+            return serialize_candidate(lower)
+        # The estimate is exact for the CharacterCounter, for other token counters the tokens of a serialization may
+        # exceed the sum of the tokens of its parts. The search is then repeated on the complete serializations.
+        return serialize_candidate(self._search_largest_fitting(0, lower - 1, fits_exactly))
+
+    @staticmethod
+    def _search_largest_fitting(lower: int, upper: int, fits: Callable[[int], bool]) -> int:
+        # Binary search for the largest number of rows in [lower, upper] that fits, lower is returned if none fits
+        if fits(upper):
+            return upper
+        upper -= 1
+        while lower < upper:
+            middle = (lower + upper + 1) // 2
+            if fits(middle):
+                lower = middle
+            else:
+                upper = middle - 1
+        return lower
+
+    def _measure_row_overheads(self, header_table: Table, max_rows: int, header_tokens: int) -> List[int]:
+        # Number of tokens of the first n rows of a serialization apart from their cells for n = 0, ..., max_rows. The
+        # overheads are measured on a single serialization of max_rows rows with empty cells. Raw table serializers that
+        # render the table row by row yield a chunk per row (after the header, if any), whose tokens are the overhead of
+        # the row. For other raw table serializers, the overhead is extrapolated from the serializations of one and two
+        # rows.
+        token_counter = self.token_budget.token_counter
+        if max_rows == 0:
+            return [0]
+        empty_cell_table = create_empty_cell_table(header_table, max_rows)
+        # The overhead of the rows excludes the cells, which the raw table serializer may render as non-empty strings
+        # even if they are empty (e.g., quoted in JSON). All rows of the empty-cell table have the same cells.
+        empty_cell_tokens = sum(token_counter.count_cell_tokens(cell)
+                                for cell in self.table_serializer.get_cell_strings(empty_cell_table.head(1))[0])
+        row_overheads = [0]
+        if max_rows > 1:
+            chunks = list(self.table_serializer.iter_serialized_chunks(empty_cell_table))
+            if len(chunks) in (max_rows, max_rows + 1):
+                for chunk in chunks[len(chunks) - max_rows:]:
+                    row_overheads.append(row_overheads[-1] + token_counter.count_tokens(chunk) - empty_cell_tokens)
+                return row_overheads
+        serialization_tokens = [header_tokens]
+        for num_rows in range(1, min(max_rows, 2) + 1):
+            serialization_tokens.append(token_counter.count_tokens(
+                self.table_serializer.serialize_raw_table(empty_cell_table.head(num_rows))))
+        row_overheads.append(serialization_tokens[1] - header_tokens - empty_cell_tokens)
+        if max_rows > 1:
+            row_overhead = serialization_tokens[2] - serialization_tokens[1] - empty_cell_tokens
+            row_overheads.extend(row_overheads[1] + row_overhead * num_rows for num_rows in range(1, max_rows))
+        return row_overheads
+
+    def serialize_many(self, entries: Iterable[Tuple[Table | List[Dict[str, str]] | pd.DataFrame | List[List[str]],
+                                                     Dict[str, Any]]],
+                       workers: Optional[int] = None, chunksize: int = 32,
+                       kitchen: Optional["ExperimentalSerializerKitchen"] = None) -> List[str]:
+        """
+        Serialize many tables across a pool of worker processes.
+
+        :param entries: Iterable of (table, metadata) pairs to serialize.
+        :type entries: Iterable[Tuple[Table, Dict[str, Any]]]
+        :param workers: Number of worker processes. Defaults to the number of processors on the machine. With a single worker, the tables are serialized in the current process.
+        :type workers: Optional[int]
+        :param chunksize: Number of entries that are sent to a worker process at once.
+        :type chunksize: int
+        :param kitchen: Kitchen that is used to rebuild the serializer in the worker processes. Provide a kitchen if the serializer uses custom components. Defaults to a kitchen with the built-in components.
+        :type kitchen: Optional[ExperimentalSerializerKitchen]
+        :return: List of serializations in the order of the input entries.
+        :rtype: List[str]
+        """
+        if kitchen is None:
+            # Imported here to avoid a circular import, the kitchen depends on the serializer
+            from tableserializer.kitchen import ExperimentalSerializerKitchen
+            kitchen = ExperimentalSerializerKitchen()
+        return kitchen.serialize_many(self, entries, workers=workers, chunksize=chunksize)
 
     def __str__(self) -> str:
+        return self._memoize("_cached_signature", self._compute_signature)
+
+    def _compute_signature(self) -> str:
         signature = str(self.recipe)
         if self.metadata_serializer is not None:
             signature += "_" + str(self.metadata_serializer)
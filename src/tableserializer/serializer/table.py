@@ -1,8 +1,24 @@
 from abc import abstractmethod, ABC
+from typing import List, Any, Iterator
 
 from tableserializer.serializer.common import SignatureProvidingInstance
+from tableserializer.serializer.json_encoding import encode_json_cells, encode_json_value
 from tableserializer.table import Table
 
+
+def _get_row_dict_positions(columns: List[Any]) -> List[int]:
+    # Rows as dictionaries hold a single value per column name. For duplicate column names the first position holds the
+    # value of the last column with that name.
+    positions = {}
+    for position, column in enumerate(columns):
+        positions[column] = position
+    return list(positions.values())
+
+
+def _escape_format_string(s: str) -> str:
+    return s.replace("{", "{{").replace("}", "}}")
+
+
 class RawTableSerializer(ABC, SignatureProvidingInstance):
     """
     Serializer for serializing raw tables to string representations.
@@ -20,38 +36,118 @@ class RawTableSerializer(ABC, SignatureProvidingInstance):
         """
         raise NotImplementedError
 
+    def iter_serialized_chunks(self, table: Table) -> Iterator[str]:
+        """
+        Serialize a raw table to string chunks that concatenate to the serialization of serialize_raw_table. Raw table
+        serializers that render the table row by row yield the rows lazily, others yield the full serialization.
+
+        :param table: Raw table to serialize.
+        :type table: Table
+        :return: Iterator over the chunks of the serialized raw table.
+        :rtype: Iterator[str]
+        """
+        yield self.serialize_raw_table(table)
+
+    def get_cell_strings(self, table: Table) -> List[List[str]]:
+        """
+        Get the strings of the cells of a raw table as they appear in its serialization, row by row. Token budgets
+        measure serializations by these strings. Defaults to the string representations of the cell values.
+
+        :param table: Raw table whose cells to get.
+        :type table: Table
+        :return: Strings of the cells of the rows.
+        :rtype: List[List[str]]
+        """
+        return table.as_list_of_string_lists()
+
 
 class JSONRawTableSerializer(RawTableSerializer):
     """
-    Serializer for serializing raw tables to row-wise JSON representations.
+    Serializer for serializing raw tables to row-wise JSON representations. Every row is a JSON object on its own line
+    that maps the row index to the row, e.g., {"0": {"city": "Paris", "population": 2102650}}. Strings are escaped,
+    numbers and booleans are rendered as JSON numbers and booleans, and missing and infinite values as null.
     """
 
+    # Number of rows that are encoded at once when the serialization is written in chunks
+    _block_size = 1024
+
+    @staticmethod
+    def _get_row_template(columns: List[Any], positions: List[int]) -> str:
+        # Template with the column names filled in, the encoded values are filled in with a single format call per row
+        return ('{{"{}": {{' +
+                ", ".join(f'{_escape_format_string(encode_json_value(str(columns[position])))}: {{}}'
+                          for position in positions) +
+                '}}}}')
+
+    @staticmethod
+    def _render_rows(table: Table, row_template: str, positions: List[int], start_index: int) -> List[str]:
+        encoded_columns = encode_json_cells(table)
+        encoded_columns = [encoded_columns[position] for position in positions]
+        return [row_template.format(index, *row)
+                for index, row in enumerate(zip(*encoded_columns), start=start_index)]
+
+    def get_cell_strings(self, table: Table) -> List[List[str]]:
+        positions = _get_row_dict_positions(table.get_column_names())
+        encoded_columns = encode_json_cells(table)
+        if len(positions) == 0:
+            return [[] for _ in range(table.get_num_rows())]
+        return [list(row) for row in zip(*[encoded_columns[position] for position in positions])]
+
     def serialize_raw_table(self, table: Table) -> str:
-        table_string = ""
-        for index, row in enumerate(table.as_list_of_dicts()):
-            table_string += f'{{"{index}": {{'
-            for key, value in row.items():
-                table_string += f'"{key}": "{value}", '
-            table_string = table_string[:-2] + f'}}}}\n'
-        return table_string[:-1]
+        columns = table.get_column_names()
+        positions = _get_row_dict_positions(columns)
+        if len(positions) == 0:
+            return "\n".join(f'{{"{index}": {{}}}}' for index in range(table.get_num_rows()))
+        return "\n".join(self._render_rows(table, self._get_row_template(columns, positions), positions, 0))
+
+    def iter_serialized_chunks(self, table: Table) -> Iterator[str]:
+        columns = table.get_column_names()
+        positions = _get_row_dict_positions(columns)
+        if len(positions) == 0:
+            yield self.serialize_raw_table(table)
+            return
+        row_template = self._get_row_template(columns, positions)
+        separator = ""
+        for start in range(0, table.get_num_rows(), self._block_size):
+            for row in self._render_rows(table.slice(start, self._block_size), row_template, positions, start):
+                yield separator + row
+                separator = "\n"
 
 class MarkdownRawTableSerializer(RawTableSerializer):
     """
     Serializer for serializing raw tables to markdown representations.
     """
 
+    @staticmethod
+    def _get_header(columns: List[Any]) -> str:
+        return "| " + "".join(f"{column} | " for column in columns) + "|" + "---|" * len(columns)
+
+    def get_cell_strings(self, table: Table) -> List[List[str]]:
+        columns = table.get_column_names()
+        positions = _get_row_dict_positions(columns)
+        rows = table.as_list_of_string_lists()
+        if len(positions) < len(columns):
+            rows = [[row[position] for position in positions] for row in rows]
+        return rows
+
     def serialize_raw_table(self, table: Table) -> str:
-        table_string = "| "
-        divider_string = "|"
-        for header in table.as_dataframe().columns:
-            table_string += f'{header} | '
-            divider_string += f'---|'
-        table_string += divider_string + " "
-        for row in table.as_list_of_dicts():
-            table_string = table_string[:-1] + "\n| "
-            for value in row.values():
-                table_string += f'{value} | '
-        return table_string[:-1]
+        columns = table.get_column_names()
+        positions = _get_row_dict_positions(columns)
+        rows = table.as_list_of_string_lists()
+        if len(positions) < len(columns):
+            rows = [[row[position] for position in positions] for row in rows]
+        lines = [self._get_header(columns)]
+        lines.extend(["| " + " | ".join(row) + " |" for row in rows])
+        return "\n".join(lines)
+
+    def iter_serialized_chunks(self, table: Table) -> Iterator[str]:
+        columns = table.get_column_names()
+        positions = _get_row_dict_positions(columns)
+        yield self._get_header(columns)
+        for row in table.iter_string_rows():
+            if len(positions) < len(columns):
+                row = [row[position] for position in positions]
+            yield "\n| " + " | ".join(row) + " |"
 
 class CSVRawTableSerializer(RawTableSerializer):
     """
@@ -0,0 +1,284 @@
+import copy
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, Tuple, Dict, Any, Optional, List, Union, Collection, TYPE_CHECKING
+
+import pandas as pd
+
+from tableserializer.serializer import Serializer
+from tableserializer.table import Table
+from tableserializer.table.row_sampler import RowSampler
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+class TableSource(ABC):
+    """
+    A table source reads the tables of a corpus and their metadata one at a time, such that the memory requirements
+    do not depend on the size of the corpus.
+    """
+
+    excluded_columns: frozenset = frozenset()
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Tuple[Table, Dict[str, Any]]]:
+        """
+        Iterate over the (table, metadata) pairs of the corpus.
+
+        :return: Iterator over (table, metadata) pairs.
+        :rtype: Iterator[Tuple[Table, Dict[str, Any]]]
+        """
+        raise NotImplementedError
+
+    def exclude_columns(self, columns: Collection[Any]) -> "TableSource":
+        """
+        Get a copy of the table source that does not read the given columns. File formats that support reading a
+        subset of the columns (CSV and Parquet) never read the excluded columns, other sources remove them right after
+        reading a table.
+
+        :param columns: Names of the columns to exclude.
+        :type columns: Collection[Any]
+        :return: Table source without the columns.
+        :rtype: TableSource
+        """
+        source = copy.copy(self)
+        source.excluded_columns = self.excluded_columns.union(columns)
+        return source
+
+
+class JSONLTableSource(TableSource):
+    """
+    Table source that reads a JSONL file in which each line holds a JSON object with a table and its metadata. The table
+    is either a list of lists (with the column names as the first list) or a list of dictionaries.
+
+    :param path: Path to the JSONL file.
+    :type path: str
+    :param table_field: Name of the field that holds the table.
+    :type table_field: str
+    :param metadata_field: Name of the field that holds the metadata. If set to None, all fields except for the table field are used as metadata.
+    :type metadata_field: Optional[str]
+    """
+
+    def __init__(self, path: str, table_field: str = "table", metadata_field: Optional[str] = "metadata"):
+        self.path = path
+        self.table_field = table_field
+        self.metadata_field = metadata_field
+
+    def __iter__(self) -> Iterator[Tuple[Table, Dict[str, Any]]]:
+        with open(self.path, "r") as f:
+            for line in f:
+                if line.strip() == "":
+                    continue
+                entry = json.loads(line)
+                table = Table(entry.pop(self.table_field)).without_columns(self.excluded_columns)
+                if self.metadata_field is None:
+                    metadata = entry
+                else:
+                    metadata = entry.get(self.metadata_field, {})
+                yield table, metadata
+
+
+class _FileTableSource(TableSource, ABC):
+    # Table source that reads one table per file. Metadata is read from a JSON file with the same name next to the
+    # table file (e.g., "cities.json" for "cities.csv").
+
+    def __init__(self, path: str, file_extension: str, table_name_field: Optional[str] = "table_name"):
+        self.path = path
+        self.file_extension = file_extension
+        self.table_name_field = table_name_field
+
+    def _get_table_files(self) -> List[str]:
+        if os.path.isfile(self.path):
+            return [self.path]
+        return sorted(os.path.join(self.path, file_name) for file_name in os.listdir(self.path)
+                      if file_name.endswith(self.file_extension))
+
+    def _read_metadata(self, table_file: str) -> Dict[str, Any]:
+        file_stem = table_file[:-len(self.file_extension)]
+        metadata = {}
+        if os.path.exists(file_stem + ".json"):
+            with open(file_stem + ".json", "r") as f:
+                metadata = json.load(f)
+        if self.table_name_field is not None and self.table_name_field not in metadata:
+            metadata[self.table_name_field] = os.path.basename(file_stem)
+        return metadata
+
+    @abstractmethod
+    def _read_table(self, table_file: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[Tuple[Table, Dict[str, Any]]]:
+        for table_file in self._get_table_files():
+            yield Table.from_dataframe(self._read_table(table_file)), self._read_metadata(table_file)
+
+
+class CSVDirectoryTableSource(_FileTableSource):
+    """
+    Table source that reads a directory of CSV files, each holding one table. The metadata of a table is read from a
+    JSON file with the same name next to the CSV file (e.g., "cities.json" for "cities.csv") if it exists.
+
+    :param path: Path to the directory of CSV files, or to a single CSV file.
+    :type path: str
+    :param separator: Separator used in the CSV files.
+    :type separator: str
+    :param table_name_field: Metadata field that is set to the file name of the table if the metadata does not provide it. Set to None to not add the file name.
+    :type table_name_field: Optional[str]
+    """
+
+    def __init__(self, path: str, separator: str = ",", table_name_field: Optional[str] = "table_name"):
+        super().__init__(path, ".csv", table_name_field)
+        self.separator = separator
+
+    def _read_table(self, table_file: str) -> pd.DataFrame:
+        if len(self.excluded_columns) == 0:
+            return pd.read_csv(table_file, sep=self.separator)
+        return pd.read_csv(table_file, sep=self.separator, usecols=lambda column: column not in self.excluded_columns)
+
+
+class ParquetTableSource(_FileTableSource):
+    """
+    Table source that reads a Parquet dataset, i.e., a directory of Parquet files, each holding one table. The metadata
+    of a table is read from a JSON file with the same name next to the Parquet file (e.g., "cities.json" for
+    "cities.parquet") if it exists. Reading Parquet files requires pyarrow, install table serialization kitchen with
+    the parquet extra through 'pip install tableserializer[parquet]'.
+
+    :param path: Path to the directory of Parquet files, or to a single Parquet file.
+    :type path: str
+    :param table_name_field: Metadata field that is set to the file name of the table if the metadata does not provide it. Set to None to not add the file name.
+    :type table_name_field: Optional[str]
+    """
+
+    def __init__(self, path: str, table_name_field: Optional[str] = "table_name"):
+        super().__init__(path, ".parquet", table_name_field)
+
+    def _read_table(self, table_file: str) -> pd.DataFrame:
+        if len(self.excluded_columns) == 0:
+            return pd.read_parquet(table_file)
+        import pyarrow.parquet as pq
+        return pd.read_parquet(table_file, columns=_get_parquet_table_columns(pq.read_schema(table_file),
+                                                                              self.excluded_columns))
+
+
+def _get_parquet_table_columns(schema: "pa.Schema", excluded_columns: Collection[Any] = ()) -> List[str]:
+    # Stored indices are restored from their own columns, which are not part of the table columns
+    index_columns = set()
+    if schema.pandas_metadata is not None:
+        index_columns = {column for column in schema.pandas_metadata.get("index_columns", [])
+                         if isinstance(column, str)}
+    return [column for column in schema.names if column not in excluded_columns and column not in index_columns]
+
+
+def open_table_source(path: str) -> TableSource:
+    """
+    Open a table source for the given path. JSONL files (".jsonl") are read with a JSONLTableSource, Parquet files
+    and directories of Parquet files with a ParquetTableSource, and CSV files and directories of CSV files with a
+    CSVDirectoryTableSource.
+
+    :param path: Path to the corpus.
+    :type path: str
+    :return: Table source reading the corpus.
+    :rtype: TableSource
+    """
+    if os.path.isdir(path):
+        file_names = os.listdir(path)
+        if any(file_name.endswith(".parquet") for file_name in file_names):
+            return ParquetTableSource(path)
+        if any(file_name.endswith(".csv") for file_name in file_names):
+            return CSVDirectoryTableSource(path)
+        raise ValueError(f"The directory {path} contains neither CSV nor Parquet files.")
+    if path.endswith(".jsonl"):
+        return JSONLTableSource(path)
+    if path.endswith(".parquet"):
+        return ParquetTableSource(path)
+    if path.endswith(".csv"):
+        return CSVDirectoryTableSource(path)
+    raise ValueError(f"Cannot infer the format of {path}. Supported are JSONL files, CSV files and Parquet files, "
+                     f"and directories of CSV files or Parquet files.")
+
+
+def iter_table_chunks(path: str, chunk_size: int = 65536, separator: str = ",") -> Iterator[Table]:
+    """
+    Read a CSV or Parquet file that holds a single table in chunks of rows. Chunks of Parquet files are ArrowTables
+    (requires pyarrow, see ParquetTableSource). At least one chunk is read, which is empty if the table has no rows.
+
+    :param path: Path to the CSV (".csv") or Parquet (".parquet") file.
+    :type path: str
+    :param chunk_size: Maximum number of rows per chunk.
+    :type chunk_size: int
+    :param separator: Separator used in CSV files.
+    :type separator: str
+    :return: Iterator over the chunks of the table.
+    :rtype: Iterator[Table]
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        from tableserializer.table.arrow import ArrowTable
+
+        parquet_file = pq.ParquetFile(path)
+        columns = _get_parquet_table_columns(parquet_file.schema_arrow)
+        num_chunks = 0
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            num_chunks += 1
+            yield ArrowTable(batch)
+        if num_chunks == 0:
+            yield ArrowTable(parquet_file.schema_arrow.empty_table().select(columns))
+    elif path.endswith(".csv"):
+        num_chunks = 0
+        with pd.read_csv(path, sep=separator, chunksize=chunk_size) as reader:
+            for chunk_df in reader:
+                num_chunks += 1
+                yield Table.from_dataframe(chunk_df.reset_index(drop=True))
+        if num_chunks == 0:
+            yield Table.from_dataframe(pd.read_csv(path, sep=separator, nrows=0))
+    else:
+        raise ValueError(f"Cannot read {path} in chunks. Supported are CSV files and Parquet files.")
+
+
+def sample_table_file(path: str, row_sampler: RowSampler, chunk_size: int = 65536, separator: str = ",") -> Table:
+    """
+    Sample rows from a CSV or Parquet file that holds a single table without reading the whole table into memory (see
+    RowSampler.sample_stream). The number of rows of Parquet files is read from their metadata; CSV files are counted
+    in a first pass if the row sampler requires the number of rows. The sampled table can be serialized with a
+    serializer whose row sampler samples the same number of rows, as the samplers of the kitchen then keep all rows.
+
+    :param path: Path to the CSV (".csv") or Parquet (".parquet") file.
+    :type path: str
+    :param row_sampler: Row sampler that samples the rows.
+    :type row_sampler: RowSampler
+    :param chunk_size: Maximum number of rows read at once.
+    :type chunk_size: int
+    :param separator: Separator used in CSV files.
+    :type separator: str
+    :return: Table consisting of the sampled rows.
+    :rtype: Table
+    """
+    num_rows = None
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        num_rows = pq.ParquetFile(path).metadata.num_rows
+    elif path.endswith(".csv") and row_sampler.stream_requires_num_rows:
+        num_rows = sum(chunk.get_num_rows() for chunk in iter_table_chunks(path, chunk_size, separator))
+    return row_sampler.sample_stream(iter_table_chunks(path, chunk_size, separator), num_rows)
+
+
+def serialize_corpus(source: Union[TableSource, str], serializer: Serializer) -> Iterator[str]:
+    """
+    Serialize a corpus of tables one table at a time. Only a single table of the corpus is held in memory at a time.
+
+    :param source: Table source of the corpus, or the path of the corpus (see open_table_source).
+    :type source: Union[TableSource, str]
+    :param serializer: Serializer used to serialize the tables.
+    :type serializer: Serializer
+    :return: Iterator over the serializations in the order of the corpus.
+    :rtype: Iterator[str]
+    """
+    if isinstance(source, str):
+        source = open_table_source(source)
+    dropped_columns = serializer.get_dropped_columns()
+    if len(dropped_columns) > 0:
+        # Columns that do not influence the serializations are not read at all
+        source = source.exclude_columns(dropped_columns)
+    for table, metadata in source:
+        yield serializer.serialize(table, metadata)
@@ -1 +1,12 @@
-from tableserializer.table.table import Table
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+from tableserializer.utils.lazy import create_lazy_attribute_hooks
+
+if TYPE_CHECKING:
+    from tableserializer.table.table import Table
+
+# The table is imported on first access, so that importing the package (e.g., as the parent of a submodule) does not
+# import pandas
+__getattr__, __dir__ = create_lazy_attribute_hooks(__name__, {"Table": "tableserializer.table.table"})
+
+__all__ = ["Table"]
@@ -0,0 +1,228 @@
+import hashlib
+from functools import lru_cache
+from typing import Any, Dict, List, Collection, Sequence, Union, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from tableserializer.table.table import Table, _column_to_strings, _numeric_to_strings
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+class _HashingSink:
+    # File-like object that feeds everything written to it into a hash
+
+    def __init__(self, hash_object: Any):
+        self.hash_object = hash_object
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self.hash_object.update(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@lru_cache(maxsize=256)
+def _get_schema_dtypes_cached(schema: "pa.Schema", metadata: Tuple[Tuple[bytes, bytes], ...]) -> Tuple[Any, ...]:
+    return tuple(schema.empty_table().to_pandas().dtypes.tolist())
+
+
+def _get_schema_dtypes(schema: "pa.Schema") -> List[Any]:
+    # Dtypes of the columns of an Arrow schema without missing values. The tables of a chunked read share their schema,
+    # so that the dtypes are converted once per schema. Schemas compare equal regardless of their metadata, which holds
+    # the pandas dtypes and is therefore part of the cache key.
+    return list(_get_schema_dtypes_cached(schema, tuple(sorted((schema.metadata or {}).items()))))
+
+
+class ArrowTable(Table):
+    """
+    Table backed by an Apache Arrow table instead of a pandas dataframe. The column names, dtypes, string
+    representations of the rows, and the rows and columns selected by the built-in row samplers and table preprocessors
+    are computed on the Arrow table, where strings take a fraction of the memory of object columns of a dataframe.
+    Selecting ranges of rows (head, slice) and columns (without_columns) does not copy any data. The table is only converted
+    to a dataframe when as_dataframe is called, e.g., by components that operate on dataframes. Requires pyarrow,
+    install table serialization kitchen with the arrow extra through 'pip install tableserializer[arrow]'.
+
+    :param table_contents: Table contents as Arrow table or record batch.
+    :type table_contents: Union[pa.Table, pa.RecordBatch]
+    """
+
+    def __init__(self, table_contents: Union["pa.Table", "pa.RecordBatch"]):
+        import pyarrow as pa
+
+        if isinstance(table_contents, pa.RecordBatch):
+            table_contents = pa.Table.from_batches([table_contents])
+        if not isinstance(table_contents, pa.Table):
+            raise TypeError(f'{type(table_contents).__name__} is not a supported table format. Table must be of one '
+                            f'of the following types: pyarrow.Table, pyarrow.RecordBatch.')
+        self._arrow_table = table_contents
+        self._views: Dict[str, Any] = {}
+
+    @classmethod
+    def from_dataframe(cls, table_df: pd.DataFrame) -> "ArrowTable":
+        """
+        Create an Arrow table from a dataframe. The index of the dataframe is not kept.
+
+        :param table_df: Table contents as a dataframe.
+        :type table_df: pd.DataFrame
+        :return: Arrow table holding the table contents.
+        :rtype: ArrowTable
+        """
+        import pyarrow as pa
+
+        return cls(pa.Table.from_pandas(table_df, preserve_index=False))
+
+    def _derive(self, arrow_table: "pa.Table", column_positions: Optional[List[int]] = None) -> "ArrowTable":
+        # Table of a subset of the rows (and of the columns at the given positions) of this table. The subset keeps the
+        # dtypes of this table, as it does for tables backed by dataframes, even if, e.g., an integer column of the
+        # subset has no missing values anymore.
+        dtypes = self.get_dtypes()
+        if column_positions is not None:
+            dtypes = [dtypes[position] for position in column_positions]
+        table = ArrowTable(arrow_table)
+        table._views["dtypes"] = dtypes
+        return table
+
+    @property
+    def _table(self) -> pd.DataFrame:
+        # Views that are not computed on the Arrow table are computed on the dataframe, which is converted on first use
+        return self._get_view("dataframe", self._to_dataframe)
+
+    def _to_dataframe(self) -> pd.DataFrame:
+        table_df = self._arrow_table.to_pandas()
+        for position, dtype in enumerate(self.get_dtypes()):
+            if table_df.dtypes.iloc[position] != dtype:
+                table_df.isetitem(position, table_df.iloc[:, position].astype(dtype))
+        return table_df
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The dtypes are kept, as subsets of a table (see _derive) have the dtypes of the table and not of their values
+        state = {"_arrow_table": self._arrow_table}
+        if "dtypes" in self._views:
+            state["dtypes"] = self._views["dtypes"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._arrow_table = state["_arrow_table"]
+        self._views = {}
+        if "dtypes" in state:
+            self._views["dtypes"] = state["dtypes"]
+
+    def as_arrow(self) -> "pa.Table":
+        """
+        Get the table as an Arrow table. The Arrow table is not copied.
+
+        :return: The table as an Arrow table.
+        :rtype: pa.Table
+        """
+        return self._arrow_table
+
+    def get_column_names(self) -> List[Any]:
+        return self._get_view("column_names", lambda: list(self._arrow_table.column_names))
+
+    def get_dtypes(self) -> List[Any]:
+        return self._get_view("dtypes", self._compute_dtypes)
+
+    def _compute_dtypes(self) -> List[Any]:
+        # The dtypes of the dataframe the table converts to. Converting the empty table yields the dtypes of the
+        # columns without missing values; like pyarrow, integer columns with missing values are converted to floats and
+        # boolean columns with missing values to objects.
+        import pyarrow as pa
+
+        dtypes = _get_schema_dtypes(self._arrow_table.schema)
+        for position, column in enumerate(self._arrow_table.columns):
+            if pa.types.is_dictionary(column.type):
+                # The categories of dictionary encoded columns are the values of their dictionaries, which the empty
+                # table does not have
+                dtypes[position] = column.to_pandas().dtype
+            elif column.null_count > 0 and isinstance(dtypes[position], np.dtype):
+                if dtypes[position].kind in "iu":
+                    dtypes[position] = np.dtype(np.float64)
+                elif dtypes[position].kind == "b":
+                    dtypes[position] = np.dtype(object)
+        return dtypes
+
+    def get_num_rows(self) -> int:
+        return self._arrow_table.num_rows
+
+    def _compute_fingerprint(self) -> str:
+        import pyarrow as pa
+
+        fingerprint = hashlib.blake2b(digest_size=16)
+        # Like for tables backed by dataframes, the dtypes are part of the fingerprint, as subsets of a table keep the
+        # dtypes of the table and may therefore be rendered differently than equal tables with their own dtypes
+        fingerprint.update(repr((self.get_column_names(), [str(dtype) for dtype in self.get_dtypes()])).encode())
+        for column in self._arrow_table.columns:
+            # Columns are written as a single record batch in the Arrow IPC format, so that the fingerprint neither
+            # depends on the chunking of the column nor on offsets into shared buffers
+            column_batch = pa.record_batch([column.combine_chunks()], names=["column"])
+            with pa.ipc.new_stream(_HashingSink(fingerprint), column_batch.schema) as writer:
+                writer.write_batch(column_batch)
+        return fingerprint.hexdigest()
+
+    def _compute_list_of_string_lists(self) -> List[List[str]]:
+        dtypes = self.get_dtypes()
+        if not all(isinstance(dtype, np.dtype) for dtype in dtypes) or \
+                (len(dtypes) > 0 and all(dtype.kind in "biuf" for dtype in dtypes)):
+            # Extension dtypes and purely numeric tables depend on the dtypes of whole rows, use the dataframe
+            return super()._compute_list_of_string_lists()
+        string_columns = [self._column_to_strings(column, dtype)
+                          for column, dtype in zip(self._arrow_table.columns, dtypes)]
+        if len(string_columns) == 0:
+            return [[] for _ in range(self.get_num_rows())]
+        return [list(row) for row in zip(*string_columns)]
+
+    @staticmethod
+    def _column_to_strings(column: "pa.ChunkedArray", dtype: np.dtype) -> List[str]:
+        # String representations equal to those of the converted dataframe column
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            values = column.to_pylist()
+            if column.null_count > 0:
+                values = ["None" if value is None else value for value in values]
+            return values
+        if pa.types.is_integer(column.type) and dtype.kind in "iu":
+            return pc.cast(column, pa.string()).to_pylist()
+        if (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)) and dtype.kind == "f":
+            return _numeric_to_strings(column.to_numpy().astype(dtype, copy=False)).tolist()
+        return _column_to_strings(column.to_pandas().astype(dtype, copy=False))
+
+    def slice(self, offset: int, num_rows: int) -> "ArrowTable":
+        return self._derive(self._arrow_table.slice(offset, num_rows))
+
+    def take(self, positions: Sequence[int]) -> "ArrowTable":
+        return self._derive(self._arrow_table.take(np.asarray(positions, dtype=np.int64)))
+
+    def without_columns(self, columns: Collection[Any]) -> "ArrowTable":
+        kept_positions = [position for position, column_name in enumerate(self.get_column_names())
+                          if column_name not in columns]
+        if len(kept_positions) == len(self.get_column_names()):
+            return self
+        return self._derive(self._arrow_table.select(kept_positions), kept_positions)
+
+    def concat(self, tables: Sequence[Table]) -> Table:
+        import pyarrow as pa
+
+        if not all(isinstance(table, ArrowTable) and table.as_arrow().schema.equals(self._arrow_table.schema)
+                   for table in tables):
+            return super().concat(tables)
+        concatenated = ArrowTable(pa.concat_tables([self._arrow_table] + [table.as_arrow() for table in tables]))
+        # Integer and boolean columns of tables with missing values have float and object dtypes. A column keeps the
+        # dtype of a table with missing values, even if the rows of the concatenation have no missing values.
+        dtypes = list(concatenated.get_dtypes())
+        for table in [self] + list(tables):
+            for position, dtype in enumerate(table.get_dtypes()):
+                if isinstance(dtypes[position], np.dtype) and dtypes[position].kind in "iub" and \
+                        dtype != dtypes[position]:
+                    dtypes[position] = dtype
+        concatenated._views["dtypes"] = dtypes
+        return concatenated
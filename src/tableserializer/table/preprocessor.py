@@ -2,10 +2,25 @@
 # Generally, preprocessors can limit the resulting serialization length
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Any, Optional, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
 
 from tableserializer.serializer.common import SignatureProvidingInstance
 from tableserializer.table import Table
+from tableserializer.table.arrow import ArrowTable
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Localities of preprocessors, i.e., which part of the table the output of a preprocessor depends on
+# Every output column depends only on the input column at the same position (see TablePreprocessor.process_column)
+COLUMN_LOCALITY = "column"
+# Every output row depends only on the input row at the same position
+ROW_LOCALITY = "row"
+# The output may depend on the whole table
+TABLE_LOCALITY = "table"
 
 
 class TablePreprocessor(ABC, SignatureProvidingInstance):
@@ -17,6 +32,13 @@ class TablePreprocessor(ABC, SignatureProvidingInstance):
     :type apply_before_row_sampling: bool
     """
 
+    # Locality of the preprocessor. Column-local preprocessors implement process_column, so that consecutive
+    # column-local preprocessors can be fused into a single pass over the table (see PreprocessorChain).
+    locality: str = TABLE_LOCALITY
+    # Set to true in column-local preprocessors that implement process_arrow_column, so that they transform the columns
+    # of ArrowTables without converting them to a dataframe
+    supports_arrow_columns: bool = False
+
     def __init__(self, apply_before_row_sampling: bool = False):
         self.apply_before_row_sampling = apply_before_row_sampling
 
@@ -32,6 +54,136 @@ class TablePreprocessor(ABC, SignatureProvidingInstance):
         """
         raise NotImplementedError
 
+    def process_column(self, column_name: Any, column: pd.Series) -> Optional[pd.Series]:
+        """
+        Transform a single column of a table. Only implemented by column-local preprocessors. The column must not be
+        modified in place; return the column itself if it is unchanged.
+
+        :param column_name: Name of the column.
+        :type column_name: Any
+        :param column: Values of the column.
+        :type column: pd.Series
+        :return: Transformed column, or None to drop the column.
+        :rtype: Optional[pd.Series]
+        """
+        raise NotImplementedError(f"{type(self).__name__} is not a column-local preprocessor.")
+
+    def process_arrow_column(self, column_name: Any, column: "pa.ChunkedArray") -> Optional["pa.ChunkedArray"]:
+        """
+        Transform a single column of an ArrowTable. Only implemented by column-local preprocessors that support Arrow
+        columns (see supports_arrow_columns). Return the column itself if it is unchanged.
+
+        :param column_name: Name of the column.
+        :type column_name: Any
+        :param column: Values of the column.
+        :type column: pa.ChunkedArray
+        :return: Transformed column, or None to drop the column.
+        :rtype: Optional[pa.ChunkedArray]
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support Arrow columns.")
+
+
+def process_columns(table: Table, preprocessors: List[TablePreprocessor]) -> Table:
+    """
+    Apply column-local preprocessors to a table in a single pass over its columns. Every column is passed through all
+    preprocessors before the next column is processed, and the table is copied at most once.
+
+    :param table: Table to preprocess.
+    :type table: Table
+    :param preprocessors: Column-local preprocessors in the order they are applied.
+    :type preprocessors: List[TablePreprocessor]
+    :return: Preprocessed table. The input table is returned if no column changed.
+    :rtype: Table
+    """
+    if isinstance(table, ArrowTable) and all(preprocessor.supports_arrow_columns for preprocessor in preprocessors):
+        return _process_arrow_columns(table, preprocessors)
+    table_df = table.as_dataframe()
+    kept_positions = []
+    changed_columns = {}
+    for position, column_name in enumerate(table_df.columns):
+        original_column = table_df.iloc[:, position]
+        column = original_column
+        for preprocessor in preprocessors:
+            column = preprocessor.process_column(column_name, column)
+            if column is None:
+                break
+        if column is None:
+            continue
+        if column is not original_column:
+            changed_columns[len(kept_positions)] = column
+        kept_positions.append(position)
+    if len(kept_positions) == len(table_df.columns) and len(changed_columns) == 0:
+        return table
+    # Columns are selected and replaced by position, since column names of tables are not necessarily unique
+    processed_df = table_df.iloc[:, kept_positions]
+    for position, column in changed_columns.items():
+        processed_df.isetitem(position, column)
+    return Table.from_dataframe(processed_df)
+
+
+def _process_arrow_columns(table: ArrowTable, preprocessors: List[TablePreprocessor]) -> ArrowTable:
+    import pyarrow as pa
+
+    arrow_table = table.as_arrow()
+    columns = []
+    column_names = []
+    kept_positions = []
+    changed = False
+    for position, (column_name, original_column) in enumerate(zip(arrow_table.column_names, arrow_table.columns)):
+        column = original_column
+        for preprocessor in preprocessors:
+            column = preprocessor.process_arrow_column(column_name, column)
+            if column is None:
+                break
+        if column is None or column is not original_column:
+            changed = True
+        if column is not None:
+            columns.append(column)
+            column_names.append(column_name)
+            kept_positions.append(position)
+    if not changed:
+        return table
+    # Unchanged columns are shared with the input table
+    return table._derive(pa.Table.from_arrays(columns, names=column_names), kept_positions)
+
+
+class PreprocessorChain:
+    """
+    Applies a list of table preprocessors to a table. Consecutive column-local preprocessors are fused, i.e., they are
+    applied in a single pass over the columns of the table that copies the table at most once. Other preprocessors are
+    applied one after the other.
+
+    :param preprocessors: Table preprocessors in the order they are applied.
+    :type preprocessors: List[TablePreprocessor]
+    """
+
+    def __init__(self, preprocessors: List[TablePreprocessor]):
+        self.preprocessors = preprocessors
+        # Groups of preprocessors that are applied together, consecutive column-local preprocessors share a group
+        self._groups: List[List[TablePreprocessor]] = []
+        for preprocessor in preprocessors:
+            if preprocessor.locality == COLUMN_LOCALITY and len(self._groups) > 0 and \
+                    self._groups[-1][-1].locality == COLUMN_LOCALITY:
+                self._groups[-1].append(preprocessor)
+            else:
+                self._groups.append([preprocessor])
+
+    def process(self, table: Table) -> Table:
+        """
+        Apply the preprocessors of the chain to a table.
+
+        :param table: Table to preprocess.
+        :type table: Table
+        :return: Preprocessed table.
+        :rtype: Table
+        """
+        for group in self._groups:
+            if group[0].locality == COLUMN_LOCALITY:
+                table = process_columns(table, group)
+            else:
+                table = group[0].process(table)
+        return table
+
 
 class ColumnDroppingPreprocessor(TablePreprocessor):
     """
@@ -43,14 +195,26 @@ class ColumnDroppingPreprocessor(TablePreprocessor):
     :type apply_before_row_sampling: bool
     """
 
+    locality = COLUMN_LOCALITY
+    supports_arrow_columns = True
+
     def __init__(self, columns_to_drop: List[str], apply_before_row_sampling=False):
         super().__init__(apply_before_row_sampling=apply_before_row_sampling)
         self.columns_to_drop = columns_to_drop
 
 
     def process(self, table: Table) -> Table:
-        columns_to_drop = [column for column in self.columns_to_drop if column in table.as_dataframe().columns]
-        return Table(table.as_dataframe().drop(columns_to_drop, axis=1))
+        return table.without_columns(set(self.columns_to_drop))
+
+    def process_column(self, column_name: Any, column: pd.Series) -> Optional[pd.Series]:
+        if column_name in self.columns_to_drop:
+            return None
+        return column
+
+    def process_arrow_column(self, column_name: Any, column: "pa.ChunkedArray") -> Optional["pa.ChunkedArray"]:
+        if column_name in self.columns_to_drop:
+            return None
+        return column
 
 
 class StringTruncationPreprocessor(TablePreprocessor):
@@ -63,15 +227,56 @@ class StringTruncationPreprocessor(TablePreprocessor):
     :type apply_before_row_sampling: bool
     """
 
+    locality = COLUMN_LOCALITY
+    supports_arrow_columns = True
+
     def __init__(self, max_len: int, apply_before_row_sampling=False):
         super().__init__(apply_before_row_sampling=apply_before_row_sampling)
         self.max_len = max_len
 
 
     def process(self, table:Table) -> Table:
-        table_df = table.as_dataframe().copy()
-        for column in table_df.columns:
-            if table_df[column].dtype == str:
-                table_df[column] = table_df[column].apply(lambda s: s[:self.max_len])
-        return Table(table_df)
+        return process_columns(table, [self])
+
+    def process_column(self, column_name: Any, column: pd.Series) -> Optional[pd.Series]:
+        # Strings are held in object columns or in columns with a string extension dtype
+        if not (column.dtype == object or isinstance(column.dtype, pd.StringDtype)):
+            return column
+        if pd.api.types.infer_dtype(column, skipna=True) == "string":
+            is_string = None
+        else:
+            # Columns that mix strings with other values (e.g., lists, which the .str accessor would slice as well)
+            is_string = column.map(lambda value: isinstance(value, str)).astype(bool)
+            if not is_string.any():
+                return column
+        if is_string is None and column.dtype == object:
+            # Columns of plain strings are measured and sliced directly, which is considerably faster than the .str
+            # accessor that handles missing values element by element. Missing values raise a TypeError.
+            values = column.tolist()
+            try:
+                if max(map(len, values), default=0) <= self.max_len:
+                    return column
+                truncated_values = np.array([value[:self.max_len] for value in values], dtype=object)
+                return pd.Series(truncated_values, index=column.index, name=column.name)
+            except TypeError:
+                pass
+        string_lengths = column.str.len()
+        if is_string is not None:
+            string_lengths = string_lengths[is_string]
+        if not (string_lengths > self.max_len).any():
+            return column
+        truncated = column.str.slice(0, self.max_len)
+        if is_string is None:
+            return truncated
+        return column.where(~is_string, truncated)
+
+
+    def process_arrow_column(self, column_name: Any, column: "pa.ChunkedArray") -> Optional["pa.ChunkedArray"]:
+        import pyarrow as pa
+        import pyarrow.compute as pc
 
+        if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+            return column
+        if not pc.any(pc.greater(pc.utf8_length(column), self.max_len)).as_py():
+            return column
+        return pc.utf8_slice_codeunits(column, 0, self.max_len)
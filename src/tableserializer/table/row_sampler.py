@@ -1,15 +1,19 @@
+import itertools
 import random
 from abc import abstractmethod, ABC
 
+from typing import List, Tuple, Iterable, Iterator, Optional, TYPE_CHECKING
+
 import numpy as np
 from numpy.random import PCG64, SeedSequence
 import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.impute import SimpleImputer
 
 from tableserializer.serializer.common import SignatureProvidingInstance
 from tableserializer.table import Table
 
+if TYPE_CHECKING:
+    from scipy import sparse
+
 class RowSampler(ABC, SignatureProvidingInstance):
     """
     A row sampler selects a subset of rows based on a predefined policy.
@@ -18,6 +22,13 @@ class RowSampler(ABC, SignatureProvidingInstance):
     :type rows_to_sample: int
     """
 
+    # Set to false in row samplers whose selection of rows does not depend on the columns of the table (neither their
+    # number nor their values). Columns that are dropped after sampling can then be dropped before sampling instead.
+    depends_on_columns: bool = True
+
+    # Set to false in row samplers that sample streams of table chunks without knowing the number of rows in advance.
+    stream_requires_num_rows: bool = True
+
     def __init__(self, rows_to_sample: int = 10):
         self.rows_to_sample = rows_to_sample
 
@@ -34,6 +45,24 @@ class RowSampler(ABC, SignatureProvidingInstance):
         """
         raise NotImplementedError
 
+    def sample_stream(self, chunks: Iterable[Table], num_rows: Optional[int] = None) -> Table:
+        """
+        Sample rows from a table that is read in chunks, e.g., from a file that is too large to be read at once (see
+        tableserializer.stream.sample_table_file). Unless a row sampler documents otherwise, the sampled rows are the
+        same as the rows sampled from the concatenation of the chunks by sample. By default, the chunks are concatenated
+        and sampled; row samplers that do not need the whole table hold only the sampled rows in memory.
+
+        :param chunks: Chunks of the table, all with the same columns.
+        :type chunks: Iterable[Table]
+        :param num_rows: Total number of rows of the chunks, if known in advance.
+        :type num_rows: Optional[int]
+        :return: Table consisting of the sampled rows.
+        :rtype: Table
+        """
+        chunks = iter(chunks)
+        first_chunk = _get_first_chunk(chunks)
+        return self.sample(first_chunk.concat(list(chunks)))
+
 class RandomRowSampler(RowSampler):
     """
     Samples rows randomly from the given table.
@@ -50,14 +79,96 @@ class RandomRowSampler(RowSampler):
         self.random = random.Random()
 
     def sample(self, table: Table) -> Table:
-        table_df = table.as_dataframe()
-        if len(table_df) <= self.rows_to_sample:
+        num_rows = table.get_num_rows()
+        if num_rows <= self.rows_to_sample:
             return table
+        # Draw the positions like pandas.DataFrame.sample, i.e., from the global random state if there is no seed
+        random_state = np.random
+        if self.deterministic:
+            random_state = np.random.RandomState(num_rows * len(table.get_column_names()))
+        return table.take(random_state.choice(num_rows, size=self.rows_to_sample, replace=False))
+
+    def sample_stream(self, chunks: Iterable[Table], num_rows: Optional[int] = None) -> Table:
+        """
+        Sample rows randomly from a table that is read in chunks, holding only the sampled rows in memory. If the
+        number of rows is known in advance, the same rows as by sample are drawn from the concatenation of the chunks.
+        Otherwise, the rows are drawn by reservoir sampling (Algorithm R), which samples every row with the same
+        probability as well, but is not equivalent to sample: the random numbers are seeded by the number of columns
+        only (if deterministic is set), as the number of rows is unknown, and the sampled rows are ordered by their
+        slot in the reservoir. Pass the number of rows (as sample_table_file does) to get the rows of sample.
+
+        :param chunks: Chunks of the table, all with the same columns.
+        :type chunks: Iterable[Table]
+        :param num_rows: Total number of rows of the chunks, if known in advance.
+        :type num_rows: Optional[int]
+        :return: Table consisting of the sampled rows.
+        :rtype: Table
+        """
+        chunks = iter(chunks)
+        first_chunk = _get_first_chunk(chunks)
+        if num_rows is None:
+            return self._sample_reservoir(first_chunk, chunks)
+        if num_rows <= self.rows_to_sample:
+            return first_chunk.concat(list(chunks))
+        random_state = np.random
+        if self.deterministic:
+            random_state = np.random.RandomState(num_rows * len(first_chunk.get_column_names()))
+        positions = random_state.choice(num_rows, size=self.rows_to_sample, replace=False)
+        # Collect the sampled rows in the order of their positions, then restore the order in which they were drawn
+        order = np.argsort(positions, kind="stable")
+        sorted_positions = positions[order]
+        schema = first_chunk.head(0)
+        sampled_chunks = []
+        offset = 0
+        for chunk in itertools.chain([first_chunk], chunks):
+            chunk_num_rows = chunk.get_num_rows()
+            start, stop = np.searchsorted(sorted_positions, [offset, offset + chunk_num_rows])
+            if stop > start:
+                sampled_chunks.append(chunk.take(sorted_positions[start:stop] - offset))
+            # Chunks without sampled rows still determine the dtypes of the columns of the whole table
+            schema = _update_schema(schema, chunk)
+            offset += chunk_num_rows
+        if offset != num_rows:
+            raise ValueError(f"The chunks hold {offset} rows instead of the expected {num_rows} rows.")
+        return schema.concat(sampled_chunks).take(np.argsort(order, kind="stable"))
+
+    def _sample_reservoir(self, first_chunk: Table, chunks: Iterator[Table]) -> Table:
         seed = None
         if self.deterministic:
-            seed = len(table_df) * len(table_df.iloc[0])
-        sample_df = table_df.sample(n=self.rows_to_sample, replace=False, random_state=seed)
-        return Table(sample_df.reset_index(drop=True))
+            seed = len(first_chunk.get_column_names())
+        random_generator = np.random.Generator(PCG64(SeedSequence(seed)))
+        schema = first_chunk.head(0)
+        # The reservoir holds the rows at the given positions of the concatenation of the kept tables
+        kept_tables: List[Table] = []
+        reservoir_positions = np.zeros(0, dtype=np.int64)
+        num_kept_rows = 0
+        offset = 0
+        for chunk in itertools.chain([first_chunk], chunks):
+            chunk_num_rows = chunk.get_num_rows()
+            row_indices = np.arange(offset, offset + chunk_num_rows)
+            # Algorithm R: the first rows fill the reservoir, every later row i replaces a random slot with probability
+            # rows_to_sample / (i + 1)
+            slots = np.where(row_indices < self.rows_to_sample, row_indices,
+                             random_generator.integers(0, row_indices + 1))
+            entering = np.flatnonzero(slots < self.rows_to_sample)
+            # Of several rows of the chunk that replace the same slot, the last one remains
+            entering_slots, last_occurrences = np.unique(slots[entering][::-1], return_index=True)
+            entering = entering[::-1][last_occurrences]
+            if len(entering) > 0:
+                num_filled = len(reservoir_positions)
+                reservoir_positions = np.concatenate(
+                    [reservoir_positions, np.zeros(max(0, entering_slots.max() + 1 - num_filled), dtype=np.int64)])
+                reservoir_positions[entering_slots] = num_kept_rows + np.arange(len(entering))
+                kept_tables.append(chunk.take(entering))
+                num_kept_rows += len(entering)
+            if num_kept_rows > 2 * self.rows_to_sample:
+                # Drop the rows that were replaced in the reservoir
+                kept_tables = [schema.concat(kept_tables).take(reservoir_positions)]
+                reservoir_positions = np.arange(len(reservoir_positions))
+                num_kept_rows = len(reservoir_positions)
+            schema = _update_schema(schema, chunk)
+            offset += chunk_num_rows
+        return schema.concat(kept_tables).take(reservoir_positions)
 
 class FirstRowSampler(RowSampler):
     """
@@ -67,8 +178,71 @@ class FirstRowSampler(RowSampler):
     :type rows_to_sample: int
     """
 
+    depends_on_columns = False
+
+    stream_requires_num_rows = False
+
     def sample(self, table: Table) -> Table:
-        return Table(table.as_dataframe()[:self.rows_to_sample].reset_index(drop=True))
+        return table.head(self.rows_to_sample)
+
+    def sample_stream(self, chunks: Iterable[Table], num_rows: Optional[int] = None) -> Table:
+        """
+        Sample the first rows from a table that is read in chunks. No chunks are read after the first rows, so columns
+        have the dtypes of the chunks that were read, e.g., an integer column stays an integer column even if later
+        chunks hold missing values.
+
+        :param chunks: Chunks of the table, all with the same columns.
+        :type chunks: Iterable[Table]
+        :param num_rows: Total number of rows of the chunks, if known in advance. Not used.
+        :type num_rows: Optional[int]
+        :return: Table consisting of the first rows.
+        :rtype: Table
+        """
+        chunks = iter(chunks)
+        first_chunk = _get_first_chunk(chunks)
+        sampled_chunks = []
+        num_sampled_rows = first_chunk.get_num_rows()
+        while num_sampled_rows < self.rows_to_sample:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            sampled_chunks.append(chunk.head(self.rows_to_sample - num_sampled_rows))
+            num_sampled_rows += sampled_chunks[-1].get_num_rows()
+        return first_chunk.head(self.rows_to_sample).concat(sampled_chunks)
+
+
+def _get_first_chunk(chunks: Iterator[Table]) -> Table:
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        raise ValueError("Cannot sample rows from a table without chunks.")
+    return first_chunk
+
+
+def _update_schema(schema: Table, chunk: Table) -> Table:
+    # Table without rows with the common dtypes of the schema and the chunk
+    if chunk.get_dtypes() == schema.get_dtypes():
+        return schema
+    return schema.concat([chunk.head(0)])
+
+
+def _get_informative_columns(table_df: pd.DataFrame) -> List[int]:
+    # Positions of the columns that hold information for clustering
+    informative_columns = []
+    for position in range(table_df.shape[1]):
+        unique_values = table_df.iloc[:, position].unique().shape[0]
+        # Dismiss id and id-like columns because they hold no information for clustering
+        # Dismiss columns with only a single value, which makes them not informative as well.
+        if unique_values != table_df.shape[0] and unique_values != 1:
+            informative_columns.append(position)
+    return informative_columns
+
+
+def _group_rows_by_cluster(labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Row positions ordered by cluster (keeping the row order within clusters), and the start and size of every cluster
+    order = np.argsort(labels, kind="stable")
+    _, group_starts, group_sizes = np.unique(labels[order], return_index=True, return_counts=True)
+    return order, group_starts, group_sizes
+
 
 class KMeansRowSampler(RowSampler):
     """
@@ -83,31 +257,30 @@ class KMeansRowSampler(RowSampler):
     def __init__(self, rows_to_sample: int = 10, deterministic: bool = True):
         super().__init__(rows_to_sample)
         self.deterministic = deterministic
-        self.imputer = SimpleImputer(strategy='most_frequent')
 
     def sample(self, table: Table) -> Table:
-        table_df = table.as_dataframe()
-        if len(table_df) <= self.rows_to_sample:
+        # scikit-learn is imported on first use, as importing it takes longer than importing the rest of the package
+        from sklearn.cluster import KMeans
+        from sklearn.impute import SimpleImputer
+
+        if table.get_num_rows() <= self.rows_to_sample:
             return table
+        table_df = table.as_dataframe()
         seed = None
         if self.deterministic:
-            seed = len(table_df) * len(table_df.iloc[0])
+            seed = len(table_df) * len(table.get_column_names())
         random_generator = np.random.Generator(PCG64(SeedSequence(seed)))
-        df_copy = table_df.copy()
-        for col in table_df.columns:
-            unique_values = table_df[col].unique().shape[0]
-            if unique_values == table_df.shape[0] or unique_values == 1:
-                # Handle id and id-like columns -> dismiss them because they hold no information for clustering
-                # Handle columns with only a single value, which makes them not informative as well.
-                df_copy.drop(col, axis=1, inplace=True)
-            elif table_df[col].isna().sum() > 0:
+        df_copy = table_df.iloc[:, _get_informative_columns(table_df)].copy()
+        for col in df_copy.columns:
+            if table_df[col].isna().sum() > 0:
                 # Handle columns with NaN value -> impute missing values
                 if df_copy[col].dtype == "object":
                     col_np = df_copy[col].to_numpy()
                     col_np[col_np == None] = "None"
                     df_copy[col] = col_np
                 else:
-                    df_copy[col] = self.imputer.fit_transform(table_df[col].to_numpy().reshape(-1, 1))
+                    imputer = SimpleImputer(strategy='most_frequent')
+                    df_copy[col] = imputer.fit_transform(table_df[col].to_numpy().reshape(-1, 1))
         if df_copy.shape[1] == 0:
             # In case there are no columns with relevant information k-Means is equivalent to random sampling
             return RandomRowSampler(rows_to_sample=self.rows_to_sample).sample(table)
@@ -116,9 +289,94 @@ class KMeansRowSampler(RowSampler):
 
         kmeans = KMeans(n_clusters=self.rows_to_sample, random_state=seed).fit(df_encoded)
 
-        table_df['cluster'] = kmeans.labels_
+        # Sample one row per cluster in the order of the clusters. This draws the same rows as sampling from each group
+        # of a groupby on the cluster labels, but without grouping the dataframe.
+        order, group_starts, group_sizes = _group_rows_by_cluster(kmeans.labels_)
+        sampled_positions = [order[start + random_generator.choice(size, size=1, replace=False)[0]]
+                             for start, size in zip(group_starts, group_sizes)]
+
+        return table.take(sampled_positions)
+
+
+class ScalableKMeansRowSampler(RowSampler):
+    """
+    Use k-means clustering to sample a diverse set of rows from large and wide tables. In contrast to the
+    KMeansRowSampler, categorical values are encoded as sparse, feature-hashed vectors of bounded dimension and the
+    clusters are fitted with mini-batch k-means on a subsample of at most max_fit_rows rows. All rows are then assigned
+    to the closest cluster.
+
+    :param rows_to_sample: Number of rows to sample.
+    :type rows_to_sample: int
+    :param deterministic: Set to true to apply a deterministic seed for the sampling process.
+    :type deterministic: bool
+    :param n_features: Dimension of the hashed encoding of categorical values.
+    :type n_features: int
+    :param max_fit_rows: Maximum number of rows that the clusters are fitted on.
+    :type max_fit_rows: int
+    """
+
+    def __init__(self, rows_to_sample: int = 10, deterministic: bool = True, n_features: int = 256,
+                 max_fit_rows: int = 10000):
+        super().__init__(rows_to_sample)
+        self.deterministic = deterministic
+        self.n_features = n_features
+        self.max_fit_rows = max_fit_rows
+
+    def _encode(self, table_df: pd.DataFrame, informative_columns: List[int]) -> "sparse.csr_matrix":
+        from scipy import sparse
+
+        num_rows = table_df.shape[0]
+        row_indices = np.arange(num_rows)
+        encoded_columns = []
+        for position in informative_columns:
+            column = table_df.iloc[:, position]
+            if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biuf":
+                # Standardize numeric values and impute missing values with the mean
+                values = column.to_numpy(dtype=np.float64)
+                values = np.nan_to_num(values - np.nanmean(values), nan=0.0, posinf=0.0, neginf=0.0)
+                std = values.std()
+                if std > 0:
+                    values = values / std
+                encoded_columns.append(sparse.csr_matrix(values.reshape(-1, 1)))
+            else:
+                # Hash the (column, value) pairs of categorical values into a bounded number of features
+                hashes = pd.util.hash_array(column.astype(str).to_numpy(dtype=object), hash_key=f"{position:016d}")
+                features = (hashes % np.uint64(self.n_features)).astype(np.intp)
+                encoded_columns.append(sparse.csr_matrix((np.ones(num_rows), (row_indices, features)),
+                                                         shape=(num_rows, self.n_features)))
+        return sparse.hstack(encoded_columns, format="csr")
+
+    def sample(self, table: Table) -> Table:
+        # scikit-learn is imported on first use, as importing it takes longer than importing the rest of the package
+        from sklearn.cluster import MiniBatchKMeans
+
+        if table.get_num_rows() <= self.rows_to_sample:
+            return table
+        table_df = table.as_dataframe()
+        seed = None
+        if self.deterministic:
+            seed = len(table_df) * len(table.get_column_names())
+        random_generator = np.random.Generator(PCG64(SeedSequence(seed)))
+        informative_columns = _get_informative_columns(table_df)
+        if len(informative_columns) == 0:
+            # In case there are no columns with relevant information k-Means is equivalent to random sampling
+            return RandomRowSampler(rows_to_sample=self.rows_to_sample).sample(table)
+
+        encoded = self._encode(table_df, informative_columns)
+        fit_rows = max(self.max_fit_rows, self.rows_to_sample)
+        fit_encoded = encoded
+        if encoded.shape[0] > fit_rows:
+            fit_encoded = encoded[np.sort(random_generator.choice(encoded.shape[0], size=fit_rows, replace=False))]
+        kmeans = MiniBatchKMeans(n_clusters=self.rows_to_sample, random_state=seed, n_init=3).fit(fit_encoded)
+        labels = kmeans.predict(encoded)
 
-        sampled_rows = (table_df.groupby('cluster').apply(lambda x: x.sample(1, random_state=random_generator))
-                        .reset_index(drop=True).drop('cluster', axis=1))
+        # Sample one row per cluster with a single draw of random offsets into the clusters
+        order, group_starts, group_sizes = _group_rows_by_cluster(labels)
+        sampled_positions = order[group_starts + random_generator.integers(0, group_sizes)]
+        if len(sampled_positions) < self.rows_to_sample:
+            # Fill up with random rows if some clusters were not assigned any rows
+            remaining_positions = np.setdiff1d(np.arange(len(table_df)), sampled_positions)
+            sampled_positions = np.concatenate([sampled_positions, random_generator.choice(
+                remaining_positions, size=self.rows_to_sample - len(sampled_positions), replace=False)])
 
-        return Table(sampled_rows)
+        return table.take(sampled_positions)
@@ -1,17 +1,41 @@
-from typing import Union, List, Dict
+import hashlib
+import pickle
+from typing import Union, List, Dict, Any, Callable, Iterator, Collection, Sequence
 
+import numpy as np
 import pandas as pd
 
 
+def _numeric_to_strings(values: np.ndarray) -> np.ndarray:
+    # Cell values are rendered as python scalars, i.e., floats of any precision are rendered as double precision floats
+    if values.dtype.kind == "f":
+        values = values.astype(np.float64)
+    return values.astype(str)
+
+
+def _column_to_strings(column: pd.Series) -> List[str]:
+    # String representations of the values of a single column, as they appear in rows that mix values of several dtypes
+    if column.dtype.kind in "biuf":
+        return _numeric_to_strings(column.to_numpy()).tolist()
+    return [str(value) for value in column.astype(object).tolist()]
+
+
 class Table:
     """
-    Represents the contents of a raw table.
+    Represents the contents of a raw table. A table is an immutable value: derived views of the table contents (e.g.,
+    rows, column names, dtypes) are computed once on first access and cached. The underlying data and the returned
+    views must therefore not be modified.
 
     :param table_contents: Table contents in one of the supported formats.
-    :type table_contents: Union[pd.DataFrame, List[Dict[str, str]], List[List[str]]]
+    :type table_contents: Union[Table, pd.DataFrame, List[Dict[str, str]], List[List[str]]]
     """
 
-    def __init__(self, table_contents: Union[pd.DataFrame, List[Dict[str, str]], List[List[str]]]):
+    def __init__(self, table_contents: Union["Table", pd.DataFrame, List[Dict[str, str]], List[List[str]]]):
+        if isinstance(table_contents, Table):
+            # Tables are immutable, the wrapped table and its cached views can be shared
+            self._table = table_contents._table
+            self._views = table_contents._views
+            return
         if isinstance(table_contents, pd.DataFrame):
             self._table = table_contents
         elif all(isinstance(row, list) for row in table_contents):
@@ -21,6 +45,174 @@ class Table:
         else:
             raise TypeError(f'{type(table_contents).__name__} is not a supported table format. Table must be of one '
                             f'of the following types: pandas.DataFrame, List[List[str]], List[Dict[str, str]].')
+        self._views: Dict[str, Any] = {}
+
+    @classmethod
+    def from_dataframe(cls, table_df: pd.DataFrame) -> "Table":
+        """
+        Create a table from a dataframe without checking the type of the table contents.
+
+        :param table_df: Table contents as a dataframe.
+        :type table_df: pd.DataFrame
+        :return: Table wrapping the dataframe.
+        :rtype: Table
+        """
+        table = cls.__new__(cls)
+        table._table = table_df
+        table._views = {}
+        return table
+
+    @classmethod
+    def from_list_of_lists(cls, table_contents: List[List[str]]) -> "Table":
+        """
+        Create a table from a list of lists without checking the type of the table contents. The first list holds the
+        column names.
+
+        :param table_contents: Table contents as a list of lists with the column names as first list.
+        :type table_contents: List[List[str]]
+        :return: Table holding the table contents.
+        :rtype: Table
+        """
+        return cls.from_dataframe(pd.DataFrame(table_contents[1:], columns=table_contents[0]))
+
+    @classmethod
+    def from_list_of_dicts(cls, table_contents: List[Dict[str, str]]) -> "Table":
+        """
+        Create a table from a list of dictionaries without checking the type of the table contents.
+
+        :param table_contents: Table contents as a list of dictionaries.
+        :type table_contents: List[Dict[str, str]]
+        :return: Table holding the table contents.
+        :rtype: Table
+        """
+        return cls.from_dataframe(pd.DataFrame(table_contents))
+
+    def _get_view(self, view_name: str, compute_view: Callable[[], Any]) -> Any:
+        try:
+            return self._views[view_name]
+        except KeyError:
+            view = compute_view()
+            self._views[view_name] = view
+            return view
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Cached views are cheap to recompute compared to sending them to other processes
+        return {"_table": self._table}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._table = state["_table"]
+        self._views = {}
+
+    def get_column_names(self) -> List[Any]:
+        """
+        Get the column names of the table.
+
+        :return: List of column names.
+        :rtype: List[Any]
+        """
+        return self._get_view("column_names", lambda: self._table.columns.tolist())
+
+    def get_dtypes(self) -> List[Any]:
+        """
+        Get the dtypes of the columns of the table.
+
+        :return: List of column dtypes in the order of the columns.
+        :rtype: List[Any]
+        """
+        return self._get_view("dtypes", lambda: self._table.dtypes.tolist())
+
+    def get_num_rows(self) -> int:
+        """
+        Get the number of rows of the table.
+
+        :return: Number of rows.
+        :rtype: int
+        """
+        return len(self._table)
+
+    def head(self, num_rows: int) -> "Table":
+        """
+        Get the first rows of the table. The rows of the returned table are indexed from 0.
+
+        :param num_rows: Number of rows.
+        :type num_rows: int
+        :return: Table consisting of the first num_rows rows.
+        :rtype: Table
+        """
+        return self.slice(0, num_rows)
+
+    def slice(self, offset: int, num_rows: int) -> "Table":
+        """
+        Get a contiguous range of rows of the table. The rows of the returned table are indexed from 0.
+
+        :param offset: Position of the first row.
+        :type offset: int
+        :param num_rows: Maximum number of rows.
+        :type num_rows: int
+        :return: Table consisting of the rows from offset to offset + num_rows.
+        :rtype: Table
+        """
+        return Table.from_dataframe(self._table.iloc[offset:offset + num_rows].reset_index(drop=True))
+
+    def take(self, positions: Sequence[int]) -> "Table":
+        """
+        Get the rows at the given positions of the table. The rows of the returned table are indexed from 0.
+
+        :param positions: Positions of the rows in the order they are taken.
+        :type positions: Sequence[int]
+        :return: Table consisting of the rows at the positions.
+        :rtype: Table
+        """
+        return Table.from_dataframe(self._table.iloc[positions].reset_index(drop=True))
+
+    def without_columns(self, columns: Collection[Any]) -> "Table":
+        """
+        Get the table without the given columns. Columns of the table that share a name with one of the given columns
+        are all removed, columns that are not in the table are ignored.
+
+        :param columns: Names of the columns to remove.
+        :type columns: Collection[Any]
+        :return: Table without the columns. The table itself is returned if it has none of the columns.
+        :rtype: Table
+        """
+        kept_positions = [position for position, column_name in enumerate(self.get_column_names())
+                          if column_name not in columns]
+        if len(kept_positions) == len(self.get_column_names()):
+            return self
+        return Table.from_dataframe(self._table.iloc[:, kept_positions])
+
+    def concat(self, tables: Sequence["Table"]) -> "Table":
+        """
+        Get the table with the rows of the given tables appended. The tables must have the same columns as the table.
+        Columns whose dtypes differ between the tables get a common dtype, as if the tables were concatenated as
+        dataframes. The rows of the returned table are indexed from 0.
+
+        :param tables: Tables whose rows are appended.
+        :type tables: Sequence[Table]
+        :return: Table consisting of the rows of the table followed by the rows of the given tables.
+        :rtype: Table
+        """
+        return Table.from_dataframe(pd.concat([self._table] + [table.as_dataframe() for table in tables],
+                                              ignore_index=True))
+
+    def get_fingerprint(self) -> str:
+        """
+        Get a fingerprint of the table contents. Tables with equal column names, dtypes, index and cell values have
+        equal fingerprints.
+
+        :return: Hex digest identifying the table contents.
+        :rtype: str
+        """
+        return self._get_view("fingerprint", self._compute_fingerprint)
+
+    def _compute_fingerprint(self) -> str:
+        fingerprint = hashlib.blake2b(digest_size=16)
+        fingerprint.update(repr((self.get_column_names(), [str(dtype) for dtype in self.get_dtypes()])).encode())
+        fingerprint.update(pickle.dumps(self._table.index, protocol=pickle.HIGHEST_PROTOCOL))
+        for _, column in self._table.items():
+            # Pickle the values column by column, so that the fingerprint does not depend on the memory layout
+            fingerprint.update(pickle.dumps(column.to_numpy(), protocol=pickle.HIGHEST_PROTOCOL))
+        return fingerprint.hexdigest()
 
     def as_list_of_lists(self) -> List[List[str]]:
         """
@@ -29,6 +221,11 @@ class Table:
         :return: Table as a list of the lists.
         :rtype: List[List[str]]
         """
+        return self._get_view("list_of_lists", self._compute_list_of_lists)
+
+    def _compute_list_of_lists(self) -> List[List[str]]:
+        if len(self._table) == 0:
+            return []
         return self._table.apply(lambda r: r.tolist(),axis=1).tolist()
 
     def as_list_of_dicts(self) -> List[Dict[str, str]]:
@@ -38,11 +235,58 @@ class Table:
         :return: Table as a list of the dictionaries.
         :rtype: List[Dict[str, str]]
         """
+        return self._get_view("list_of_dicts", self._compute_list_of_dicts)
+
+    def _compute_list_of_dicts(self) -> List[Dict[str, str]]:
+        if len(self._table) == 0:
+            return []
         return self._table.apply(lambda r: {key: value for key, value in r.items()},axis=1).tolist()
 
+    def as_list_of_string_lists(self) -> List[List[str]]:
+        """
+        Get the table as a list of lists in which every cell value is converted to its string representation. The
+        string representations are the same as for the values returned by as_list_of_lists.
+
+        :return: Table as a list of lists of strings.
+        :rtype: List[List[str]]
+        """
+        return self._get_view("list_of_string_lists", self._compute_list_of_string_lists)
+
+    def _compute_list_of_string_lists(self) -> List[List[str]]:
+        dtypes = self.get_dtypes()
+        if not all(isinstance(dtype, np.dtype) for dtype in dtypes):
+            # Extension dtypes (e.g., nullable integers) change the common dtype of rows, fall back to the row views
+            return [[str(value) for value in row] for row in self.as_list_of_lists()]
+        if len(dtypes) > 0 and all(dtype.kind in "biuf" for dtype in dtypes):
+            # Rows of purely numeric tables share a common dtype, convert all cells in a single vectorized operation
+            values = self._table.to_numpy()
+            if values.dtype.kind in "biuf":
+                return _numeric_to_strings(values).tolist()
+        string_columns = [_column_to_strings(column) for _, column in self._table.items()]
+        if len(string_columns) == 0:
+            return [[] for _ in range(len(self._table))]
+        return [list(row) for row in zip(*string_columns)]
+
+    def iter_string_rows(self, block_size: int = 1024) -> Iterator[List[str]]:
+        """
+        Iterate over the rows of the table with every cell value converted to its string representation, as returned by
+        as_list_of_string_lists. Unless the string rows are cached already, the rows are converted in blocks of
+        block_size rows, so that consumers that stop early do not convert the whole table.
+
+        :param block_size: Number of rows that are converted at once.
+        :type block_size: int
+        :return: Iterator over the rows as lists of strings.
+        :rtype: Iterator[List[str]]
+        """
+        if "list_of_string_lists" in self._views or self.get_num_rows() <= block_size:
+            yield from self.as_list_of_string_lists()
+            return
+        for start in range(0, self.get_num_rows(), block_size):
+            yield from self.slice(start, block_size).as_list_of_string_lists()
+
     def as_dataframe(self) -> pd.DataFrame:
         """
-        Get the table as a dataframe.
+        Get the table as a dataframe. The dataframe must not be modified, create a copy to make changes.
 
         :return: The table as a dataframe.
         :rtype: pd.DataFrame
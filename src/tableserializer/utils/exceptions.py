@@ -1,2 +1,6 @@
 class ClassDefinitionError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+
+class ExperimentError(Exception):
+    pass
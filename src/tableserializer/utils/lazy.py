@@ -0,0 +1,30 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def create_lazy_attribute_hooks(module_name: str, lazy_attributes: Dict[str, str]) \
+        -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Create the module __getattr__ and __dir__ functions of a module whose attributes are imported on first access. An
+    attribute is imported once and then stored in the module.
+
+    :param module_name: Name of the module whose attributes are imported lazily.
+    :type module_name: str
+    :param lazy_attributes: Mapping of the attribute names to the names of the modules that define them.
+    :type lazy_attributes: Dict[str, str]
+    :return: Tuple of the module __getattr__ and __dir__ functions.
+    :rtype: Tuple[Callable[[str], Any], Callable[[], List[str]]]
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in lazy_attributes:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(lazy_attributes[name]), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[module_name]).keys()) | set(lazy_attributes.keys()))
+
+    return __getattr__, __dir__
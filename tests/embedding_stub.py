@@ -0,0 +1,73 @@
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+
+def stub_embedding(text: str) -> List[float]:
+    # Deterministic embedding of a text
+    digest = hashlib.sha1(text.encode()).digest()
+    return [byte / 255 for byte in digest[:8]]
+
+
+class EmbeddingStub:
+    """
+    Local stand-in for the embedding endpoints of OpenAI (POST /v1/embeddings) and Text Embeddings Inference
+    (POST /embed). The inputs of every request are recorded in requests, and the times the requests were received and
+    answered in request_times.
+
+    :param delay_seconds: Time each request takes.
+    :type delay_seconds: float
+    """
+
+    def __init__(self, delay_seconds: float = 0.0):
+        self.delay_seconds = delay_seconds
+        self.requests: List[List[str]] = []
+        self.request_times: List[Tuple[float, float]] = []
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                start = time.perf_counter()
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path == "/v1/embeddings":
+                    inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+                    response = {"object": "list", "model": body["model"],
+                                "data": [{"object": "embedding", "index": index, "embedding": stub_embedding(text)}
+                                         for index, text in enumerate(inputs)],
+                                "usage": {"prompt_tokens": 0, "total_tokens": 0}}
+                elif self.path == "/embed":
+                    inputs = body["inputs"] if isinstance(body["inputs"], list) else [body["inputs"]]
+                    response = [stub_embedding(text) for text in inputs]
+                else:
+                    self.send_error(404)
+                    return
+                time.sleep(stub.delay_seconds)
+                with stub._lock:
+                    stub.requests.append(inputs)
+                    stub.request_times.append((start, time.perf_counter()))
+                payload = json.dumps(response).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "EmbeddingStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
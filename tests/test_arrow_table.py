@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+from tableserializer.serializer.table import JSONRawTableSerializer, MarkdownRawTableSerializer
+from tableserializer.table import Table
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from tableserializer.table.arrow import ArrowTable
+
+
+def test_dictionary_columns_keep_their_values():
+    arrow_table = pa.table({"c": pa.array(["u", "v", "u"]).dictionary_encode(),
+                            "d": pa.array(["a", None, "b"]).dictionary_encode()})
+    table = ArrowTable(arrow_table)
+    expected = Table.from_dataframe(arrow_table.to_pandas())
+
+    assert table.as_dataframe().equals(arrow_table.to_pandas())
+    assert MarkdownRawTableSerializer().serialize_raw_table(table) == \
+           MarkdownRawTableSerializer().serialize_raw_table(expected)
+    assert JSONRawTableSerializer().serialize_raw_table(table) == JSONRawTableSerializer().serialize_raw_table(expected)
+    assert '"c": "u"' in JSONRawTableSerializer().serialize_raw_table(table)
+
+
+def test_categorical_parquet_columns_keep_their_categories(tmp_path):
+    table_df = pd.DataFrame({"c": pd.Categorical(["u", "v", "u"], categories=["v", "u", "w"], ordered=True)})
+    table_df.to_parquet(tmp_path / "table.parquet")
+    table = ArrowTable(pq.read_table(tmp_path / "table.parquet"))
+
+    assert table.get_dtypes() == pd.read_parquet(tmp_path / "table.parquet").dtypes.tolist()
+    assert table.as_dataframe().equals(table_df)
+    assert table.take([2, 1]).as_dataframe().equals(table_df.iloc[[2, 1]].reset_index(drop=True))
+
+
+def test_fingerprint_depends_on_dtypes():
+    # The subset keeps the float dtype of the column with a missing value, the same values on their own are integers
+    subset = ArrowTable(pa.table({"x": pa.array([1, None, 3])})).take([0, 2])
+    same_values = ArrowTable(pa.table({"x": pa.array([1, 3])}))
+
+    assert MarkdownRawTableSerializer().serialize_raw_table(subset) != \
+           MarkdownRawTableSerializer().serialize_raw_table(same_values)
+    assert subset.get_fingerprint() != same_values.get_fingerprint()
+    assert subset.get_fingerprint() == ArrowTable(pa.table({"x": pa.array([1, None, 3])})).take([0, 2]).get_fingerprint()
+
+
+def test_subsets_keep_their_dtypes_when_pickled(tmp_path):
+    import pickle
+
+    from tableserializer.cache import ComponentCache
+
+    table = ArrowTable(pa.table({"x": pa.array([1, None, 2]), "y": pa.array(["a", "b", "c"])}))
+    subset = table.take([0, 2])
+    expected = MarkdownRawTableSerializer().serialize_raw_table(subset)
+    assert "1.0" in expected
+
+    assert MarkdownRawTableSerializer().serialize_raw_table(pickle.loads(pickle.dumps(subset))) == expected
+    cache = ComponentCache(str(tmp_path / "cache.sqlite"))
+    cache.put("subset", subset)
+    assert MarkdownRawTableSerializer().serialize_raw_table(cache.get("subset")) == expected
@@ -0,0 +1,129 @@
+import re
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.budget import TokenBudget, CallableTokenCounter
+from tableserializer.serializer.table import JSONRawTableSerializer, MarkdownRawTableSerializer, \
+    CSVRawTableSerializer
+from tableserializer.table import Table
+from tableserializer.table.row_sampler import FirstRowSampler
+
+
+def _create_table(num_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "quoted": [f'say "hi" {i}\\n' for i in range(num_rows)],
+        "number": rng.random(num_rows) * 1000,
+        "missing": np.where(np.arange(num_rows) % 3 == 0, np.nan, np.arange(num_rows)),
+        "flag": np.arange(num_rows) % 2 == 0,
+        "text": [None if i % 5 == 0 else "é" * (i % 7) for i in range(num_rows)],
+    })
+
+
+@pytest.mark.parametrize("table_serializer", [JSONRawTableSerializer(), MarkdownRawTableSerializer()])
+@pytest.mark.parametrize("max_tokens", [150, 1000, 3000])
+def test_serialization_fits_into_character_budget(table_serializer, max_tokens):
+    serializer = Serializer(SerializationRecipe("Table:\n{TABLE}"), table_serializer=table_serializer,
+                            row_sampler=FirstRowSampler(100), token_budget=TokenBudget(max_tokens))
+    table_df = _create_table(100)
+    serialization = serializer.serialize(table_df, {})
+
+    assert len(serialization) <= max_tokens
+    # The budget is measured exactly, one more row does not fit. The first line holds the recipe text, Markdown
+    # serializations have a header line.
+    num_rows = len(serialization.split("\n")) - 1
+    if isinstance(table_serializer, MarkdownRawTableSerializer):
+        num_rows -= 1
+    unbudgeted = Serializer(SerializationRecipe("Table:\n{TABLE}"), table_serializer=table_serializer,
+                            row_sampler=FirstRowSampler(num_rows + 1))
+    assert len(unbudgeted.serialize(table_df, {})) > max_tokens
+
+
+_CACHE_SIGNATURE_SCRIPT = """
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.budget import TokenBudget, CallableTokenCounter
+from tableserializer.serializer.table import MarkdownRawTableSerializer
+
+serializer = Serializer(SerializationRecipe("{TABLE}"), table_serializer=MarkdownRawTableSerializer(),
+                        token_budget=TokenBudget(100, CallableTokenCounter(lambda text: len(text.split()), "words")))
+print(serializer._get_cache_signature())
+"""
+
+
+def test_cache_signatures_with_callable_token_counters_are_equal_across_processes():
+    signatures = [subprocess.run([sys.executable, "-c", _CACHE_SIGNATURE_SCRIPT], capture_output=True, text=True,
+                                 check=True).stdout for _ in range(2)]
+
+    assert signatures[0] == signatures[1]
+    assert "words" in signatures[0]
+    assert "0x" not in signatures[0]
+
+
+def _count_pretokens(text: str) -> int:
+    # Pre-tokenization of byte-level BPE tokenizers, runs of punctuation and whitespace merge across the boundaries of
+    # cells and rows, so that the tokens of a serialization differ from the sum of the tokens of its parts
+    return len(re.findall(r" ?\w+| ?[^\w\s]+|\s+", text))
+
+
+@pytest.mark.parametrize("table_serializer", [JSONRawTableSerializer(), MarkdownRawTableSerializer(),
+                                              CSVRawTableSerializer()])
+@pytest.mark.parametrize("max_tokens", [150, 400, 1500])
+def test_serialization_fits_into_token_budget(table_serializer, max_tokens):
+    token_counter = CallableTokenCounter(_count_pretokens, "pretokens")
+    serializer = Serializer(SerializationRecipe("Table:\n{TABLE}"), table_serializer=table_serializer,
+                            row_sampler=FirstRowSampler(100), token_budget=TokenBudget(max_tokens, token_counter))
+    serialization = serializer.serialize(_create_table(100), {})
+
+    assert _count_pretokens(serialization) <= max_tokens
+    assert len(serialization.split("\n")) > 2
+
+
+class _CountingRowSampler(FirstRowSampler):
+
+    def __init__(self, rows_to_sample: int):
+        super().__init__(rows_to_sample)
+        self.num_samples = 0
+
+    def sample(self, table: Table) -> Table:
+        self.num_samples += 1
+        return super().sample(table)
+
+
+def test_rows_are_sampled_once():
+    row_sampler = _CountingRowSampler(100)
+    serializer = Serializer(SerializationRecipe("{TABLE}"), table_serializer=JSONRawTableSerializer(),
+                            row_sampler=row_sampler, token_budget=TokenBudget(1000))
+    serialization = serializer.serialize(_create_table(100), {})
+
+    assert row_sampler.num_samples == 1
+    assert 0 < len(serialization) <= 1000
+
+
+def test_string_cells_are_truncated():
+    table_df = pd.DataFrame({"object": ["abcdef", None, 12], "string": pd.array(["abcdef", None, "ab"], dtype="string"),
+                             "number": [123456, 7, 8]})
+    budget = TokenBudget(1000, max_cell_length=3)
+
+    truncated = budget.truncate_cells(Table.from_dataframe(table_df)).as_dataframe()
+    assert truncated["object"].tolist() == ["abc", None, 12]
+    assert truncated["string"].tolist() == ["abc", pd.NA, "ab"]
+    assert truncated["number"].tolist() == [123456, 7, 8]
+
+
+def test_arrow_string_cells_are_truncated():
+    pa = pytest.importorskip("pyarrow")
+    from tableserializer.table.arrow import ArrowTable
+
+    table = ArrowTable(pa.table({"string": ["abcdef", None, "ab"], "number": [123456, 7, 8]}))
+    serializer = Serializer(SerializationRecipe("{TABLE}"), table_serializer=MarkdownRawTableSerializer(),
+                            token_budget=TokenBudget(1000, max_cell_length=3))
+
+    expected = Table.from_dataframe(pd.DataFrame({"string": ["abc", None, "ab"], "number": [123456, 7, 8]}))
+    assert serializer.serialize(table, {}) == MarkdownRawTableSerializer().serialize_raw_table(expected)
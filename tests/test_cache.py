@@ -0,0 +1,58 @@
+import os
+import sqlite3
+
+from tableserializer.cache import ComponentCache
+
+
+def _get_entry_sizes(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries").fetchone()
+
+
+def test_total_size_follows_insertions_overwrites_and_deletions(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ComponentCache(path)
+    for index in range(20):
+        cache.put(f"key {index}", os.urandom(100 + index))
+    cache.put("key 3", os.urandom(1000))
+    cache.get("key 5")
+
+    assert cache.get_size() == _get_entry_sizes(path)[0]
+    cache.clear()
+    assert cache.get_size() == 0
+
+
+def _get_keys(path):
+    with sqlite3.connect(path) as connection:
+        return {key for key, in connection.execute("SELECT key FROM entries")}
+
+
+def test_full_cache_is_evicted_to_the_low_water_mark(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ComponentCache(path, max_size_bytes=20000, low_water_mark=0.5)
+    # Fill the cache until the first eviction
+    num_puts = 0
+    while num_puts == 0 or len(_get_keys(path)) == num_puts:
+        cache.put(f"key {num_puts}", os.urandom(500))
+        num_puts += 1
+
+    size, num_entries = _get_entry_sizes(path)
+    assert cache.get_size() == size <= 10000
+    # The least recently used entries were evicted
+    assert "key 0" not in _get_keys(path)
+    assert f"key {num_puts - 1}" in _get_keys(path)
+    # The next insertions fit into the cache without evicting entries
+    cache.put("next key", os.urandom(500))
+    assert _get_entry_sizes(path)[1] == num_entries + 1
+
+
+def test_total_size_of_caches_without_size_table_is_computed_once(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, value BLOB, size INTEGER, last_access REAL)")
+        connection.execute("INSERT INTO entries VALUES ('old key', x'00', 123, 0)")
+
+    cache = ComponentCache(path)
+    cache.put("new key", 1)
+
+    assert cache.get_size() == _get_entry_sizes(path)[0] > 123
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from embedding_stub import EmbeddingStub, stub_embedding
+
+target = pytest.importorskip("tableserializer.integrations.target", exc_type=Exception)
+
+
+def _create_client(stub, cache_db_path, **kwargs):
+    return target.CachingOpenAIClient(api_key="test", cache_db_path=str(cache_db_path), base_url=stub.url + "/v1",
+                                      **kwargs)
+
+
+def test_batch_embed_requests_misses_in_chunks(tmp_path):
+    texts = [f"text {index}" * (index % 5 + 1) for index in range(25)]
+    with EmbeddingStub() as stub:
+        client = _create_client(stub, tmp_path / "cache.duckdb", max_batch_size=4, max_batch_tokens=20)
+        embeddings = client.batch_embed(texts + texts[:5])
+
+        assert [embedding.tolist() for embedding in embeddings] == \
+               [np.array(stub_embedding(text), dtype=np.float32).tolist() for text in texts + texts[:5]]
+        # Every distinct text is requested once, in chunks within the request size and token limits
+        assert sorted(text for request in stub.requests for text in request) == sorted(texts)
+        for request in stub.requests:
+            assert len(request) <= 4
+            assert len(request) == 1 or sum(target.estimate_num_tokens(text) for text in request) <= 20
+
+
+def test_batch_embed_serves_cached_embeddings_in_bulk(tmp_path):
+    texts = [f"text {index}" for index in range(10)]
+    with EmbeddingStub() as stub:
+        first = _create_client(stub, tmp_path / "cache.duckdb", max_lookup_batch_size=3).batch_embed(texts[:6])
+        num_requests = len(stub.requests)
+        # A second client of the same cache file only requests the texts that have not been embedded yet
+        second = _create_client(stub, tmp_path / "cache.duckdb", max_lookup_batch_size=3).batch_embed(texts)
+
+        assert [text for request in stub.requests[num_requests:] for text in request] == texts[6:]
+        assert all(np.array_equal(a, b) for a, b in zip(first, second[:6]))
+
+
+def test_embeddings_of_completed_requests_are_cached_if_a_later_request_fails(tmp_path):
+    texts = [f"text {index}" for index in range(6)]
+    with EmbeddingStub() as stub:
+        client = _create_client(stub, tmp_path / "cache.duckdb", max_batch_size=2)
+        original_create = client._client.embeddings.create
+
+        def fail_third_request(**kwargs):
+            if len(stub.requests) == 2:
+                raise RuntimeError("Request failed")
+            return original_create(**kwargs)
+        client._client.embeddings.create = fail_third_request
+        with pytest.raises(RuntimeError):
+            client.batch_embed(texts)
+
+        client._client.embeddings.create = original_create
+        client.batch_embed(texts)
+        assert stub.requests[2:] == [texts[4:6]]
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.table import JSONRawTableSerializer
+from tableserializer.stream import CSVDirectoryTableSource, serialize_corpus
+from tableserializer.table import Table
+from tableserializer.table.preprocessor import PreprocessorChain, ColumnDroppingPreprocessor, \
+    StringTruncationPreprocessor
+from tableserializer.table.row_sampler import FirstRowSampler, RandomRowSampler, KMeansRowSampler, \
+    ScalableKMeansRowSampler
+
+
+def _create_table(num_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "a": rng.normal(size=num_rows),
+        # The dropped column separates the rows into clusters, so that samplers that depend on it sample other rows
+        "dropped": np.where(np.arange(num_rows) % 4 == 0, 1000.0, 0.0) + rng.normal(size=num_rows),
+        "text": [f"row number {i}" for i in range(num_rows)],
+        "c": rng.integers(0, 100, size=num_rows),
+    })
+
+
+def _serialize_without_pushdown(serializer: Serializer, table_df: pd.DataFrame) -> str:
+    # Sample the full table and drop the columns afterwards, as the stages are declared
+    table = Table.from_dataframe(table_df)
+    table = PreprocessorChain([preprocessor for preprocessor in serializer.table_preprocessors
+                               if preprocessor.apply_before_row_sampling]).process(table)
+    table = serializer.row_sampler.sample(table)
+    table = PreprocessorChain([preprocessor for preprocessor in serializer.table_preprocessors
+                               if not preprocessor.apply_before_row_sampling]).process(table)
+    return serializer.recipe.cook_recipe(table_contents=serializer.table_serializer.serialize_raw_table(table))
+
+
+_ROW_SAMPLERS = [FirstRowSampler(5), RandomRowSampler(5), KMeansRowSampler(3), ScalableKMeansRowSampler(3)]
+_PREPROCESSORS = [
+    [ColumnDroppingPreprocessor(["dropped"])],
+    [StringTruncationPreprocessor(6, apply_before_row_sampling=True),
+     ColumnDroppingPreprocessor(["dropped"], apply_before_row_sampling=True)],
+    [ColumnDroppingPreprocessor(["dropped"]), StringTruncationPreprocessor(6)],
+]
+
+
+@pytest.mark.parametrize("row_sampler", _ROW_SAMPLERS)
+@pytest.mark.parametrize("table_preprocessors", _PREPROCESSORS)
+def test_dropping_columns_before_sampling_keeps_the_serialization(row_sampler, table_preprocessors):
+    if isinstance(row_sampler, (KMeansRowSampler, ScalableKMeansRowSampler)):
+        pytest.importorskip("sklearn")
+    serializer = Serializer(SerializationRecipe("{TABLE}"), table_serializer=JSONRawTableSerializer(),
+                            row_sampler=row_sampler, table_preprocessors=table_preprocessors)
+    table_df = _create_table(40)
+
+    assert serializer.serialize(table_df, {}) == _serialize_without_pushdown(serializer, table_df)
+    if row_sampler.depends_on_columns and not table_preprocessors[0].apply_before_row_sampling:
+        assert serializer.get_dropped_columns() == set()
+    else:
+        assert serializer.get_dropped_columns() == {"dropped"}
+
+
+def test_column_dependent_samplers_sample_other_rows_of_projected_tables():
+    # Pushing the projection down through a sampler that depends on the columns would change the sampled rows
+    pytest.importorskip("sklearn")
+    table = Table.from_dataframe(_create_table(40))
+    row_sampler = KMeansRowSampler(3)
+
+    sampled = row_sampler.sample(table).without_columns({"dropped"})
+    sampled_from_projection = row_sampler.sample(table.without_columns({"dropped"}))
+
+    assert not sampled.as_dataframe().equals(sampled_from_projection.as_dataframe())
+
+
+@pytest.mark.parametrize("row_sampler", _ROW_SAMPLERS)
+def test_corpora_without_dropped_columns_keep_their_serializations(tmp_path, row_sampler):
+    if isinstance(row_sampler, (KMeansRowSampler, ScalableKMeansRowSampler)):
+        pytest.importorskip("sklearn")
+    for seed in range(3):
+        _create_table(30, seed).to_csv(tmp_path / f"table_{seed}.csv", index=False)
+    serializer = Serializer(SerializationRecipe("{TABLE}"), table_serializer=JSONRawTableSerializer(),
+                            row_sampler=row_sampler, table_preprocessors=[ColumnDroppingPreprocessor(["dropped"])])
+
+    serializations = list(serialize_corpus(CSVDirectoryTableSource(str(tmp_path)), serializer))
+
+    assert serializations == [_serialize_without_pushdown(serializer, pd.read_csv(tmp_path / f"table_{seed}.csv"))
+                              for seed in range(3)]
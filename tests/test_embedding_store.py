@@ -0,0 +1,111 @@
+from typing import Collection, Dict, List
+
+import numpy as np
+import pytest
+
+target = pytest.importorskip("tableserializer.integrations.target", exc_type=Exception)
+from pytei.store import EmbeddingStore
+
+
+class _DictEmbeddingStore(EmbeddingStore):
+    # Backing store in memory that records the keys it is asked for
+
+    def __init__(self):
+        self.embeddings: Dict[str, np.ndarray] = {}
+        self.requested_keys: List[str] = []
+
+    def get(self, key: str) -> np.ndarray:
+        self.requested_keys.append(key)
+        return self.embeddings[key]
+
+    def get_all(self, keys: Collection[str]) -> Dict[str, np.ndarray]:
+        self.requested_keys.extend(keys)
+        return {key: self.embeddings[key] for key in keys if key in self.embeddings}
+
+    def put(self, key: str, value: np.ndarray) -> None:
+        self.embeddings[key] = value
+
+    def put_all(self, keys: List[str], values: List[np.ndarray]) -> None:
+        self.embeddings.update(zip(keys, values))
+
+    def remove(self, key: str) -> None:
+        del self.embeddings[key]
+
+
+def _embedding(value: float) -> np.ndarray:
+    # Embeddings of 100 bytes
+    return np.full(25, value, dtype=np.float32)
+
+
+def test_lookups_are_served_from_memory():
+    backing_store = _DictEmbeddingStore()
+    store = target.LRUEmbeddingStore(backing_store, max_size_bytes=1000)
+    store.put_all(["a", "b"], [_embedding(1), _embedding(2)])
+    backing_store.put("c", _embedding(3))
+
+    assert np.array_equal(store.get("a"), _embedding(1))
+    found = store.get_all(["a", "b", "c", "c", "missing"])
+
+    assert sorted(found.keys()) == ["a", "b", "c"]
+    assert np.array_equal(found["c"], _embedding(3))
+    # Only the keys that are not held in memory are looked up in the backing store, each of them once
+    assert backing_store.requested_keys == ["c", "missing"]
+    assert np.array_equal(store.get("c"), _embedding(3))
+    assert backing_store.requested_keys == ["c", "missing"]
+
+
+def test_least_recently_used_embeddings_are_evicted():
+    backing_store = _DictEmbeddingStore()
+    store = target.LRUEmbeddingStore(backing_store, max_size_bytes=300)
+    for index, key in enumerate(["a", "b", "c"]):
+        store.put(key, _embedding(index))
+    # Using "a" makes "b" the least recently used embedding
+    store.get("a")
+
+    store.put("d", _embedding(3))
+
+    assert list(store._embeddings.keys()) == ["c", "a", "d"]
+    assert store._size_bytes == 300
+    # Evicted embeddings are still read from the backing store
+    assert np.array_equal(store.get("b"), _embedding(1))
+    assert backing_store.requested_keys == ["b"]
+    assert list(store._embeddings.keys()) == ["a", "d", "b"]
+
+
+def test_size_accounting_follows_replacements_and_removals():
+    backing_store = _DictEmbeddingStore()
+    store = target.LRUEmbeddingStore(backing_store, max_size_bytes=1000)
+    store.put("a", _embedding(1))
+    store.put("a", np.zeros(50, dtype=np.float32))
+    store.put("b", _embedding(2))
+
+    assert store._size_bytes == 300
+
+    store.remove("a")
+
+    assert store._size_bytes == 100
+    assert "a" not in backing_store.embeddings
+    # Embeddings that exceed the size of the memory tier are only kept in the backing store
+    store.put("large", np.zeros(1000, dtype=np.float32))
+    assert store._size_bytes == 0
+    assert "large" in backing_store.embeddings
+
+
+def test_shared_embedding_stores_are_shared_per_database(tmp_path):
+    first = target.get_shared_embedding_store(str(tmp_path / "embeddings" / "cache.db"))
+
+    assert target.get_shared_embedding_store(str(tmp_path / "embeddings" / ".." / "embeddings" / "cache.db")) is first
+    assert target.get_shared_embedding_store(str(tmp_path / "other.db")) is not first
+
+
+def test_batches_embed_each_distinct_text_once():
+    embedded_batches = []
+
+    def embed(texts: List[str]) -> List[np.ndarray]:
+        embedded_batches.append(list(texts))
+        return [_embedding(len(text)) for text in texts]
+
+    embeddings = target._embed_deduplicated(embed, ["a", "bb", "a", "ccc", "bb"])
+
+    assert embedded_batches == [["a", "bb", "ccc"]]
+    assert [embedding[0] for embedding in embeddings] == [1, 2, 1, 3, 2]
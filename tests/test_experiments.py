@@ -0,0 +1,86 @@
+import functools
+import os
+import time
+
+import pytest
+
+from tableserializer.kitchen import ExperimentalSerializerKitchen, read_experiment_status
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.table import MarkdownRawTableSerializer
+from tableserializer.table.row_sampler import FirstRowSampler
+
+
+def _save_experiments(base_folder, num_experiments):
+    serializers = [Serializer(SerializationRecipe("{TABLE}"), table_serializer=MarkdownRawTableSerializer(),
+                              row_sampler=FirstRowSampler(num_rows)) for num_rows in range(1, num_experiments + 1)]
+    ExperimentalSerializerKitchen().save_serializer_experiment_configurations(serializers, base_folder)
+
+
+def _crash_first_run_of_first_experiment(experiment_dir, serializer):
+    # Kills the worker process running the experiment with one row, once
+    marker = os.path.join(experiment_dir, "crashed")
+    if serializer.row_sampler.rows_to_sample == 1 and not os.path.exists(marker):
+        time.sleep(1)
+        open(marker, "w").close()
+        os._exit(1)
+
+
+class _SerialExecutor:
+    supports_parallel_experiments = False
+
+    def __init__(self):
+        self.pids = []
+
+    def run_experiment(self, experiment_dir, serializer):
+        self.pids.append(os.getpid())
+
+
+def test_unfinished_experiments_are_requeued_after_worker_crash(tmp_path):
+    base_folder = str(tmp_path)
+    _save_experiments(base_folder, 4)
+    kitchen = ExperimentalSerializerKitchen()
+
+    kitchen.run_experiments_with_serializers(base_folder, _crash_first_run_of_first_experiment, workers=2)
+
+    statuses = [read_experiment_status(experiment_dir)
+                for experiment_dir, _ in kitchen.get_serializers_from_dir(base_folder)]
+    assert all(status["status"] == "completed" and status["attempts"] == 1 for status in statuses)
+
+
+def _wrap(callback):
+    @functools.wraps(callback)
+    def wrapper(experiment_dir, serializer):
+        return callback(experiment_dir, serializer)
+    return wrapper
+
+
+@pytest.mark.parametrize("wrap_callback", [lambda callback: callback, functools.partial, _wrap,
+                                           lambda callback: functools.partial(_wrap(callback))])
+def test_executors_without_parallel_support_run_in_current_process(tmp_path, wrap_callback):
+    base_folder = str(tmp_path)
+    _save_experiments(base_folder, 3)
+    executor = _SerialExecutor()
+
+    ExperimentalSerializerKitchen().run_experiments_with_serializers(base_folder, wrap_callback(executor.run_experiment),
+                                                                     workers=2)
+
+    assert executor.pids == [os.getpid()] * 3
+
+
+def test_callbacks_can_declare_their_parallel_support(tmp_path):
+    base_folder = str(tmp_path)
+    _save_experiments(base_folder, 3)
+    pids = []
+
+    def run_experiment(experiment_dir, serializer):
+        pids.append(os.getpid())
+
+    run_experiment.supports_parallel_experiments = False
+    ExperimentalSerializerKitchen().run_experiments_with_serializers(base_folder, run_experiment, workers=2)
+    # Lambdas do not expose the executor they call, so their parallel support is passed explicitly
+    ExperimentalSerializerKitchen().run_experiments_with_serializers(
+        base_folder, lambda experiment_dir, serializer: run_experiment(experiment_dir, serializer), workers=2,
+        parallel_safe=False)
+
+    assert pids == [os.getpid()] * 6
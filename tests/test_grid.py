@@ -0,0 +1,143 @@
+import pandas as pd
+import pytest
+
+from tableserializer.cache import ComponentCache
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.budget import TokenBudget
+from tableserializer.serializer.grid import SerializerGrid, SerializerGridExecutor
+from tableserializer.serializer.metadata import PairwiseMetadataSerializer
+from tableserializer.serializer.schema import ColumnNameSchemaSerializer
+from tableserializer.serializer.table import MarkdownRawTableSerializer, JSONRawTableSerializer
+from tableserializer.table.preprocessor import StringTruncationPreprocessor, ColumnDroppingPreprocessor
+from tableserializer.table.row_sampler import FirstRowSampler, RandomRowSampler
+
+
+def _create_serializers():
+    grid = SerializerGrid([SerializationRecipe("{META}\n{TABLE}"), SerializationRecipe("{SCHEMA}\n{TABLE}")],
+                          [PairwiseMetadataSerializer()], [ColumnNameSchemaSerializer()],
+                          [MarkdownRawTableSerializer(), JSONRawTableSerializer()],
+                          [FirstRowSampler(20), RandomRowSampler(10)], [[], [StringTruncationPreprocessor(5)]])
+    return list(grid)
+
+
+def _create_table():
+    return pd.DataFrame({"name": [f'row "{row}" with a long name' for row in range(40)], "value": range(40)})
+
+
+def test_grid_serializations_equal_serializer_serializations():
+    serializers = _create_serializers()
+    table, metadata = _create_table(), {"title": "Table"}
+
+    assert SerializerGridExecutor(serializers).serialize(table, metadata) == \
+           [serializer.serialize(table, metadata) for serializer in serializers]
+
+
+def test_grid_applies_token_budgets_and_caches(tmp_path):
+    serializers = _create_serializers()
+    for position, serializer in enumerate(serializers):
+        if position % 3 == 0:
+            serializer.token_budget = TokenBudget(300)
+        if position % 2 == 0:
+            serializer.cache = ComponentCache(str(tmp_path / "cache.sqlite"))
+    table, metadata = _create_table(), {"title": "Table"}
+
+    serializations = SerializerGridExecutor(serializers).serialize(table, metadata)
+
+    assert serializations == [serializer.serialize(table, metadata) for serializer in serializers]
+    assert all(len(serialization) <= 300 for serialization, serializer in zip(serializations, serializers)
+               if serializer.token_budget is not None)
+    assert ComponentCache(str(tmp_path / "cache.sqlite")).get_size() > 0
+
+
+def _create_grid():
+    return SerializerGrid([SerializationRecipe("{META}\n{TABLE}"), SerializationRecipe("{META}"),
+                           SerializationRecipe("{SCHEMA}\n{META}\n{TABLE}")],
+                          [PairwiseMetadataSerializer()], [ColumnNameSchemaSerializer()],
+                          [MarkdownRawTableSerializer(), JSONRawTableSerializer()],
+                          [FirstRowSampler(20), RandomRowSampler(10), FirstRowSampler(5)],
+                          [[], [StringTruncationPreprocessor(5)]])
+
+
+def test_grid_enumerates_all_combinations_in_order():
+    grid = _create_grid()
+    expected = []
+    for recipe in grid.recipes:
+        uses_table = "TABLE" in recipe.get_fields()
+        for metadata_serializer in grid.metadata_serializers:
+            for schema_serializer in grid.schema_serializers if "SCHEMA" in recipe.get_fields() else [None]:
+                for table_serializer in grid.table_serializers if uses_table else [None]:
+                    for row_sampler in grid.row_samplers if uses_table else [None]:
+                        for table_preprocessors in grid.table_preprocessor_constellations:
+                            expected.append(str(Serializer(recipe, metadata_serializer, schema_serializer,
+                                                           table_serializer, row_sampler, table_preprocessors)))
+
+    assert len(grid) == 12 + 2 + 12 == len(expected)
+    assert [str(serializer) for serializer in grid] == expected
+    assert [str(grid[index]) for index in range(len(grid))] == expected
+    assert [str(grid[index]) for index in range(-len(grid), 0)] == expected
+
+
+@pytest.mark.parametrize("index", [26, 100, -27])
+def test_grid_rejects_indices_out_of_range(index):
+    with pytest.raises(IndexError):
+        _create_grid()[index]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 7, 26, 30])
+def test_grid_shards_partition_the_grid(count):
+    grid = _create_grid()
+
+    shards = [grid.shard(index, count) for index in range(count)]
+
+    assert [str(serializer) for shard in shards for serializer in shard] == [str(serializer) for serializer in grid]
+    assert sum(len(shard) for shard in shards) == len(grid)
+    assert max(len(shard) for shard in shards) - min(len(shard) for shard in shards) <= 1
+    for shard in shards:
+        if len(shard) > 0:
+            assert str(shard[-1]) == str(list(shard)[-1])
+            assert str(shard[0]) == str(next(iter(shard)))
+
+
+def test_shards_of_shards_partition_the_shard():
+    shard = _create_grid().shard(1, 3)
+
+    sub_shards = [shard.shard(index, 4) for index in range(4)]
+
+    assert [str(serializer) for sub_shard in sub_shards for serializer in sub_shard] == \
+           [str(serializer) for serializer in shard]
+    with pytest.raises(IndexError):
+        shard[len(shard)]
+
+
+@pytest.mark.parametrize("index, count", [(0, 0), (-1, 2), (2, 2)])
+def test_grid_rejects_invalid_shards(index, count):
+    with pytest.raises(ValueError):
+        _create_grid().shard(index, count)
+
+
+def test_equally_configured_row_samplers_share_a_draw():
+    serializers = [Serializer(SerializationRecipe(recipe), table_serializer=MarkdownRawTableSerializer(),
+                              row_sampler=RandomRowSampler(5, deterministic=False))
+                   for recipe in ["{TABLE}", "Table:\n{TABLE}"]]
+    executor = SerializerGridExecutor(serializers)
+
+    serializations = executor.serialize(_create_table(), {})
+
+    # One sampling stage and one rendering stage
+    assert executor.get_num_stages() == 2
+    assert "Table:\n" + serializations[0] == serializations[1]
+
+
+def test_stages_of_components_with_equal_signatures_are_not_shared():
+    # The signatures of both preprocessors sanitize the dot of the column name to the same string
+    preprocessors = [ColumnDroppingPreprocessor(["a.b"]), ColumnDroppingPreprocessor(["aDOTb"])]
+    assert str(preprocessors[0]) == str(preprocessors[1])
+    serializers = [Serializer(SerializationRecipe("{TABLE}"), table_serializer=MarkdownRawTableSerializer(),
+                              table_preprocessors=[preprocessor]) for preprocessor in preprocessors]
+    table = pd.DataFrame({"a.b": [1, 2], "aDOTb": [3, 4]})
+
+    serializations = SerializerGridExecutor(serializers).serialize(table, {})
+
+    assert serializations == [serializer.serialize(table, {}) for serializer in serializers]
+    assert serializations[0] != serializations[1]
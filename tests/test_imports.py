@@ -0,0 +1,55 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+def _get_imported_modules(statement: str):
+    # Modules imported by a statement in a fresh interpreter
+    script = f"import json, sys\n{statement}\nprint(json.dumps(list(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return set(json.loads(result.stdout))
+
+
+def test_importing_the_package_does_not_import_optional_dependencies():
+    modules = _get_imported_modules("import tableserializer")
+
+    assert "tableserializer" in modules
+    assert not {"pandas", "pyarrow", "sklearn", "scipy"} & modules
+
+
+def test_import_time_of_the_package_excludes_optional_dependencies():
+    # -X importtime reports every imported module on its own line: "import time: self [us] | cumulative | name"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import tableserializer"],
+                            capture_output=True, text=True, check=True)
+    modules = {line.split("|")[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+
+    assert "tableserializer" in modules
+    assert not {"pandas", "sklearn"} & modules
+
+
+@pytest.mark.parametrize("statement", ["from tableserializer import SerializationRecipe",
+                                       "from tableserializer.table import Table",
+                                       "from tableserializer.serializer import Serializer"])
+def test_lazy_exports_can_be_imported(statement):
+    _get_imported_modules(statement)
+
+
+def test_importing_the_table_package_does_not_import_pandas():
+    modules = _get_imported_modules("import tableserializer.table")
+
+    assert not {"pandas", "pyarrow"} & modules
+
+
+def test_importing_the_kitchen_does_not_import_scikit_learn():
+    modules = _get_imported_modules("import tableserializer.kitchen")
+
+    assert not {"sklearn", "scipy"} & modules
+
+
+@pytest.mark.parametrize("module", ["tableserializer.table.row_sampler", "tableserializer.table.preprocessor"])
+def test_table_modules_can_be_imported_first(module):
+    modules = _get_imported_modules(f"import {module}\nfrom tableserializer.serializer import Serializer")
+
+    assert module in modules
@@ -0,0 +1,101 @@
+import json
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.instrumentation import SerializationObserver, SerializationProfiler, observe_stage, \
+    INPUT_CONVERSION_STAGE, METADATA_STAGE, ROW_SAMPLING_STAGE, RAW_TABLE_STAGE, RECIPE_STAGE
+from tableserializer.serializer.metadata import PairwiseMetadataSerializer
+from tableserializer.serializer.table import MarkdownRawTableSerializer
+from tableserializer.table.preprocessor import StringTruncationPreprocessor, ColumnDroppingPreprocessor
+from tableserializer.table.row_sampler import FirstRowSampler
+
+
+class _RecordingObserver(SerializationObserver):
+
+    def __init__(self):
+        self.stages = []
+
+    def on_stage_end(self, serializer_signature, stage, duration_seconds, peak_memory_bytes):
+        self.stages.append((serializer_signature, stage, duration_seconds, peak_memory_bytes))
+
+
+def _create_serializer(observers) -> Serializer:
+    return Serializer(SerializationRecipe("{META}\n{TABLE}"), metadata_serializer=PairwiseMetadataSerializer(),
+                      table_serializer=MarkdownRawTableSerializer(), row_sampler=FirstRowSampler(5),
+                      table_preprocessors=[ColumnDroppingPreprocessor(["id"], apply_before_row_sampling=True),
+                                           StringTruncationPreprocessor(4)],
+                      observers=observers)
+
+
+def _create_table() -> pd.DataFrame:
+    return pd.DataFrame({"id": np.arange(20), "text": [f"text {i}" for i in range(20)]})
+
+
+def test_serializers_report_their_stages():
+    observer = _RecordingObserver()
+    serializer = _create_serializer([observer])
+
+    serialization = serializer.serialize(_create_table(), {"title": "numbers"})
+
+    assert serialization == _create_serializer([]).serialize(_create_table(), {"title": "numbers"})
+    assert [stage for _, stage, _, _ in observer.stages] == [
+        INPUT_CONVERSION_STAGE, METADATA_STAGE,
+        "preprocessor_before_sampling:" + str(serializer.table_preprocessors[0]),
+        ROW_SAMPLING_STAGE,
+        "preprocessor_after_sampling:" + str(serializer.table_preprocessors[1]),
+        RAW_TABLE_STAGE, RECIPE_STAGE]
+    assert all(signature == str(serializer) for signature, _, _, _ in observer.stages)
+    assert all(duration >= 0 and peak_memory is None for _, _, duration, peak_memory in observer.stages)
+
+
+def test_profiler_aggregates_stage_statistics(tmp_path):
+    profiler = SerializationProfiler()
+    serializer = _create_serializer([profiler])
+    for _ in range(3):
+        serializer.serialize(_create_table(), {})
+
+    report = profiler.get_report()
+
+    assert list(report.keys()) == [str(serializer)]
+    assert report == profiler.get_report(str(serializer))
+    for stats in report[str(serializer)].values():
+        assert stats["count"] == 3
+        assert stats["mean_seconds"] == pytest.approx(stats["total_seconds"] / 3)
+        assert 0 <= stats["max_seconds"] <= stats["total_seconds"]
+        assert stats["peak_memory_bytes"] is None
+
+    profiler.save_report(str(tmp_path / "reports" / "profile.json"))
+    with open(tmp_path / "reports" / "profile.json", "r") as f:
+        assert json.load(f) == report
+
+    profiler.reset()
+    assert profiler.get_report() == {}
+
+
+def test_profiler_traces_peak_memory():
+    was_tracing = tracemalloc.is_tracing()
+    profiler = SerializationProfiler(trace_memory=True)
+
+    with observe_stage([profiler], "serializer", "allocation"):
+        allocated = np.ones(1000000)
+    del allocated
+
+    stats = profiler.get_report()["serializer"]["allocation"]
+    assert stats["peak_memory_bytes"] >= 8000000
+    # Tracing is stopped again if it was started for the stage
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+def test_failing_stages_are_reported():
+    observer = _RecordingObserver()
+
+    with pytest.raises(ValueError):
+        with observe_stage([observer], "serializer", "failing"):
+            raise ValueError("The stage failed.")
+
+    assert [stage for _, stage, _, _ in observer.stages] == ["failing"]
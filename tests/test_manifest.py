@@ -0,0 +1,78 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from tableserializer.kitchen import ExperimentalSerializerKitchen
+from tableserializer.manifest import ExperimentManifest, MANIFEST_FILE
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.table import MarkdownRawTableSerializer, JSONRawTableSerializer
+from tableserializer.table.row_sampler import FirstRowSampler
+
+
+def _create_serializers(num_rows_values, table_serializer=MarkdownRawTableSerializer):
+    return [Serializer(SerializationRecipe("{TABLE}"), table_serializer=table_serializer(),
+                       row_sampler=FirstRowSampler(num_rows)) for num_rows in num_rows_values]
+
+
+def _save(base_folder, num_rows_values):
+    ExperimentalSerializerKitchen().save_serializer_experiment_configurations(_create_serializers(num_rows_values),
+                                                                              base_folder)
+
+
+def test_saving_into_folder_without_manifest_keeps_existing_experiments(tmp_path):
+    base_folder = str(tmp_path)
+    kitchen = ExperimentalSerializerKitchen()
+    kitchen.save_serializer_experiment_configurations(_create_serializers([1]), base_folder)
+    # Base folder saved without manifest, e.g., by an older version
+    os.remove(os.path.join(base_folder, MANIFEST_FILE))
+
+    kitchen.save_serializer_experiment_configurations(_create_serializers([2], JSONRawTableSerializer), base_folder)
+
+    assert len(ExperimentManifest(base_folder)) == 2
+    assert len(kitchen.get_serializers_from_dir(base_folder)) == 2
+
+
+def test_later_entries_replace_earlier_entries(tmp_path):
+    base_folder = str(tmp_path)
+    serializer = _create_serializers([1])[0]
+    manifest = ExperimentManifest(base_folder)
+    manifest.update([{"fingerprint": serializer.get_fingerprint(), "path": "old", "config": serializer.get_config()}])
+    manifest.update([{"fingerprint": serializer.get_fingerprint(), "path": "new", "config": serializer.get_config()}])
+
+    assert [entry["path"] for entry in manifest] == ["new"]
+    assert manifest.get(serializer.get_fingerprint())["path"] == "new"
+
+
+def test_incomplete_last_line_is_skipped(tmp_path):
+    base_folder = str(tmp_path)
+    _save(base_folder, [1, 2])
+    with open(os.path.join(base_folder, MANIFEST_FILE), "a") as f:
+        f.write(json.dumps({"fingerprint": "abc", "path": "x", "config": {}})[:20])
+
+    assert len(ExperimentManifest(base_folder)) == 2
+
+
+def test_concurrent_saves_keep_all_entries(tmp_path):
+    base_folder = str(tmp_path)
+    shards = [list(range(shard * 10 + 1, shard * 10 + 11)) for shard in range(4)]
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(_save, [base_folder] * len(shards), shards))
+
+    assert len(ExperimentManifest(base_folder)) == 40
+    assert not os.path.exists(os.path.join(base_folder, MANIFEST_FILE + ".tmp"))
+
+
+def test_update_after_interrupted_update_keeps_new_entries(tmp_path):
+    base_folder = str(tmp_path)
+    _save(base_folder, [1, 2])
+    manifest_path = os.path.join(base_folder, MANIFEST_FILE)
+    with open(manifest_path, "rb+") as f:
+        # Cut off the end of the last entry, as an interrupted update would
+        f.truncate(os.path.getsize(manifest_path) - 10)
+
+    _save(base_folder, [3])
+
+    manifest = ExperimentManifest(base_folder)
+    assert len(manifest) == 2
+    assert _create_serializers([3])[0].get_fingerprint() in manifest
@@ -0,0 +1,96 @@
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tableserializer.table import Table
+from tableserializer.table.preprocessor import TablePreprocessor, PreprocessorChain, ColumnDroppingPreprocessor, \
+    StringTruncationPreprocessor, COLUMN_LOCALITY
+
+
+class _UpperCasePreprocessor(TablePreprocessor):
+    # Column-local preprocessor without Arrow support, which changes the string values of a column
+
+    locality = COLUMN_LOCALITY
+
+    def process(self, table: Table) -> Table:
+        table_df = table.as_dataframe().copy()
+        for position in range(table_df.shape[1]):
+            table_df.isetitem(position, self.process_column(table_df.columns[position], table_df.iloc[:, position]))
+        return Table.from_dataframe(table_df)
+
+    def process_column(self, column_name: Any, column: pd.Series) -> Optional[pd.Series]:
+        return column.map(lambda value: value.upper() if isinstance(value, str) else value)
+
+
+class _RowReversingPreprocessor(TablePreprocessor):
+    # Table-level preprocessor, which interrupts the fusion of column-local preprocessors
+
+    def process(self, table: Table) -> Table:
+        return Table.from_dataframe(table.as_dataframe().iloc[::-1].reset_index(drop=True))
+
+
+def _create_table() -> Table:
+    table_df = pd.DataFrame({
+        "text": ["a" * 10, "short", "bcdefghijk"],
+        "missing": ["x" * 8, None, np.nan],
+        "string": pd.array(["y" * 9, None, "yy"], dtype="string"),
+        "mixed": ["z" * 7, ["a", "b", "c", "d", "e", "f", "g"], 12],
+        "number": [1234567, 2, 3],
+        "id": ["id_1", "id_2", "id_3"],
+    })
+    # Duplicate column names are processed by position
+    table_df.insert(1, "text", ["c" * 6, "d", "e" * 20], allow_duplicates=True)
+    return Table.from_dataframe(table_df)
+
+
+def test_strings_are_truncated():
+    truncated = StringTruncationPreprocessor(3).process(_create_table()).as_dataframe()
+
+    assert truncated.iloc[:, 0].tolist() == ["aaa", "sho", "bcd"]
+    assert truncated.iloc[:, 1].tolist() == ["ccc", "d", "eee"]
+    assert truncated["missing"].iloc[0] == "xxx" and truncated["missing"].iloc[1:].isna().all()
+    assert truncated["string"].tolist() == ["yyy", pd.NA, "yy"]
+    assert str(truncated["string"].dtype) == "string"
+    # Values that are not strings are kept, even if they support slicing
+    assert truncated["mixed"].tolist() == ["zzz", ["a", "b", "c", "d", "e", "f", "g"], 12]
+    assert truncated["number"].tolist() == [1234567, 2, 3]
+
+
+def test_tables_without_long_strings_are_not_copied():
+    table = _create_table()
+
+    assert StringTruncationPreprocessor(20).process(table) is table
+
+
+def test_arrow_strings_are_truncated():
+    pa = pytest.importorskip("pyarrow")
+    from tableserializer.table.arrow import ArrowTable
+
+    table = ArrowTable(pa.table({"text": ["abcdef", None, "ab"], "number": [123456, 7, 8]}))
+    truncated = StringTruncationPreprocessor(3).process(table)
+
+    assert isinstance(truncated, ArrowTable)
+    assert truncated.as_dataframe()["text"].tolist() == ["abc", None, "ab"]
+    assert truncated.as_dataframe()["number"].tolist() == [123456, 7, 8]
+
+
+@pytest.mark.parametrize("preprocessors", [
+    [StringTruncationPreprocessor(5), _UpperCasePreprocessor(), ColumnDroppingPreprocessor(["id"]),
+     StringTruncationPreprocessor(2)],
+    [ColumnDroppingPreprocessor(["text"]), _UpperCasePreprocessor(), _RowReversingPreprocessor(),
+     StringTruncationPreprocessor(4), ColumnDroppingPreprocessor(["missing"])],
+    [ColumnDroppingPreprocessor(["mixed", "string"])],
+])
+def test_fused_preprocessors_equal_sequential_preprocessors(preprocessors):
+    table = _create_table()
+    expected = table
+    for preprocessor in preprocessors:
+        expected = preprocessor.process(expected)
+
+    processed = PreprocessorChain(preprocessors).process(table)
+
+    pd.testing.assert_frame_equal(processed.as_dataframe(), expected.as_dataframe())
+    # The input table is not modified
+    pd.testing.assert_frame_equal(table.as_dataframe(), _create_table().as_dataframe())
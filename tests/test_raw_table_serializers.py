@@ -0,0 +1,128 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tableserializer.serializer.metadata import PairwiseMetadataSerializer
+from tableserializer.serializer.table import MarkdownRawTableSerializer, JSONRawTableSerializer
+from tableserializer.table import Table
+
+
+def _serialize_markdown_reference(table: Table) -> str:
+    # Implementation before the serializers were rendered column-wise
+    table_string = "| "
+    divider_string = "|"
+    for header in table.as_dataframe().columns:
+        table_string += f'{header} | '
+        divider_string += f'---|'
+    table_string += divider_string + " "
+    for row in table.as_list_of_dicts():
+        table_string = table_string[:-1] + "\n| "
+        for value in row.values():
+            table_string += f'{value} | '
+    return table_string[:-1]
+
+
+def _serialize_metadata_reference(metadata) -> str:
+    # Implementation before the serializers were rendered column-wise
+    meta_s = ""
+    for key, value in metadata.items():
+        meta_s += f"{key}: {value}\n"
+    return meta_s[:-1]
+
+
+_WORDS = ["Paris", 'say "hi"', "a | b", "{x}", "back\\slash", "line\nbreak", "", "ünïcode", "  padded  "]
+
+
+def _create_random_column(rng: np.random.Generator, kind: str, num_rows: int) -> pd.Series:
+    if kind == "int":
+        return pd.Series(rng.integers(-10 ** 6, 10 ** 6, num_rows))
+    if kind == "float":
+        values = rng.normal(0, 10.0 ** rng.integers(-3, 8), num_rows)
+        values[rng.random(num_rows) < 0.2] = np.nan
+        return pd.Series(values)
+    if kind == "float32":
+        return pd.Series(rng.normal(0, 100, num_rows).astype(np.float32))
+    if kind == "bool":
+        return pd.Series(rng.random(num_rows) < 0.5)
+    if kind == "string":
+        return pd.Series([_WORDS[position] for position in rng.integers(0, len(_WORDS), num_rows)], dtype=object)
+    if kind == "missing_strings":
+        return pd.Series([None if rng.random() < 0.3 else _WORDS[rng.integers(0, len(_WORDS))]
+                          for _ in range(num_rows)], dtype=object)
+    if kind == "mixed":
+        return pd.Series([[1, 2.5, "text", None, True][rng.integers(0, 5)] for _ in range(num_rows)], dtype=object)
+    if kind == "datetime":
+        return pd.Series(pd.to_datetime(rng.integers(0, 2 * 10 ** 9, num_rows), unit="s"))
+    raise ValueError(kind)
+
+
+_KINDS = ["int", "float", "float32", "bool", "string", "missing_strings", "mixed", "datetime"]
+
+
+def _create_random_table(seed: int, kinds=tuple(_KINDS)) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    num_rows = int(rng.integers(0, 40))
+    columns = {}
+    for position in range(int(rng.integers(1, 7))):
+        columns[f"col {position} {_WORDS[rng.integers(0, len(_WORDS))]}"] = \
+            _create_random_column(rng, kinds[rng.integers(0, len(kinds))], num_rows)
+    return pd.DataFrame(columns)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_markdown_matches_reference_on_random_tables(seed):
+    table_df = _create_random_table(seed)
+    serializer = MarkdownRawTableSerializer()
+
+    expected = _serialize_markdown_reference(Table(table_df))
+    assert serializer.serialize_raw_table(Table(table_df)) == expected
+    assert "".join(serializer.iter_serialized_chunks(Table(table_df))) == expected
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_json_rows_hold_cell_values_on_random_tables(seed):
+    # The JSON output was made valid JSON after the column-wise rewrite, so its lines are checked against the cell
+    # values instead of the output of the previous implementation
+    table_df = _create_random_table(seed)
+    serialization = JSONRawTableSerializer().serialize_raw_table(Table(table_df))
+
+    lines = serialization.split("\n") if table_df.shape[0] > 0 else []
+    assert len(lines) == table_df.shape[0]
+    for index, line in enumerate(lines):
+        row = json.loads(line)[str(index)]
+        assert list(row.keys()) == list(table_df.columns)
+        for column, value in row.items():
+            original = table_df[column].iloc[index]
+            if value is None:
+                assert original is None or pd.isna(original) or not math.isfinite(original)
+            elif isinstance(value, bool):
+                assert value == bool(original)
+            elif isinstance(value, (int, float)):
+                assert value == float(original)
+            else:
+                assert value == str(original)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_markdown_of_arrow_tables_matches_reference(seed):
+    pytest.importorskip("pyarrow")
+    from tableserializer.table.arrow import ArrowTable
+
+    # Columns that mix values of several types cannot be converted to Arrow
+    table_df = _create_random_table(seed, [kind for kind in _KINDS if kind != "mixed"])
+
+    assert MarkdownRawTableSerializer().serialize_raw_table(ArrowTable.from_dataframe(table_df)) == \
+        _serialize_markdown_reference(Table(table_df))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_pairwise_metadata_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    metadata = {f"key {position}": [_WORDS[rng.integers(0, len(_WORDS))], int(rng.integers(0, 100)), None,
+                                    float(rng.normal()), ["nested", 1]][rng.integers(0, 5)]
+                for position in range(int(rng.integers(0, 8)))}
+
+    assert PairwiseMetadataSerializer().serialize_metadata(metadata) == _serialize_metadata_reference(metadata)
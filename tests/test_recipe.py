@@ -0,0 +1,104 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.metadata import PairwiseMetadataSerializer
+from tableserializer.serializer.schema import ColumnNameSchemaSerializer
+from tableserializer.serializer.table import JSONRawTableSerializer, MarkdownRawTableSerializer, \
+    CSVRawTableSerializer
+from tableserializer.table.row_sampler import FirstRowSampler
+
+
+_CONTENTS = {"schema_contents": "id, text", "metadata_contents": "title: {numbers}", "table_contents": "| 1 | a |"}
+
+
+@pytest.mark.parametrize("recipe", [
+    "Schema: {SCHEMA}\nMetadata: {META}\nTable:\n{TABLE}",
+    "{TABLE}{META}{SCHEMA}",
+    "{{literal braces}} {TABLE} and {TABLE} again, {META}, {SCHEMA}",
+    "{TABLE!r} {META:>30} {SCHEMA}",
+    "{SCHEMA}{META}{TABLE}\n",
+])
+@pytest.mark.parametrize("chunked_contents", [False, True])
+def test_recipe_chunks_concatenate_to_the_cooked_recipe(recipe, chunked_contents):
+    recipe = SerializationRecipe(recipe)
+    contents = dict(_CONTENTS)
+    if chunked_contents:
+        # Contents given as iterators over their chunks
+        contents = {name: iter([value[:3], value[3:]]) for name, value in contents.items()}
+
+    chunks = list(recipe.cook_recipe_chunks(**contents))
+
+    assert all(isinstance(chunk, str) for chunk in chunks)
+    assert "".join(chunks) == recipe.cook_recipe(**_CONTENTS)
+
+
+def test_recipe_chunks_consume_contents_lazily():
+    recipe = SerializationRecipe("{META}\n{TABLE}")
+    consumed = []
+
+    def iter_table_chunks():
+        for chunk in ["| 1 |", "\n| 2 |"]:
+            consumed.append(chunk)
+            yield chunk
+
+    chunks = recipe.cook_recipe_chunks(metadata_contents="title", table_contents=iter_table_chunks())
+
+    assert next(chunks) == "title"
+    assert next(chunks) == "\n"
+    assert consumed == []
+    assert next(chunks) == "| 1 |"
+    assert consumed == ["| 1 |"]
+
+
+def test_recipes_reject_undefined_and_missing_fields():
+    with pytest.raises(ValueError):
+        SerializationRecipe("{TABLE} {UNDEFINED}")
+    with pytest.raises(AttributeError):
+        SerializationRecipe("{TABLE}").cook_recipe(metadata_contents="title", table_contents="table")
+    with pytest.raises(AttributeError):
+        list(SerializationRecipe("{TABLE}").cook_recipe_chunks(schema_contents="id", table_contents="table"))
+
+
+def _create_table() -> pd.DataFrame:
+    return pd.DataFrame({"id": np.arange(50), "text": [f"text {{{i}}}" for i in range(50)]})
+
+
+@pytest.mark.parametrize("table_serializer", [JSONRawTableSerializer(), MarkdownRawTableSerializer(),
+                                              CSVRawTableSerializer()])
+@pytest.mark.parametrize("max_chars", [None, 0, 10, 200, 100000])
+def test_serialize_into_writes_the_serialization(table_serializer, max_chars):
+    serializer = Serializer(SerializationRecipe("Schema: {SCHEMA}\n{META}\n{TABLE}\nEnd"),
+                            metadata_serializer=PairwiseMetadataSerializer(),
+                            schema_serializer=ColumnNameSchemaSerializer(), table_serializer=table_serializer,
+                            row_sampler=FirstRowSampler(30))
+    serialization = serializer.serialize(_create_table(), {"title": "numbers"})
+    writer = io.StringIO()
+
+    num_chars = serializer.serialize_into(writer, _create_table(), {"title": "numbers"}, max_chars=max_chars)
+
+    expected = serialization if max_chars is None else serialization[:max_chars]
+    assert writer.getvalue() == expected
+    assert num_chars == len(expected)
+
+
+def test_serialize_into_stops_rendering_at_the_character_cap():
+    rendered_rows = []
+
+    class _RecordingMarkdownSerializer(MarkdownRawTableSerializer):
+
+        def iter_serialized_chunks(self, table):
+            for chunk in super().iter_serialized_chunks(table):
+                rendered_rows.append(chunk)
+                yield chunk
+
+    serializer = Serializer(SerializationRecipe("{TABLE}"), table_serializer=_RecordingMarkdownSerializer())
+
+    serializer.serialize_into(io.StringIO(), _create_table(), {}, max_chars=60)
+
+    # The header and the first rows are rendered, the remaining rows are not
+    assert 1 < len(rendered_rows) < 10
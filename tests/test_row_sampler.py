@@ -0,0 +1,162 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.random import SeedSequence
+
+import tableserializer.table.row_sampler as row_sampler_module
+from tableserializer.table import Table
+from tableserializer.table.row_sampler import FirstRowSampler, RandomRowSampler, ScalableKMeansRowSampler
+
+
+def _create_chunks(num_rows: int, chunk_sizes: List[int]) -> List[Table]:
+    table_df = pd.DataFrame({"id": np.arange(num_rows), "text": [f"row {i}" for i in range(num_rows)]})
+    chunks = []
+    offset = 0
+    for chunk_size in chunk_sizes:
+        chunks.append(Table.from_dataframe(table_df.iloc[offset:offset + chunk_size].reset_index(drop=True)))
+        offset += chunk_size
+    assert offset == num_rows
+    return chunks
+
+
+@pytest.mark.parametrize("chunk_sizes", [[100], [3] * 33 + [1], [1, 50, 2, 47], [4, 0, 96]])
+def test_reservoir_holds_the_sample_size(chunk_sizes):
+    sampled = RandomRowSampler(10).sample_stream(_create_chunks(100, chunk_sizes))
+    sampled_ids = sampled.as_dataframe()["id"].tolist()
+
+    assert len(sampled_ids) == 10
+    assert len(set(sampled_ids)) == 10
+    assert all(0 <= row_id < 100 for row_id in sampled_ids)
+    # The rows are kept intact
+    assert sampled.as_dataframe()["text"].tolist() == [f"row {row_id}" for row_id in sampled_ids]
+
+
+def test_reservoir_keeps_all_rows_of_small_tables():
+    sampled = RandomRowSampler(10).sample_stream(_create_chunks(7, [3, 4]))
+
+    assert sampled.as_dataframe()["id"].tolist() == list(range(7))
+
+
+def test_deterministic_reservoir_is_seeded_by_the_number_of_columns():
+    first = RandomRowSampler(10).sample_stream(_create_chunks(100, [30, 70]))
+    second = RandomRowSampler(10).sample_stream(_create_chunks(100, [60, 40]))
+
+    # The random numbers are drawn per row, so the sample does not depend on the chunk sizes
+    assert first.as_dataframe().equals(second.as_dataframe())
+
+
+def test_reservoir_samples_rows_uniformly(monkeypatch):
+    # Every draw gets another fixed seed, so that the sampled rows of the draws are independent but reproducible
+    seeds = iter(range(1000))
+    monkeypatch.setattr(row_sampler_module, "SeedSequence", lambda seed: SeedSequence(next(seeds)))
+    num_draws = 500
+    counts = np.zeros(20, dtype=int)
+    for _ in range(num_draws):
+        sampled = RandomRowSampler(4).sample_stream(_create_chunks(20, [3, 3, 3, 3, 3, 3, 2]))
+        counts[sampled.as_dataframe()["id"].to_numpy()] += 1
+
+    # Every row is expected to be sampled 100 times with a standard deviation of about 9
+    assert counts.sum() == num_draws * 4
+    assert counts.min() >= 65 and counts.max() <= 135
+
+
+@pytest.mark.parametrize("chunk_sizes", [[100], [3] * 33 + [1], [1, 50, 2, 47]])
+def test_random_stream_sampling_with_known_size_equals_sampling(chunk_sizes):
+    chunks = _create_chunks(100, chunk_sizes)
+    table = chunks[0].concat(chunks[1:])
+
+    sampled = RandomRowSampler(10).sample_stream(chunks, num_rows=100)
+
+    assert sampled.as_dataframe().equals(RandomRowSampler(10).sample(table).as_dataframe())
+
+
+@pytest.mark.parametrize("rows_to_sample", [1, 5, 6, 20, 100, 200])
+@pytest.mark.parametrize("chunk_sizes", [[100], [5] * 20, [1, 50, 2, 47]])
+def test_first_row_stream_sampling_equals_sampling(rows_to_sample, chunk_sizes):
+    chunks = _create_chunks(100, chunk_sizes)
+    table = chunks[0].concat(chunks[1:])
+
+    sampled = FirstRowSampler(rows_to_sample).sample_stream(iter(chunks))
+
+    assert sampled.as_dataframe().equals(FirstRowSampler(rows_to_sample).sample(table).as_dataframe())
+
+
+def test_first_row_stream_sampling_reads_only_the_first_chunks():
+    chunks = _create_chunks(100, [5] * 20)
+    consumed = []
+
+    def iter_chunks():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    FirstRowSampler(12).sample_stream(iter_chunks())
+
+    assert len(consumed) == 3
+
+
+def _create_clustered_table(num_rows: int, num_clusters: int) -> pd.DataFrame:
+    # Table whose rows form well separated clusters in its numeric and categorical columns
+    rng = np.random.default_rng(0)
+    clusters = np.arange(num_rows) % num_clusters
+    return pd.DataFrame({
+        "id": np.arange(num_rows),
+        "cluster": clusters,
+        "value": clusters * 1000.0 + rng.normal(size=num_rows),
+        "category": [f"category {cluster}" for cluster in clusters],
+        "missing": np.where(np.arange(num_rows) % 7 == 0, np.nan, clusters * 10.0),
+        "constant": "same",
+    })
+
+
+@pytest.mark.parametrize("max_fit_rows", [10000, 50])
+def test_scalable_k_means_samples_a_row_per_cluster(max_fit_rows):
+    pytest.importorskip("sklearn")
+    table = Table.from_dataframe(_create_clustered_table(1000, 5))
+
+    sampled = ScalableKMeansRowSampler(5, max_fit_rows=max_fit_rows).sample(table).as_dataframe()
+
+    assert len(sampled) == 5
+    assert sorted(sampled["cluster"].tolist()) == [0, 1, 2, 3, 4]
+    # The rows are kept intact
+    pd.testing.assert_frame_equal(sampled, _create_clustered_table(1000, 5).iloc[sampled["id"]].reset_index(drop=True))
+
+
+def test_scalable_k_means_is_deterministic():
+    pytest.importorskip("sklearn")
+    table = Table.from_dataframe(_create_clustered_table(500, 20))
+
+    first = ScalableKMeansRowSampler(8, max_fit_rows=100).sample(table).as_dataframe()
+    second = ScalableKMeansRowSampler(8, max_fit_rows=100).sample(table).as_dataframe()
+
+    assert first.equals(second)
+    assert len(first) == 8
+    assert first["id"].is_unique
+
+
+def test_scalable_k_means_samples_wide_categorical_tables():
+    pytest.importorskip("sklearn")
+    rng = np.random.default_rng(0)
+    table_df = pd.DataFrame({f"column {i}": rng.choice([f"value {j}" for j in range(30)], size=300)
+                             for i in range(50)})
+
+    sampler = ScalableKMeansRowSampler(10, n_features=16)
+    encoded = sampler._encode(table_df, list(range(50)))
+    sampled = sampler.sample(Table.from_dataframe(table_df)).as_dataframe()
+
+    assert encoded.shape == (300, 50 * 16)
+    assert len(sampled) == 10
+    assert len(sampled.drop_duplicates()) == 10
+
+
+def test_scalable_k_means_samples_small_and_uninformative_tables():
+    pytest.importorskip("sklearn")
+    small_table = Table.from_dataframe(_create_clustered_table(5, 5))
+    uninformative_table = Table.from_dataframe(pd.DataFrame({"id": np.arange(50), "constant": "same"}))
+
+    assert ScalableKMeansRowSampler(10).sample(small_table) is small_table
+    # Without informative columns, the rows are sampled randomly
+    assert ScalableKMeansRowSampler(10).sample(uninformative_table).as_dataframe().equals(
+        RandomRowSampler(10).sample(uninformative_table).as_dataframe())
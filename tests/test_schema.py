@@ -0,0 +1,101 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tableserializer.serializer.schema import SQLSchemaSerializer, ColumnNameSchemaSerializer, \
+    _create_table_statement
+from tableserializer.table import Table
+
+# pandas warns that timedelta columns are written as integers, which the reference schemas of the tests include
+pytestmark = pytest.mark.filterwarnings("ignore:the 'timedelta' type is not supported")
+
+
+def _create_table(num_rows: int = 4) -> pd.DataFrame:
+    rows = range(num_rows)
+    return pd.DataFrame({
+        "integer": np.arange(num_rows),
+        "unsigned": np.arange(num_rows, dtype=np.uint8),
+        "float": np.linspace(0, 1, num_rows),
+        "boolean": [row % 2 == 0 for row in rows],
+        "text": [f"row {row}" for row in rows],
+        "missing text": [None if row % 2 == 0 else "text" for row in rows],
+        "all missing": [None] * num_rows,
+        "mixed": [row if row % 2 == 0 else "text" for row in rows],
+        "datetime": pd.date_range("2024-01-01", periods=num_rows, freq="D"),
+        "datetime tz": pd.date_range("2024-01-01", periods=num_rows, freq="h", tz="Europe/Berlin"),
+        "timedelta": pd.to_timedelta(list(rows), unit="s"),
+        "date": [datetime.date(2024, 1, row + 1) for row in rows],
+        "time": [datetime.time(row % 24, 0) for row in rows],
+        "category": pd.Categorical([f"c{row % 2}" for row in rows]),
+        "nullable integer": pd.array([None if row == 0 else row for row in rows], dtype="Int64"),
+        "nullable boolean": pd.array([None if row == 0 else row % 2 == 0 for row in rows], dtype="boolean"),
+        "string": pd.array([f"row {row}" for row in rows], dtype="string"),
+        'quoted "name"': np.arange(num_rows) * 2.0,
+    })
+
+
+@pytest.mark.parametrize("num_rows", [0, 1, 4])
+def test_sql_schemas_equal_pandas_schemas(num_rows):
+    table_df = _create_table(num_rows)
+
+    schema = SQLSchemaSerializer().serialize_schema(Table.from_dataframe(table_df))
+
+    assert schema == pd.io.sql.get_schema(table_df.reset_index(), "table")
+
+
+@pytest.mark.parametrize("table_df", [
+    pd.DataFrame({"value": [1, 2]}, index=pd.Index(["a", "b"], name="key")),
+    pd.DataFrame({"index": [1, 2], "value": [3.0, 4.0]}),
+    pd.DataFrame({"value": [1, 2]}, index=pd.MultiIndex.from_tuples([("a", 1), ("b", 2)], names=["key", "number"])),
+    pd.DataFrame({"value": [1, 2]}, index=pd.date_range("2024-01-01", periods=2)),
+    pd.DataFrame({1: [1, 2], 2.5: ["a", "b"]}),
+])
+def test_sql_schemas_of_indexed_tables_equal_pandas_schemas(table_df):
+    schema = SQLSchemaSerializer().serialize_schema(Table.from_dataframe(table_df))
+
+    assert schema == pd.io.sql.get_schema(table_df.reset_index(), "table")
+
+
+def test_sql_schemas_use_the_table_name_of_the_metadata():
+    table_df = _create_table()
+    serializer = SQLSchemaSerializer(metadata_table_name_field="table_name")
+
+    schema = serializer.serialize_schema(Table.from_dataframe(table_df), {"table_name": 'cities "2024"'})
+
+    assert schema == pd.io.sql.get_schema(table_df.reset_index(), 'cities "2024"')
+
+
+def test_sql_schemas_of_arrow_tables_equal_pandas_schemas():
+    pa = pytest.importorskip("pyarrow")
+    from tableserializer.table.arrow import ArrowTable
+
+    arrow_table = pa.table({"integer": [1, 2, None], "float": [1.5, None, 2.5], "text": ["a", None, "c"],
+                            "boolean": [True, False, None], "all missing": pa.array([None] * 3, type=pa.string()),
+                            "date": [datetime.date(2024, 1, 1)] * 3,
+                            "timestamp": pa.array([datetime.datetime(2024, 1, 1)] * 3)})
+    table = ArrowTable(arrow_table)
+
+    schema = SQLSchemaSerializer().serialize_schema(table)
+
+    assert schema == pd.io.sql.get_schema(arrow_table.to_pandas().reset_index(), "table")
+
+
+def test_sql_schemas_are_cached_by_signature():
+    serializer = SQLSchemaSerializer()
+    serializer.serialize_schema(Table.from_dataframe(_create_table(3)))
+    hits = _create_table_statement.cache_info().hits
+
+    # Tables with other values but the same columns and types share their statement
+    schema = serializer.serialize_schema(Table.from_dataframe(_create_table(6)))
+
+    assert _create_table_statement.cache_info().hits == hits + 1
+    assert schema == pd.io.sql.get_schema(_create_table(6).reset_index(), "table")
+
+
+def test_column_name_schemas_list_the_columns():
+    table = Table.from_dataframe(pd.DataFrame({"a": [1], "b": [2]}))
+
+    assert ColumnNameSchemaSerializer().serialize_schema(table) == "a | b"
+    assert ColumnNameSchemaSerializer(",").serialize_schema(table) == "a , b"
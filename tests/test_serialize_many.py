@@ -0,0 +1,31 @@
+import pandas as pd
+
+from tableserializer.cache import ComponentCache
+from tableserializer.kitchen import ExperimentalSerializerKitchen
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.budget import TokenBudget
+from tableserializer.serializer.metadata import PairwiseMetadataSerializer
+from tableserializer.serializer.table import MarkdownRawTableSerializer
+from tableserializer.table.row_sampler import FirstRowSampler
+
+
+def _create_entries(num_tables: int):
+    return [(pd.DataFrame({"name": [f"row {table}-{row}" for row in range(50)], "value": list(range(50))}),
+             {"title": f"Table {table}"}) for table in range(num_tables)]
+
+
+def test_parallel_serialization_applies_budget_and_cache(tmp_path):
+    serializer = Serializer(SerializationRecipe("{META}\n{TABLE}"), metadata_serializer=PairwiseMetadataSerializer(),
+                            table_serializer=MarkdownRawTableSerializer(), row_sampler=FirstRowSampler(50),
+                            cache=ComponentCache(str(tmp_path / "cache.sqlite")), token_budget=TokenBudget(200))
+    kitchen = ExperimentalSerializerKitchen()
+    entries = _create_entries(6)
+
+    parallel = kitchen.serialize_many(serializer, entries, workers=2, chunksize=1)
+    # The workers filled the cache
+    assert ComponentCache(str(tmp_path / "cache.sqlite")).get_size() > 0
+    serial = kitchen.serialize_many(serializer, entries, workers=1)
+
+    assert parallel == serial
+    assert all(len(serialization) <= 200 for serialization in parallel)
@@ -0,0 +1,27 @@
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.budget import TokenBudget
+from tableserializer.serializer.table import MarkdownRawTableSerializer, JSONRawTableSerializer
+from tableserializer.table.row_sampler import FirstRowSampler
+
+
+def test_signatures_are_memoized_until_an_attribute_is_set(monkeypatch):
+    serializer = Serializer(SerializationRecipe("{TABLE}"), table_serializer=MarkdownRawTableSerializer(),
+                            row_sampler=FirstRowSampler(5))
+    signature, fingerprint, cache_signature = str(serializer), serializer.get_fingerprint(), \
+        serializer._get_cache_signature()
+
+    def fail():
+        raise AssertionError("Memoized value is recomputed")
+    monkeypatch.setitem(serializer.__dict__, "get_config", fail)
+    monkeypatch.setitem(serializer.__dict__, "_compute_signature", fail)
+    assert (str(serializer), serializer.get_fingerprint(), serializer._get_cache_signature()) == \
+           (signature, fingerprint, cache_signature)
+    monkeypatch.undo()
+
+    serializer.table_serializer = JSONRawTableSerializer()
+    assert str(serializer) != signature
+    assert serializer.get_fingerprint() != fingerprint
+    new_cache_signature = serializer._get_cache_signature()
+    serializer.token_budget = TokenBudget(100)
+    assert serializer._get_cache_signature() != new_cache_signature
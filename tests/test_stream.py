@@ -0,0 +1,151 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.metadata import PairwiseMetadataSerializer
+from tableserializer.serializer.table import MarkdownRawTableSerializer
+from tableserializer.table import Table
+from tableserializer.stream import JSONLTableSource, CSVDirectoryTableSource, ParquetTableSource, \
+    open_table_source, iter_table_chunks, sample_table_file, serialize_corpus
+from tableserializer.table.preprocessor import ColumnDroppingPreprocessor
+from tableserializer.table.row_sampler import FirstRowSampler, RandomRowSampler
+
+
+def _create_table(num_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(num_rows),
+        # Rounded, so that the values are read back from CSV files exactly
+        "value": np.round(rng.normal(size=num_rows), 3),
+        "text": [f"row {i}" for i in range(num_rows)],
+    })
+
+
+def _write_table(table_df: pd.DataFrame, path: str):
+    if path.endswith(".parquet"):
+        pytest.importorskip("pyarrow")
+        table_df.to_parquet(path, index=False)
+    else:
+        table_df.to_csv(path, index=False)
+
+
+@pytest.mark.parametrize("file_name", ["table.csv", "table.parquet"])
+@pytest.mark.parametrize("row_sampler", [FirstRowSampler(15), RandomRowSampler(15), RandomRowSampler(500)])
+@pytest.mark.parametrize("chunk_size", [7, 1000])
+def test_sampling_table_files_equals_sampling_tables(tmp_path, file_name, row_sampler, chunk_size):
+    path = str(tmp_path / file_name)
+    _write_table(_create_table(100), path)
+    table = Table.from_dataframe(pd.read_csv(path) if file_name.endswith(".csv") else pd.read_parquet(path))
+
+    sampled = sample_table_file(path, row_sampler, chunk_size=chunk_size)
+
+    pd.testing.assert_frame_equal(sampled.as_dataframe(), row_sampler.sample(table).as_dataframe())
+
+
+def test_sampling_table_files_without_rows(tmp_path):
+    path = str(tmp_path / "table.csv")
+    _write_table(_create_table(0), path)
+
+    sampled = sample_table_file(path, RandomRowSampler(5))
+
+    assert sampled.get_num_rows() == 0
+    assert sampled.get_column_names() == ["id", "value", "text"]
+
+
+def _write_corpus(path, file_extension: str):
+    # Corpus of three tables, the metadata of the second table is stored next to it
+    path.mkdir()
+    for index in range(3):
+        _write_table(_create_table(5 + index, seed=index), str(path / f"table_{index}{file_extension}"))
+    with open(path / f"table_1.json", "w") as f:
+        json.dump({"table_name": "second", "page_title": "Second table"}, f)
+
+
+@pytest.mark.parametrize("source_class, file_extension", [(CSVDirectoryTableSource, ".csv"),
+                                                          (ParquetTableSource, ".parquet")])
+def test_file_sources_read_tables_and_metadata(tmp_path, source_class, file_extension):
+    _write_corpus(tmp_path / "corpus", file_extension)
+
+    entries = list(source_class(str(tmp_path / "corpus")))
+
+    assert [metadata for _, metadata in entries] == [{"table_name": "table_0"},
+                                                     {"table_name": "second", "page_title": "Second table"},
+                                                     {"table_name": "table_2"}]
+    for index, (table, _) in enumerate(entries):
+        pd.testing.assert_frame_equal(table.as_dataframe(), _create_table(5 + index, seed=index))
+
+
+@pytest.mark.parametrize("source_class, file_extension", [(CSVDirectoryTableSource, ".csv"),
+                                                          (ParquetTableSource, ".parquet")])
+def test_file_sources_do_not_read_excluded_columns(tmp_path, source_class, file_extension):
+    _write_corpus(tmp_path / "corpus", file_extension)
+    source = source_class(str(tmp_path / "corpus"))
+
+    projected_source = source.exclude_columns(["value", "missing"])
+
+    assert source.excluded_columns == frozenset()
+    for (table, _), (projected_table, _) in zip(source, projected_source):
+        assert projected_table.get_column_names() == ["id", "text"]
+        pd.testing.assert_frame_equal(projected_table.as_dataframe(), table.as_dataframe()[["id", "text"]])
+
+
+def test_jsonl_source_reads_tables_and_metadata(tmp_path):
+    path = tmp_path / "corpus.jsonl"
+    with open(path, "w") as f:
+        f.write(json.dumps({"table": [["a", "b"], ["1", "2"], ["3", "4"]], "metadata": {"title": "lists"}}) + "\n")
+        f.write("\n")
+        f.write(json.dumps({"table": [{"a": "5", "b": "6"}], "title": "dicts"}) + "\n")
+
+    entries = list(JSONLTableSource(str(path)))
+    entries_with_fields = list(JSONLTableSource(str(path), metadata_field=None).exclude_columns(["b"]))
+
+    assert [table.as_list_of_string_lists() for table, _ in entries] == [[["1", "2"], ["3", "4"]], [["5", "6"]]]
+    assert [metadata for _, metadata in entries] == [{"title": "lists"}, {}]
+    assert [table.as_list_of_string_lists() for table, _ in entries_with_fields] == [[["1"], ["3"]], [["5"]]]
+    assert [metadata for _, metadata in entries_with_fields] == [{"metadata": {"title": "lists"}}, {"title": "dicts"}]
+
+
+def test_table_sources_are_opened_by_path(tmp_path):
+    _write_corpus(tmp_path / "csv", ".csv")
+    _write_corpus(tmp_path / "parquet", ".parquet")
+    (tmp_path / "corpus.jsonl").touch()
+    (tmp_path / "empty").mkdir()
+
+    assert isinstance(open_table_source(str(tmp_path / "csv")), CSVDirectoryTableSource)
+    assert isinstance(open_table_source(str(tmp_path / "csv" / "table_0.csv")), CSVDirectoryTableSource)
+    assert isinstance(open_table_source(str(tmp_path / "parquet")), ParquetTableSource)
+    assert isinstance(open_table_source(str(tmp_path / "parquet" / "table_0.parquet")), ParquetTableSource)
+    assert isinstance(open_table_source(str(tmp_path / "corpus.jsonl")), JSONLTableSource)
+    with pytest.raises(ValueError):
+        open_table_source(str(tmp_path / "empty"))
+    with pytest.raises(ValueError):
+        open_table_source(str(tmp_path / "corpus.xlsx"))
+
+
+@pytest.mark.parametrize("file_extension", [".csv", ".parquet"])
+@pytest.mark.parametrize("table_preprocessors", [[], [ColumnDroppingPreprocessor(["value"])]])
+def test_corpus_serializations_equal_table_serializations(tmp_path, file_extension, table_preprocessors):
+    _write_corpus(tmp_path / "corpus", file_extension)
+    serializer = Serializer(SerializationRecipe("{META}\n{TABLE}"), metadata_serializer=PairwiseMetadataSerializer(),
+                            table_serializer=MarkdownRawTableSerializer(), table_preprocessors=table_preprocessors)
+
+    serializations = serialize_corpus(str(tmp_path / "corpus"), serializer)
+
+    assert next(serializations) == serializer.serialize(_create_table(5, seed=0), {"table_name": "table_0"})
+    assert list(serializations) == [serializer.serialize(table, metadata)
+                                    for table, metadata in list(open_table_source(str(tmp_path / "corpus")))[1:]]
+
+
+@pytest.mark.parametrize("file_name", ["table.csv", "table.parquet"])
+def test_table_files_are_read_in_chunks(tmp_path, file_name):
+    path = str(tmp_path / file_name)
+    _write_table(_create_table(20), path)
+
+    chunks = list(iter_table_chunks(path, chunk_size=6))
+
+    assert [chunk.get_num_rows() for chunk in chunks] == [6, 6, 6, 2]
+    pd.testing.assert_frame_equal(chunks[0].concat(chunks[1:]).as_dataframe(), _create_table(20))
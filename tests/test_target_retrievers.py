@@ -0,0 +1,81 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from embedding_stub import EmbeddingStub, stub_embedding
+from tableserializer.recipe import SerializationRecipe
+from tableserializer.serializer import Serializer
+from tableserializer.serializer.metadata import PairwiseMetadataSerializer
+from tableserializer.serializer.table import MarkdownRawTableSerializer
+
+target = pytest.importorskip("tableserializer.integrations.target", exc_type=Exception)
+
+
+class _RecordingSerializer(Serializer):
+    # Serializer that takes some time per table and records when it serialized the tables
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.serialization_times = []
+        self._lock = threading.Lock()
+
+    def serialize(self, table, metadata):
+        time.sleep(0.02)
+        with self._lock:
+            self.serialization_times.append(time.perf_counter())
+        return super().serialize(table, metadata)
+
+
+def _create_serializer():
+    return _RecordingSerializer(SerializationRecipe("{META}\n{TABLE}"),
+                                metadata_serializer=PairwiseMetadataSerializer(),
+                                table_serializer=MarkdownRawTableSerializer())
+
+
+def _create_corpus_entries(num_tables):
+    return [{"table": pd.DataFrame({"name": [f"row {table}-{row}" for row in range(3)], "value": [table, 1, 2]}),
+             "context": {"title": f"Table {table}"}} for table in range(num_tables)]
+
+
+@pytest.mark.parametrize("prefetch_depth", [0, 1, 3])
+def test_batch_embed_corpora_matches_sequential_embeddings(tmp_path, prefetch_depth):
+    serializer = _create_serializer()
+    corpus_entries = _create_corpus_entries(10)
+    with EmbeddingStub() as stub:
+        retriever = target.ConfigurableRetriever(serializer, tei_endpoint=stub.url,
+                                                 db_path=str(tmp_path / "cache.duckdb"), pipeline_chunk_size=3,
+                                                 prefetch_depth=prefetch_depth)
+        embeddings = retriever.batch_embed_corpora("dataset", corpus_entries)
+
+    expected = [stub_embedding(serializer.serialize(entry["table"], entry["context"])) for entry in corpus_entries]
+    assert [embedding.tolist() for embedding in embeddings] == \
+           [np.array(embedding, dtype=np.float32).tolist() for embedding in expected]
+    # The tables are embedded in chunks of the pipeline chunk size
+    assert [len(request) for request in stub.requests] == [3, 3, 3, 1]
+
+
+def test_tables_are_serialized_while_previous_chunk_is_embedded(tmp_path):
+    serializer = _create_serializer()
+    with EmbeddingStub(delay_seconds=0.3) as stub:
+        retriever = target.ConfigurableRetriever(serializer, tei_endpoint=stub.url,
+                                                 db_path=str(tmp_path / "cache.duckdb"), pipeline_chunk_size=2,
+                                                 prefetch_depth=2)
+        retriever.batch_embed_corpora("dataset", _create_corpus_entries(6))
+
+    start, end = stub.request_times[0]
+    assert any(start < serialization_time < end for serialization_time in serializer.serialization_times)
+
+
+def test_serialization_errors_stop_the_pipeline(tmp_path):
+    serializer = _create_serializer()
+    corpus_entries = _create_corpus_entries(6)
+    corpus_entries[4]["context"] = None
+    with EmbeddingStub() as stub:
+        retriever = target.ConfigurableRetriever(serializer, tei_endpoint=stub.url,
+                                                 db_path=str(tmp_path / "cache.duckdb"), pipeline_chunk_size=2,
+                                                 prefetch_depth=2)
+        with pytest.raises(AttributeError):
+            retriever.batch_embed_corpora("dataset", corpus_entries)